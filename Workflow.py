@@ -33,6 +33,8 @@ try:
     from earthquake_analysis.PearsonCorrelation import EarthquakeCorrelationAnalysis
     from earthquake_analysis.FeatureImportanceAnalysis import EarthquakeFeatureImportance
     from earthquake_analysis.CorrelationCoefficientAnalysis import EarthquakeCorrelationCoefficient
+    from earthquake_analysis.TemporalAggregation import EarthquakeTemporalAnalysis
+    from earthquake_analysis.DataLoader import EarthquakeDataLoader
 except ImportError as e:
     print(f"\nError importing modules: {e}")
     print("\nPlease ensure all files are in the correct locations:")
@@ -40,6 +42,17 @@ except ImportError as e:
     print("- The data file should be in the 'data' directory")
     sys.exit(1)
 
+# Analyzers run by the workflow; their column declarations drive the loader
+ANALYZERS = [
+    EarthquakeDataStatistics,
+    EarthquakeBinningAnalysis,
+    EarthquakeNormalization,
+    EarthquakeCorrelationAnalysis,
+    EarthquakeCorrelationCoefficient,
+    EarthquakeFeatureImportance,
+    EarthquakeTemporalAnalysis
+]
+
 def main():
     try:
         # Load earthquake data
@@ -50,7 +63,8 @@ def main():
             print(f"Error: Data file not found at {data_path}")
             sys.exit(1)
             
-        data = pd.read_csv(data_path)
+        # Parse only the columns the analyzers below declare
+        data = EarthquakeDataLoader(data_path).load(ANALYZERS)
 
         # 1. Data Statistics Analysis
         print("\n1. Performing Data Statistics Analysis...")
@@ -106,6 +120,12 @@ def main():
         print("\nFeature Group Importance:")
         print(importance_report['magnitude']['group_importance'])
 
+        # 7. Temporal Aggregation
+        print("\n7. Performing Temporal Aggregation...")
+        temporal_analyzer = EarthquakeTemporalAnalysis(data, freq='D')
+        print("Daily Event Rates:")
+        print(temporal_analyzer.event_rates(window=7).tail(14))
+
         # Show all plots (if any are still pending)
         plt.show()
 
@@ -126,6 +146,8 @@ if __name__ == "__main__":
             'PearsonCorrelation.py',
             'FeatureImportanceAnalysis.py',
             'CorrelationCoefficientAnalysis.py',
+            'TemporalAggregation.py',
+            'DataLoader.py',
             '__init__.py'
         ],
         'data': ['earthquakes.csv']
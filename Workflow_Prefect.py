@@ -35,6 +35,8 @@ try:
     from earthquake_analysis.PearsonCorrelation import EarthquakeCorrelationAnalysis
     from earthquake_analysis.FeatureImportanceAnalysis import EarthquakeFeatureImportance
     from earthquake_analysis.CorrelationCoefficientAnalysis import EarthquakeCorrelationCoefficient
+    from earthquake_analysis.TemporalAggregation import EarthquakeTemporalAnalysis
+    from earthquake_analysis.DataLoader import EarthquakeDataLoader
 except ImportError as e:
     print(f"\nError importing modules: {e}")
     print("\nPlease ensure all files are in the correct locations:")
@@ -42,6 +44,17 @@ except ImportError as e:
     print("- The data file should be in the 'data' directory")
     sys.exit(1)
 
+# Analyzers run by the workflow; their column declarations drive the loader
+ANALYZERS = [
+    EarthquakeDataStatistics,
+    EarthquakeBinningAnalysis,
+    EarthquakeNormalization,
+    EarthquakeCorrelationAnalysis,
+    EarthquakeCorrelationCoefficient,
+    EarthquakeFeatureImportance,
+    EarthquakeTemporalAnalysis
+]
+
 @task
 def load_data():
     print("\nLoading earthquake data...")
@@ -51,7 +64,8 @@ def load_data():
         print(f"Error: Data file not found at {data_path}")
         sys.exit(1)
         
-    return pd.read_csv(data_path)
+    # Parse only the columns the analyzers declare
+    return EarthquakeDataLoader(data_path).load(ANALYZERS)
 
 @task(log_prints=True)
 def analyze_data(data):
@@ -104,6 +118,12 @@ def analyze_data(data):
     print("\nFeature Group Importance:")
     print(importance_report['magnitude']['group_importance'])
 
+    # 7. Temporal Aggregation
+    print("\n7. Performing Temporal Aggregation...")
+    temporal_analyzer = EarthquakeTemporalAnalysis(data, freq='D')
+    print("Daily Event Rates:")
+    print(temporal_analyzer.event_rates(window=7).tail(14))
+
     # Show all plots (if any are still pending)
     plt.show()
 
@@ -0,0 +1,145 @@
+import pandas as pd
+import numpy as np
+from earthquake_analysis.BinnedPlotting import split_by_code
+
+
+class GrowableArray:
+    """
+    1-D array with amortized O(1) appends; the buffer doubles when full
+    """
+
+    def __init__(self, values, dtype=None):
+        self.buffer = np.array(values, dtype=dtype)
+        self.size = self.buffer.size
+
+    @property
+    def values(self):
+        return self.buffer[:self.size]
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.buffer.dtype)
+        end = self.size + values.size
+        if end > self.buffer.size:
+            buffer = np.empty(max(end, 2 * self.buffer.size), dtype=self.buffer.dtype)
+            buffer[:self.size] = self.values
+            self.buffer = buffer
+        self.buffer[self.size:end] = values
+        self.size = end
+        return self
+
+
+class RevisionIndex:
+    """
+    Latest `updated` time and row slots of every event id
+
+    The catalog's ids are factorized once into a hash index, with the rows
+    of each id grouped together; ids touched by later appends are kept in
+    a dict on top. Looking up a batch costs O(batch), whatever the size of
+    the catalog.
+    """
+
+    def __init__(self, ids, updated):
+        codes, uniques = pd.factorize(np.asarray(ids, dtype=object))
+        self.ids = pd.Index(uniques)
+        known = np.flatnonzero(codes >= 0)
+        codes = codes[known]
+        order = np.argsort(codes, kind='stable')
+        self.slots = known[order]
+        self.starts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(uniques)))])
+        if len(uniques):
+            self.latest = np.maximum.reduceat(
+                np.asarray(updated, dtype=np.int64)[self.slots], self.starts[:-1]
+            )
+        else:
+            self.latest = np.zeros(0, dtype=np.int64)
+        self.revised = {}
+
+    def held(self, event_ids):
+        """
+        (latest updated, row slots) held for each id, None for unknown ids
+        """
+        positions = self.ids.get_indexer(event_ids)
+        held = []
+        for event_id, position in zip(event_ids, positions):
+            if event_id in self.revised:
+                held.append(self.revised[event_id])
+            elif position >= 0:
+                rows = self.slots[self.starts[position]:self.starts[position + 1]]
+                held.append((self.latest[position], rows))
+            else:
+                held.append(None)
+        return held
+
+    def hold(self, event_id, updated, slots):
+        """
+        Record the rows now held for an id
+        """
+        self.revised[event_id] = (updated, slots)
+
+
+class AppendIndex:
+    """
+    Row-slot bookkeeping that lets append() touch only the incoming rows,
+    the rows they replace and the bins that lost an extreme
+
+    Every row ever added owns a slot; retracted rows stay as dead slots.
+    Per binned column the codes and values are kept by slot, together with
+    the slots of every bin, so a bin's extremes can be recomputed from its
+    own rows.
+    """
+
+    def __init__(self, ids, updated, code_columns, value_columns, bin_counts):
+        self.revisions = RevisionIndex(ids, updated)
+        n_rows = len(ids)
+        self.live = GrowableArray(np.ones(n_rows, dtype=bool))
+        self.n_live = n_rows
+        self.codes = {}
+        self.values = {}
+        self.bin_slots = {}
+        for column, codes in code_columns.items():
+            self.codes[column] = GrowableArray(codes, dtype=np.int64)
+            self.values[column] = GrowableArray(value_columns[column], dtype=np.float64)
+            self.bin_slots[column] = [
+                GrowableArray(slots, dtype=np.int64)
+                for slots in split_by_code(np.arange(n_rows), codes.astype(np.int8), bin_counts[column])
+            ]
+
+    @property
+    def n_slots(self):
+        return self.live.size
+
+    def rows(self, column, slots):
+        """
+        Codes and values of the given slots
+        """
+        return self.codes[column].values[slots], self.values[column].values[slots]
+
+    def bin_rows(self, column, bins):
+        """
+        Codes and values of the live rows in the given bins
+        """
+        slots = np.concatenate([self.bin_slots[column][b].values for b in bins])
+        slots = slots[self.live.values[slots]]
+        return self.rows(column, slots)
+
+    def retract(self, slots):
+        """
+        Mark rows as removed
+        """
+        self.n_live -= np.count_nonzero(self.live.values[slots])
+        self.live.values[slots] = False
+
+    def extend(self, n_rows, code_columns, value_columns):
+        """
+        Add slots for n_rows new rows, in order, and return them
+        """
+        slots = np.arange(self.n_slots, self.n_slots + n_rows)
+        for column, codes in code_columns.items():
+            self.codes[column].extend(codes)
+            self.values[column].extend(value_columns[column])
+            groups = split_by_code(slots, codes.astype(np.int8), len(self.bin_slots[column]))
+            for bin_slots, group in zip(self.bin_slots[column], groups):
+                bin_slots.extend(group)
+        self.live.extend(np.ones(n_rows, dtype=bool))
+        self.n_live += n_rows
+        return slots
@@ -0,0 +1,153 @@
+import pandas as pd
+import numpy as np
+
+# Largest dense cube build() allocates; at 8 bytes per cell every count or
+# measure array stays within 64 MB
+MAX_CUBE_CELLS = 2 ** 23
+
+
+class BinCube:
+    """
+    Dense OLAP-style cube of event counts and measure sums over binned
+    dimensions
+
+    Every dimension has one extra trailing slot for missing or out-of-range
+    values, so marginals over any subset of dimensions stay exact. Tables,
+    marginals and slices are reductions of the cube and never touch the
+    raw rows.
+    """
+
+    def __init__(self, dimensions, labels, counts, sums):
+        self.dimensions = list(dimensions)
+        self.labels = {name: list(labels[name]) for name in self.dimensions}
+        self.counts = counts
+        self.sums = sums
+
+    @classmethod
+    def build(cls, dimension_codes, measures=None, max_cells=MAX_CUBE_CELLS):
+        """
+        Build the cube in one pass
+
+        dimension_codes maps a dimension name to (codes, labels) where codes
+        use -1 for missing values; measures maps a name to per-row values.
+        Cubes of more than max_cells cells are rejected, since the dense
+        layout grows with the product of the dimension sizes.
+        """
+        dimensions = list(dimension_codes)
+        labels = {name: dimension_codes[name][1] for name in dimensions}
+        shape = tuple(len(labels[name]) + 1 for name in dimensions)
+        n_cells = int(np.prod(shape, dtype=np.float64))
+        if n_cells > max_cells:
+            sizes = ', '.join(f'{name}={size}' for name, size in zip(dimensions, shape))
+            raise ValueError(
+                f"A dense cube of {sizes} has {n_cells} cells, more than "
+                f"max_cells={max_cells}; use coarser bins for some dimension"
+            )
+
+        # Missing codes go to each dimension's trailing slot
+        codes = [
+            np.where(dimension_codes[name][0] < 0, len(labels[name]), dimension_codes[name][0])
+            for name in dimensions
+        ]
+        cells = np.ravel_multi_index(codes, shape)
+        size = n_cells
+
+        counts = np.bincount(cells, minlength=size).reshape(shape)
+        sums = {}
+        for name, values in (measures or {}).items():
+            values = np.asarray(values, dtype=np.float64)
+            valid = ~np.isnan(values)
+            sums[name] = np.bincount(
+                cells[valid], weights=values[valid], minlength=size
+            ).reshape(shape)
+        return cls(dimensions, labels, counts, sums)
+
+    def _reduce(self, array, keep):
+        # Sum out every other dimension, then drop the missing slots
+        axes = tuple(i for i, name in enumerate(self.dimensions) if name not in keep)
+        reduced = array.sum(axis=axes)
+        kept = [name for name in self.dimensions if name in keep]
+        reduced = reduced[tuple(slice(0, len(self.labels[name])) for name in kept)]
+        # Present the result in the requested dimension order
+        order = [kept.index(name) for name in keep]
+        return np.transpose(reduced, order)
+
+    def marginal(self, dimensions, measure=None, labeled=True):
+        """
+        Counts (or measure sums) over the given dimensions
+
+        labeled=False returns the bare ndarray, skipping pandas overhead.
+        """
+        dimensions = [dimensions] if isinstance(dimensions, str) else list(dimensions)
+        unknown = set(dimensions) - set(self.dimensions)
+        if unknown:
+            raise ValueError(f"Unknown cube dimensions: {sorted(unknown)}")
+
+        array = self.counts if measure is None else self.sums[measure]
+        reduced = self._reduce(array, dimensions)
+        if not labeled:
+            return reduced
+
+        if len(dimensions) == 1:
+            index = pd.CategoricalIndex(
+                self.labels[dimensions[0]], ordered=True, name=dimensions[0]
+            )
+            return pd.Series(reduced, index=index)
+        if len(dimensions) == 2:
+            return pd.DataFrame(
+                reduced,
+                index=pd.CategoricalIndex(self.labels[dimensions[0]], ordered=True, name=dimensions[0]),
+                columns=pd.CategoricalIndex(self.labels[dimensions[1]], ordered=True, name=dimensions[1])
+            )
+        index = pd.MultiIndex.from_product(
+            [self.labels[name] for name in dimensions], names=dimensions
+        )
+        return pd.Series(reduced.ravel(), index=index)
+
+    def mean(self, measure, dimensions):
+        """
+        Mean of a measure per cell of the given dimensions
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.marginal(dimensions, measure) / self.marginal(dimensions)
+
+    def contingency(self, dimension1, dimension2, normalize=False):
+        """
+        Two-way contingency table in the layout of pd.crosstab
+        """
+        table = self.marginal([dimension1, dimension2]).astype(np.float64 if normalize else np.int64)
+        # Like crosstab, leave out categories that never occur
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        if normalize in (True, 'all'):
+            table = table / table.to_numpy().sum()
+        elif normalize == 'index':
+            table = table.div(table.sum(axis=1), axis=0)
+        elif normalize == 'columns':
+            table = table.div(table.sum(axis=0), axis=1)
+        return table
+
+    def slice(self, **selection):
+        """
+        Sub-cube restricted to the given labels of some dimensions
+        """
+        index = []
+        labels = {}
+        for name in self.dimensions:
+            if name in selection:
+                chosen = selection[name]
+                chosen = [chosen] if not isinstance(chosen, (list, tuple)) else list(chosen)
+                index.append([self.labels[name].index(label) for label in chosen])
+                labels[name] = chosen
+            else:
+                index.append(list(range(len(self.labels[name]) + 1)))
+                labels[name] = self.labels[name]
+
+        grid = np.ix_(*index)
+        counts = self.counts[grid]
+        sums = {name: values[grid] for name, values in self.sums.items()}
+
+        # Selected dimensions lose their missing slot; pad it back as empty
+        pad = [(0, 1 if name in selection else 0) for name in self.dimensions]
+        counts = np.pad(counts, pad)
+        sums = {name: np.pad(values, pad) for name, values in sums.items()}
+        return BinCube(self.dimensions, labels, counts, sums)
@@ -0,0 +1,209 @@
+import numpy as np
+from scipy import signal, stats
+
+
+def finite_values(values):
+    """
+    Values as a float64 array without NaNs
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    return values[~np.isnan(values)]
+
+
+def binned_histogram(values, bins='auto'):
+    """
+    Histogram counts and edges, computed once from the raw values
+    """
+    values = finite_values(values)
+    counts, edges = np.histogram(values, bins=bins)
+    return counts, edges
+
+
+def binned_kde(values, grid_size=512, bw_adjust=1.0, cut=3):
+    """
+    Gaussian KDE evaluated by binned FFT convolution
+
+    The values are binned onto a regular grid once and the grid counts are
+    convolved with the sampled kernel, so the cost after binning depends on
+    grid_size only. Uses Scott's bandwidth like seaborn's default.
+    """
+    values = finite_values(values)
+    n = values.size
+    std = values.std(ddof=1) if n > 1 else 0.0
+    if n < 2 or std == 0:
+        return None, None
+
+    bandwidth = bw_adjust * std * n ** (-1 / 5)
+    low = values.min() - cut * bandwidth
+    high = values.max() + cut * bandwidth
+    counts, edges = np.histogram(values, bins=grid_size, range=(low, high))
+    grid = 0.5 * (edges[:-1] + edges[1:])
+    step = edges[1] - edges[0]
+
+    # Kernel sampled on the same spacing, truncated at 4 bandwidths
+    half_width = min(grid_size - 1, int(np.ceil(4 * bandwidth / step)))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    density = signal.fftconvolve(counts, kernel, mode='same') / n
+    return grid, np.maximum(density, 0.0)
+
+
+def plot_binned_distribution(ax, values, bins='auto', kde=True, label=None):
+    """
+    Histogram (and KDE) drawn from binned summaries instead of raw rows
+    """
+    counts, edges = binned_histogram(values, bins)
+    ax.stairs(counts, edges, fill=True, alpha=0.5, label=label)
+    ax.stairs(counts, edges, color='C0')
+
+    if kde:
+        grid, density = binned_kde(values)
+        if grid is not None:
+            # Scale the density to the histogram's count axis
+            n = counts.sum()
+            ax.plot(grid, density * n * np.diff(edges).mean(), color='C0')
+    return ax
+
+
+def sketch_histogram(sketch, bins=50):
+    """
+    Histogram counts on equal-width edges, read from a KLLSketch's CDF
+    """
+    if sketch.n == 0:
+        return np.zeros(0), np.zeros(1)
+    if sketch.min == sketch.max:
+        return np.array([float(sketch.n)]), np.array([sketch.min - 0.5, sketch.min + 0.5])
+    edges = np.linspace(sketch.min, sketch.max, bins + 1)
+    cdf = sketch.rank(edges)
+    # The extremes are exact, so the outer edges hold every value
+    cdf[0], cdf[-1] = 0.0, 1.0
+    return np.diff(cdf) * sketch.n, edges
+
+
+def plot_sketch_distribution(ax, sketch, bins=50, label=None):
+    """
+    Histogram drawn from a quantile sketch when the rows are not kept
+    """
+    counts, edges = sketch_histogram(sketch, bins)
+    ax.stairs(counts, edges, fill=True, alpha=0.5, label=label)
+    ax.stairs(counts, edges, color='C0')
+    return ax
+
+
+def box_statistics(values):
+    """
+    Box-plot summary for Axes.bxp, computed without keeping fliers
+    """
+    values = finite_values(values)
+    if values.size == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    return {
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        'whislo': values[values >= low_fence].min(),
+        'whishi': values[values <= high_fence].max(),
+        'fliers': []
+    }
+
+
+def split_by_code(values, codes, n_groups):
+    """
+    Values grouped by integer code in one pass; negative codes are dropped
+
+    A stable argsort of small integer codes is a radix sort, so grouping
+    costs O(n) regardless of the number of groups.
+    """
+    values = np.asarray(values)
+    codes = np.asarray(codes)
+    kept = codes >= 0
+    values, codes = values[kept], codes[kept]
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes, minlength=n_groups)
+    return np.split(values[order], np.cumsum(sizes)[:-1])
+
+
+def plot_binned_boxes(ax, groups, labels):
+    """
+    Box plots from precomputed quartiles, one per group
+    """
+    summaries, positions = [], []
+    for position, values in enumerate(groups):
+        summary = box_statistics(values)
+        if summary is not None:
+            summaries.append(summary)
+            positions.append(position)
+    ax.bxp(summaries, positions=positions, showfliers=False)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    return ax
+
+
+def plot_binned_violins(ax, groups, labels, width=0.8):
+    """
+    Violin plots whose outlines come from binned FFT KDEs
+    """
+    for position, values in enumerate(groups):
+        grid, density = binned_kde(values)
+        if grid is None:
+            continue
+        half = 0.5 * width * density / density.max()
+        ax.fill_betweenx(grid, position - half, position + half, alpha=0.6, color='C0')
+        median = np.median(finite_values(values))
+        ax.hlines(median, position - 0.1, position + 0.1, color='black')
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    return ax
+
+
+def filliben_positions(ranks, n):
+    """
+    Filliben's order statistic medians, the plotting positions of probplot
+    """
+    ranks = np.asarray(ranks, dtype=np.float64)
+    positions = (ranks - 0.3175) / (n + 0.365)
+    last = 0.5 ** (1.0 / n)
+    positions = np.where(ranks == n, last, positions)
+    return np.where(ranks == 1, 1.0 - last, positions)
+
+
+def qq_quantiles(values, n_quantiles=200, sketch=None):
+    """
+    Normal Q-Q points at no more than n_quantiles order statistics
+
+    Uses the same plotting positions as scipy.stats.probplot. Small columns
+    keep every point; larger ones pick evenly spaced order statistics with
+    one partial sort, or read them from a KLLSketch of the column instead.
+    """
+    if sketch is not None:
+        n = sketch.n
+        ranks = np.unique(np.round(np.linspace(1, n, min(n_quantiles, n))))
+        positions = filliben_positions(ranks, n)
+        return stats.norm.ppf(positions), sketch.quantile(positions)
+
+    values = finite_values(values)
+    n = values.size
+    if n <= n_quantiles:
+        ranks = np.arange(1, n + 1)
+        sample = np.sort(values)
+    else:
+        ranks = np.unique(np.round(np.linspace(1, n, n_quantiles))).astype(np.int64)
+        sample = np.partition(values, ranks - 1)[ranks - 1]
+    return stats.norm.ppf(filliben_positions(ranks, n)), sample
+
+
+def plot_qq(ax, theoretical, sample):
+    """
+    Q-Q scatter with its least-squares line, styled like probplot
+    """
+    ax.plot(theoretical, sample, 'bo')
+    if theoretical.size > 1:
+        slope, intercept = np.polyfit(theoretical, sample, 1)
+        ax.plot(theoretical, slope * theoretical + intercept, 'r-')
+    ax.set_xlabel('Theoretical quantiles')
+    ax.set_ylabel('Ordered Values')
+    return ax
@@ -3,39 +3,559 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.preprocessing import KBinsDiscretizer
+from earthquake_analysis.Sketches import KLLSketch
+from earthquake_analysis.BinnedPlotting import plot_binned_boxes, plot_binned_violins, split_by_code
+from earthquake_analysis.DataLoader import load_catalog
+from earthquake_analysis.BinCube import BinCube
+from earthquake_analysis.SpatialGrid import SpatialGrid
+from earthquake_analysis.AppendIndex import AppendIndex
+
+# Fixed bin edges and labels; bins are right-closed with the lowest edge included
+BIN_SCHEMES = {
+    # Typical ranges: <2 (micro), 2-4 (minor), 4-6 (light), 6-7 (moderate), >7 (major)
+    'magnitude': (
+        [0, 2, 4, 6, 7, np.inf],
+        ['Micro', 'Minor', 'Light', 'Moderate', 'Major']
+    ),
+    # Shallow: 0-70 km, Intermediate: 70-300 km, Deep: >300 km
+    'depth': (
+        [0, 70, 300, np.inf],
+        ['Shallow', 'Intermediate', 'Deep']
+    ),
+    # Modified Mercalli Intensity (MMI) scale goes from I to XII
+    'mmi': (
+        list(range(0, 13)),
+        ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
+    ),
+    # USGS significance; events above 600 count as significant
+    'sig': (
+        [0, 100, 300, 600, 1000, np.inf],
+        ['Minimal', 'Low', 'Moderate', 'Significant', 'Severe']
+    )
+}
+
+# Dimensions of the relationship cube besides the time bucket
+CUBE_DIMENSIONS = ['magnitude', 'depth', 'mmi', 'sig']
+
+
+def assign_bin_codes(values, edges):
+    """
+    Bin codes with pd.cut(..., include_lowest=True) semantics; -1 marks
+    missing or out-of-range values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.asarray(edges, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side='left') - 1
+    codes[values == edges[0]] = 0
+    codes[(codes < 0) | (codes >= len(edges) - 1) | np.isnan(values)] = -1
+    return codes
+
+
+def assign_time_buckets(epoch_ms, freq='M'):
+    """
+    Bucket codes and labels for epoch-millisecond times
+
+    freq is a NumPy datetime unit ('h', 'D', 'W', 'M' or 'Y').
+    """
+    epoch_ms = np.asarray(epoch_ms, dtype=np.float64)
+    valid = ~np.isnan(epoch_ms)
+    codes = np.full(epoch_ms.shape, -1, dtype=np.int64)
+    if not valid.any():
+        return codes, []
+
+    buckets = epoch_ms[valid].astype(np.int64).astype('datetime64[ms]').astype(f'datetime64[{freq}]')
+    steps = buckets.astype(np.int64)
+    first = steps.min()
+    codes[valid] = steps - first
+    labels = np.arange(first, steps.max() + 1).astype(f'datetime64[{freq}]').astype(str)
+    return codes, list(labels)
+
+
+class BinStatistics:
+    """
+    Per-bin count, mean, sum of squared deviations (M2), min and max of
+    one column
+
+    M2 is kept per bin, around each bin's own mean, so narrow bins keep
+    their variance exact; states are merged and retracted with the
+    pairwise (Chan) formulas. The number of rows equal to each extreme is
+    tracked too, so a retraction only loses an extreme when every row
+    holding it is removed.
+    """
+
+    def __init__(self, n_bins):
+        self.n_bins = n_bins
+        self.count = np.zeros(n_bins, dtype=np.int64)
+        self.mean = np.full(n_bins, np.nan)
+        self.m2 = np.zeros(n_bins)
+        self.min = np.full(n_bins, np.nan)
+        self.max = np.full(n_bins, np.nan)
+        self.min_count = np.zeros(n_bins, dtype=np.int64)
+        self.max_count = np.zeros(n_bins, dtype=np.int64)
+
+    @staticmethod
+    def from_codes(code_columns, value_columns, bin_counts):
+        """
+        Statistics for several binned columns in a few bincount passes
+
+        The codes of column i are offset into a shared index space so each
+        bincount (and one ufunc.at per extreme) covers every column. Values
+        are shifted by their bin's minimum before summing, so a bin of equal
+        values has an M2 of exactly zero.
+        """
+        offsets = np.concatenate([[0], np.cumsum(bin_counts)])
+        flat_codes, flat_values = [], []
+        for i, (codes, values) in enumerate(zip(code_columns, value_columns)):
+            valid = codes >= 0
+            flat_codes.append(codes[valid] + offsets[i])
+            flat_values.append(np.asarray(values, dtype=np.float64)[valid])
+        flat_codes = np.concatenate(flat_codes)
+        flat_values = np.concatenate(flat_values)
+
+        size = offsets[-1]
+        count = np.bincount(flat_codes, minlength=size)
+        minimum = np.full(size, np.inf)
+        maximum = np.full(size, -np.inf)
+        np.minimum.at(minimum, flat_codes, flat_values)
+        np.maximum.at(maximum, flat_codes, flat_values)
+        min_count = np.bincount(flat_codes, weights=flat_values == minimum[flat_codes], minlength=size)
+        max_count = np.bincount(flat_codes, weights=flat_values == maximum[flat_codes], minlength=size)
+
+        deviation = flat_values - minimum[flat_codes]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shifted_mean = np.bincount(flat_codes, weights=deviation, minlength=size) / count
+        deviation -= shifted_mean[flat_codes]
+        m2 = np.bincount(flat_codes, weights=deviation * deviation, minlength=size)
+
+        states = []
+        for i, n_bins in enumerate(bin_counts):
+            part = slice(offsets[i], offsets[i + 1])
+            state = BinStatistics(n_bins)
+            state.count = count[part]
+            empty = state.count == 0
+            state.mean = np.where(empty, np.nan, minimum[part] + shifted_mean[part])
+            state.m2 = m2[part]
+            state.min = np.where(empty, np.nan, minimum[part])
+            state.max = np.where(empty, np.nan, maximum[part])
+            state.min_count = min_count[part].astype(np.int64)
+            state.max_count = max_count[part].astype(np.int64)
+            states.append(state)
+        return states
+
+    def merge(self, other):
+        """
+        Fold in the state of more rows binned with the same bins
+        """
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            mean = self.mean + delta * n_b / n
+            m2 = self.m2 + other.m2 + delta * delta * n_a * n_b / n
+        
+        self.mean = np.where(n_a == 0, other.mean, np.where(n_b == 0, self.mean, mean))
+        self.m2 = np.where(n_a == 0, other.m2, np.where(n_b == 0, self.m2, m2))
+        self.count = n
+        minimum = np.fmin(self.min, other.min)
+        maximum = np.fmax(self.max, other.max)
+        self.min_count = (
+            np.where(self.min == minimum, self.min_count, 0)
+            + np.where(other.min == minimum, other.min_count, 0)
+        )
+        self.max_count = (
+            np.where(self.max == maximum, self.max_count, 0)
+            + np.where(other.max == maximum, other.max_count, 0)
+        )
+        self.min = minimum
+        self.max = maximum
+        return self
+
+    def retract(self, other):
+        """
+        Remove rows summarized by another state (same bins)
+
+        Returns the bins that lost every row holding their min or max; those
+        extremes must be recomputed from the remaining rows, see
+        recompute_extremes.
+        """
+        self.min_count = self.min_count - np.where(other.min == self.min, other.min_count, 0)
+        self.max_count = self.max_count - np.where(other.max == self.max, other.max_count, 0)
+        stale = (other.count > 0) & (
+            (other.min < self.min) | (other.max > self.max)
+            | (self.min_count <= 0) | (self.max_count <= 0)
+        )
+        n, n_b = self.count, other.count
+        n_a = n - n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (n * self.mean - n_b * other.mean) / n_a
+            delta = other.mean - mean
+            m2 = self.m2 - other.m2 - delta * delta * n_a * n_b / n
+        
+        removed = n_b > 0
+        empty = n_a == 0
+        self.count = n_a
+        self.mean = np.where(empty, np.nan, np.where(removed, mean, self.mean))
+        self.m2 = np.where(empty, 0.0, np.where(removed, np.maximum(m2, 0.0), self.m2))
+        self.min = np.where(empty, np.nan, self.min)
+        self.max = np.where(empty, np.nan, self.max)
+        self.min_count = np.where(empty, 0, self.min_count)
+        self.max_count = np.where(empty, 0, self.max_count)
+        return np.flatnonzero(stale & ~empty)
+
+    def recompute_extremes(self, bins, codes, values):
+        """
+        Exact min and max of the given bins from the rows currently in them
+        """
+        if len(bins) == 0:
+            return self
+        rows = np.isin(codes, bins) & ~np.isnan(values)
+        codes, values = codes[rows], values[rows]
+        minimum = np.full(self.n_bins, np.inf)
+        maximum = np.full(self.n_bins, -np.inf)
+        np.minimum.at(minimum, codes, values)
+        np.maximum.at(maximum, codes, values)
+        min_count = np.bincount(codes, weights=values == minimum[codes], minlength=self.n_bins)
+        max_count = np.bincount(codes, weights=values == maximum[codes], minlength=self.n_bins)
+        self.min = self.min.copy()
+        self.max = self.max.copy()
+        self.min_count = self.min_count.copy()
+        self.max_count = self.max_count.copy()
+        self.min[bins] = minimum[bins]
+        self.max[bins] = maximum[bins]
+        self.min_count[bins] = min_count[bins]
+        self.max_count[bins] = max_count[bins]
+        return self
+
+    def to_frame(self, labels, n_rows, name=None, dtype=None):
+        """
+        Bin statistics table in the layout of calculate_bin_statistics
+
+        Like a groupby over the bins, only bins holding rows are listed, and
+        mean, std, min and max follow the column dtype when it is given.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+        
+        observed = self.count > 0
+        index = pd.CategoricalIndex(
+            np.asarray(labels, dtype=object)[observed], categories=labels, ordered=True, name=name
+        )
+        stats = pd.DataFrame(
+            {
+                'count': self.count[observed],
+                'percentage': (self.count[observed] / n_rows) * 100,
+                'mean': self.mean[observed],
+                'std': std[observed],
+                'min': self.min[observed],
+                'max': self.max[observed]
+            },
+            index=index
+        )
+        if dtype is not None and np.issubdtype(dtype, np.floating):
+            stats = stats.astype({column: dtype for column in ('mean', 'std', 'min', 'max')})
+        elif dtype is not None and np.issubdtype(dtype, np.integer):
+            stats = stats.astype({'min': dtype, 'max': dtype})
+        return stats
+
 
 class EarthquakeBinningAnalysis:
     def __init__(self, data):
-        self.data = data
-        self.binned_data = {}
+        self._data = data
+        self._binned_data = {}
+        # Rows added by append() and not yet concatenated onto the frame,
+        # and the slot bookkeeping that keeps append() O(batch)
+        self._pending = []
+        self._append_index = None
+        self._next_label = None
+        # Per-bin state of the fixed-edge columns, see bin_columns, and the
+        # binned series each state was computed for
+        self.bin_states = {}
+        self.bin_state_sources = {}
+        # Relationship cube, built once on first use
+        self.bin_cube = None
+        # Finest spatial grid, coarser levels are rolled up from it
+        self.spatial_grid = None
+        
+    @property
+    def data(self):
+        """
+        The catalog, including appended rows
         
-    def perform_binning(self, column, n_bins=5, method='equal_width'):
+        Appended batches are concatenated on first access, so a run of
+        appends costs O(new rows) until the whole frame is needed.
+        """
+        self._consolidate()
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._pending = []
+        self._append_index = None
+        self._next_label = None
+
+    @property
+    def binned_data(self):
+        """
+        Binned series by column, aligned with data
+        """
+        self._consolidate()
+        return self._binned_data
+
+    @binned_data.setter
+    def binned_data(self, binned_data):
+        self._binned_data = binned_data
+
+    def _consolidate(self):
+        # Concatenate appended rows, drop retracted ones and rebuild the
+        # binned series of the appended columns from their codes
+        if not self._pending:
+            return
+        index = self._append_index
+        live = index.live.values
+        compact = index.n_live < index.n_slots
+        frame = pd.concat([self._data] + self._pending)
+        if compact:
+            frame = frame[live]
+        
+        for column in self.bin_states:
+            codes = index.codes[column].values
+            series = pd.Series(
+                pd.Categorical.from_codes(
+                    codes[live] if compact else codes,
+                    categories=BIN_SCHEMES[column][1],
+                    ordered=True
+                ),
+                index=frame.index,
+                name=column
+            )
+            self._binned_data[column] = series
+            self.bin_state_sources[column] = series
+        
+        self._data = frame
+        self._pending = []
+        if compact:
+            # Slots no longer match row positions; rebuilt on the next append
+            self._append_index = None
+
+    def n_rows(self):
+        """
+        Number of rows in data, without concatenating appended batches
+        """
+        if self._append_index is not None:
+            return self._append_index.n_live
+        return len(self._data)
+
+    def column_dtype(self, column):
+        """
+        dtype of a column of data, without concatenating appended batches
+        """
+        dtypes = [self._data[column].dtype] + [batch[column].dtype for batch in self._pending]
+        if all(isinstance(dtype, np.dtype) for dtype in dtypes):
+            return np.result_type(*dtypes)
+        return self.data[column].dtype
+
+    def prepare_columns(self):
+        """
+        Define columns used by the binning analyses
+        """
+        return {
+            'binned_columns': [
+                'magnitude',    # Magnitude classes
+                'depth',        # Shallow / intermediate / deep
+                'mmi',          # Modified Mercalli Intensity
+                'sig',          # Significance scores
+                'distanceKM',   # Distance to nearest location
+                'time'          # Event time (epoch ms) for time buckets
+            ],
+            'spatial_columns': [
+                'latitude',     # Grid cell rows
+                'longitude'     # Grid cell columns
+            ],
+            'revision_columns': [
+                'id',           # Event identifier
+                'updated'       # Revision time (epoch ms)
+            ]
+        }
+
+    def perform_binning(self, column, n_bins=5, method='equal_width', sketch_epsilon=None):
         """
         Perform binning on specified columns using different methods
+        
+        With sketch_epsilon, equal-frequency edges come from a KLL quantile
+        sketch (rank error ~ sketch_epsilon) instead of a full sort.
         """
         if method == 'equal_width':
             return pd.cut(self.data[column], bins=n_bins)
+        elif method == 'equal_frequency' and sketch_epsilon is not None:
+            edges = self.sketch_bin_edges(column, n_bins, sketch_epsilon)
+            return pd.cut(self.data[column], bins=edges, include_lowest=True)
         elif method == 'equal_frequency':
             return pd.qcut(self.data[column], q=n_bins)
         else:
             raise ValueError("Method must be 'equal_width' or 'equal_frequency'")
 
+    def sketch_bin_edges(self, column, n_bins, epsilon=0.01):
+        """
+        Approximate equal-frequency bin edges from a quantile sketch
+        """
+        sketch = KLLSketch(epsilon).update(self.data[column].to_numpy(dtype=np.float64))
+        return sketch.quantile(np.linspace(0, 1, n_bins + 1))
+
+    def bin_columns(self, columns=None):
+        """
+        Bin several fixed-edge columns and compute all their bin statistics
+        in a single linear pass
+        """
+        columns = list(BIN_SCHEMES) if columns is None else list(columns)
+        
+        code_columns, value_columns = [], []
+        for column in columns:
+            edges, labels = BIN_SCHEMES[column]
+            values = self.data[column].to_numpy(dtype=np.float64)
+            codes = assign_bin_codes(values, edges)
+            code_columns.append(codes)
+            value_columns.append(values)
+            
+            # Categorical bins straight from the codes, no interval rebuild
+            self.binned_data[column] = pd.Series(
+                pd.Categorical.from_codes(codes, categories=labels, ordered=True),
+                index=self.data.index,
+                name=column
+            )
+        
+        bin_counts = [len(BIN_SCHEMES[column][1]) for column in columns]
+        states = BinStatistics.from_codes(code_columns, value_columns, bin_counts)
+        self.bin_states.update(zip(columns, states))
+        self.bin_state_sources.update((column, self.binned_data[column]) for column in columns)
+        # The next append() indexes the new states
+        self._append_index = None
+        
+        return {column: self.calculate_bin_statistics(column) for column in columns}
+
+    def append_index(self):
+        """
+        Slot bookkeeping for append(), built once from the current rows
+        """
+        if self._append_index is None:
+            data = self.data
+            codes, values, bin_counts = {}, {}, {}
+            for column in self.current_bin_states():
+                codes[column] = self.binned_data[column].cat.codes.to_numpy()
+                values[column] = data[column].to_numpy(dtype=np.float64)
+                bin_counts[column] = self.bin_states[column].n_bins
+            self._append_index = AppendIndex(
+                data['id'].to_numpy(dtype=object),
+                data['updated'].to_numpy(),
+                codes, values, bin_counts
+            )
+            # Integer labels continue after the largest one, others are
+            # followed by positions, which cannot collide with them
+            if pd.api.types.is_integer_dtype(data.index.dtype) and len(data):
+                self._next_label = int(data.index.max()) + 1
+            else:
+                self._next_label = len(data)
+        return self._append_index
+
+    def append(self, new_events):
+        """
+        Add newly arrived or revised events without rebinning the catalog
+
+        Only the new rows are binned; their counts, means and extremes are
+        merged into bin_states. A row is a revision only when its `updated`
+        time differs from that of the rows already held for its id:
+        
+        - newer: every held row of the id is retracted and replaced;
+        - older: the row is stale and ignored;
+        - equal: the row is not a revision and is added like a new event,
+          so repeated rows (the bundled catalog has many) are kept exactly
+          as a full recompute over all rows would keep them.
+        
+        Within new_events, only the rows of each id's latest `updated` time
+        are used. Held rows are found through an id index, and min and max
+        are recomputed from the rows of a bin only when it lost an extreme,
+        so the cost follows the batch rather than the catalog. The index is
+        built once, on the first append after binning, and again after data
+        has been read with retracted rows in it.
+        """
+        if not self.current_bin_states():
+            self.bin_columns()
+        index = self.append_index()
+        
+        # Rows of the latest revision of every incoming event
+        incoming_latest = new_events.groupby('id', observed=True)['updated'].transform('max')
+        new_events = new_events[(new_events['updated'] == incoming_latest).to_numpy()]
+        updated = new_events['updated'].to_numpy()
+        groups = new_events.groupby('id', observed=True, sort=False).indices
+        event_ids = list(groups)
+        
+        # Stale revisions are dropped, newer ones retract every row they replace
+        kept = np.zeros(len(new_events), dtype=bool)
+        retracted, holdings = [], []
+        for event_id, held, rows in zip(event_ids, index.revisions.held(event_ids), groups.values()):
+            time = updated[rows[0]]
+            if held is None or time > held[0]:
+                if held is not None:
+                    retracted.append(held[1])
+                holdings.append((event_id, time, rows, None))
+            elif time == held[0]:
+                holdings.append((event_id, time, rows, held[1]))
+            else:
+                continue
+            kept[rows] = True
+        retracted = np.concatenate(retracted) if retracted else np.zeros(0, dtype=np.int64)
+        
+        index.retract(retracted)
+        for column, state in self.bin_states.items():
+            old_codes, old_values = index.rows(column, retracted)
+            removed = BinStatistics.from_codes([old_codes], [old_values], [state.n_bins])[0]
+            stale_bins = state.retract(removed)
+            if len(stale_bins):
+                # Only the remaining rows of bins that lost an extreme are read
+                state.recompute_extremes(stale_bins, *index.bin_rows(column, stale_bins))
+        
+        new_events = new_events[kept].reindex(columns=self._data.columns)
+        new_codes, new_values = {}, {}
+        for column, state in self.bin_states.items():
+            edges, _ = BIN_SCHEMES[column]
+            new_values[column] = new_events[column].to_numpy(dtype=np.float64)
+            new_codes[column] = assign_bin_codes(new_values[column], edges)
+            added = BinStatistics.from_codes([new_codes[column]], [new_values[column]], [state.n_bins])[0]
+            state.merge(added)
+        
+        slots = index.extend(len(new_events), new_codes, new_values)
+        positions = np.cumsum(kept) - 1
+        for event_id, time, rows, previous in holdings:
+            new_slots = slots[positions[rows]]
+            if previous is not None:
+                new_slots = np.concatenate([previous, new_slots])
+            index.revisions.hold(event_id, time, new_slots)
+        
+        # Fresh index labels after the existing ones
+        new_events.index = pd.RangeIndex(self._next_label, self._next_label + len(new_events))
+        self._next_label += len(new_events)
+        self._pending.append(new_events)
+        
+        # Ad-hoc bins, the cube and the spatial grid describe the old rows
+        for column in set(self._binned_data) - set(self.bin_states):
+            del self._binned_data[column]
+        self.bin_cube = None
+        self.spatial_grid = None
+        
+        return {column: self.calculate_bin_statistics(column) for column in self.bin_states}
+
+    def binning_report(self):
+        """
+        Bin statistics for every fixed-edge column
+        """
+        return self.bin_columns()
+
     def magnitude_binning(self, n_bins=5):
         """
         Bin earthquake magnitudes
         Typical ranges: <2 (micro), 2-4 (minor), 4-6 (light), 6-7 (moderate), >7 (major)
         """
-        bins = [0, 2, 4, 6, 7, np.inf]
-        labels = ['Micro', 'Minor', 'Light', 'Moderate', 'Major']
-        
-        self.binned_data['magnitude'] = pd.cut(
-            self.data['magnitude'],
-            bins=bins,
-            labels=labels,
-            include_lowest=True
-        )
-        
-        return self.calculate_bin_statistics('magnitude')
+        return self.bin_columns(['magnitude'])['magnitude']
 
     def depth_binning(self, n_bins=5):
         """
@@ -44,34 +564,13 @@ class EarthquakeBinningAnalysis:
         Intermediate: 70-300 km
         Deep: >300 km
         """
-        bins = [0, 70, 300, np.inf]
-        labels = ['Shallow', 'Intermediate', 'Deep']
-        
-        self.binned_data['depth'] = pd.cut(
-            self.data['depth'],
-            bins=bins,
-            labels=labels,
-            include_lowest=True
-        )
-        
-        return self.calculate_bin_statistics('depth')
+        return self.bin_columns(['depth'])['depth']
 
     def intensity_binning(self):
         """
         Bin earthquake intensities (MMI scale)
         """
-        # Modified Mercalli Intensity (MMI) scale bins
-        bins = range(0, 13)  # MMI scale goes from I to XII
-        labels = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII']
-        
-        self.binned_data['mmi'] = pd.cut(
-            self.data['mmi'],
-            bins=bins,
-            labels=labels,
-            include_lowest=True
-        )
-        
-        return self.calculate_bin_statistics('mmi')
+        return self.bin_columns(['mmi'])['mmi']
 
     def significance_binning(self, n_bins=5):
         """
@@ -85,68 +584,156 @@ class EarthquakeBinningAnalysis:
         """
         return self.perform_binning('distanceKM', n_bins)
 
+    def current_bin_states(self):
+        """
+        Bin states whose column has not been rebinned since they were built
+
+        A state is only valid for the very series it was computed from;
+        states of columns whose binned_data entry has been replaced are
+        dropped.
+        """
+        for column in list(self.bin_states):
+            if self._binned_data.get(column) is not self.bin_state_sources.get(column):
+                del self.bin_states[column]
+                self.bin_state_sources.pop(column, None)
+        return self.bin_states
+
     def calculate_bin_statistics(self, column):
         """
         Calculate statistics for each bin
         """
-        stats = pd.DataFrame()
-        
-        # Basic statistics
-        stats['count'] = self.data.groupby(self.binned_data[column]).size()
-        stats['percentage'] = (stats['count'] / len(self.data)) * 100
-        
-        # Additional statistics based on the original values
-        stats['mean'] = self.data.groupby(self.binned_data[column])[column].mean()
-        stats['std'] = self.data.groupby(self.binned_data[column])[column].std()
-        stats['min'] = self.data.groupby(self.binned_data[column])[column].min()
-        stats['max'] = self.data.groupby(self.binned_data[column])[column].max()
+        if column in self.current_bin_states():
+            # Kept up to date by append(), so the frame is not needed
+            state = self.bin_states[column]
+            labels = BIN_SCHEMES[column][1]
+        else:
+            # Bins from elsewhere (e.g. perform_binning): one bincount pass
+            binned = self.binned_data[column]
+            labels = list(binned.cat.categories)
+            state = BinStatistics.from_codes(
+                [binned.cat.codes.to_numpy()],
+                [self.data[column].to_numpy(dtype=np.float64)],
+                [len(labels)]
+            )[0]
         
-        return stats
+        return state.to_frame(labels, self.n_rows(), name=column, dtype=self.column_dtype(column))
 
-    def visualize_binned_data(self, column):
+    def visualize_binned_data(self, column, binned=False):
         """
         Create visualizations for binned data
+        
+        binned=True draws the box and violin plots from per-bin quartiles
+        and FFT KDEs instead of handing every row to seaborn.
         """
         fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 6))
         
         # Histogram of bin frequencies
-        sns.histplot(
-            data=self.binned_data[column],
-            ax=ax1
-        )
+        if binned:
+            bin_counts = self.binned_data[column].value_counts(sort=False)
+            ax1.bar(bin_counts.index.astype(str), bin_counts.values)
+        else:
+            sns.histplot(
+                data=self.binned_data[column],
+                ax=ax1
+            )
         ax1.set_title(f'Distribution of {column} Bins')
         ax1.set_xlabel('Bins')
         ax1.set_ylabel('Frequency')
         
+        if binned:
+            codes = self.binned_data[column].cat.codes.to_numpy()
+            labels = [str(label) for label in self.binned_data[column].cat.categories]
+            values = self.data[column].to_numpy(dtype=np.float64)
+            groups = split_by_code(values, codes, len(labels))
+        
         # Box plot
-        sns.boxplot(
-            x=self.binned_data[column],
-            y=self.data[column],
-            ax=ax2
-        )
+        if binned:
+            plot_binned_boxes(ax2, groups, labels)
+        else:
+            sns.boxplot(
+                x=self.binned_data[column],
+                y=self.data[column],
+                ax=ax2
+            )
         ax2.set_title(f'Box Plot of {column} by Bins')
         
         # Violin plot
-        sns.violinplot(
-            x=self.binned_data[column],
-            y=self.data[column],
-            ax=ax3
-        )
+        if binned:
+            plot_binned_violins(ax3, groups, labels)
+        else:
+            sns.violinplot(
+                x=self.binned_data[column],
+                y=self.data[column],
+                ax=ax3
+            )
         ax3.set_title(f'Violin Plot of {column} by Bins')
         
         plt.tight_layout()
         plt.show()
 
+    def build_bin_cube(self, time_freq='M'):
+        """
+        Precompute counts and sums over magnitude x depth x MMI x
+        significance x time-bucket bins in one pass
+
+        Every time bucket adds a full magnitude x depth x MMI x significance
+        block, so fine frequencies ('D', 'h') over a long catalog exceed
+        BinCube's cell limit and raise a ValueError.
+        """
+        dimension_codes = {}
+        for column in CUBE_DIMENSIONS:
+            edges, labels = BIN_SCHEMES[column]
+            dimension_codes[column] = (
+                assign_bin_codes(self.data[column].to_numpy(dtype=np.float64), edges),
+                labels
+            )
+        dimension_codes['time'] = assign_time_buckets(
+            self.data['time'].to_numpy(dtype=np.float64), time_freq
+        )
+        
+        measures = {
+            column: self.data[column].to_numpy(dtype=np.float64)
+            for column in ('magnitude', 'depth', 'sig')
+        }
+        self.bin_cube = BinCube.build(dimension_codes, measures)
+        return self.bin_cube
+
+    def relationship_table(self, dimensions, normalize=False):
+        """
+        Contingency table (2-D) or counts (3-D and up) served from the cube
+        """
+        if self.bin_cube is None:
+            self.build_bin_cube()
+        if len(dimensions) == 2:
+            return self.bin_cube.contingency(*dimensions, normalize=normalize)
+        return self.bin_cube.marginal(dimensions)
+
+    def uses_cube_bins(self, column):
+        """
+        Whether the column's current bins are those of the relationship cube:
+        a cube dimension that is either not binned yet or binned with its
+        fixed scheme
+        """
+        if column not in CUBE_DIMENSIONS + ['time']:
+            return False
+        return column not in self.binned_data or column in self.current_bin_states()
+
     def analyze_relationships(self, column1, column2):
         """
         Analyze relationships between binned variables
         """
-        # Create contingency table
-        contingency_table = pd.crosstab(
-            self.binned_data[column1],
-            self.binned_data[column2],
-            normalize='index'
-        )
+        # Create contingency table; the cube only has the fixed schemes, so
+        # columns binned any other way are cross-tabulated directly
+        if self.uses_cube_bins(column1) and self.uses_cube_bins(column2):
+            contingency_table = self.relationship_table(
+                [column1, column2], normalize='index'
+            )
+        else:
+            contingency_table = pd.crosstab(
+                self.binned_data[column1],
+                self.binned_data[column2],
+                normalize='index'
+            )
         
         # Visualize relationship
         plt.figure(figsize=(10, 6))
@@ -156,9 +743,36 @@ class EarthquakeBinningAnalysis:
         
         return contingency_table
 
+    def spatial_binning(self, level=8):
+        """
+        Assign every event to a quadkey grid cell and aggregate per cell
+        """
+        edges, labels = BIN_SCHEMES['depth']
+        self.spatial_grid = SpatialGrid.build(
+            self.data['latitude'].to_numpy(dtype=np.float64),
+            self.data['longitude'].to_numpy(dtype=np.float64),
+            self.data['magnitude'].to_numpy(dtype=np.float64),
+            self.data['sig'].to_numpy(dtype=np.float64),
+            assign_bin_codes(self.data['depth'].to_numpy(dtype=np.float64), edges),
+            labels,
+            level
+        )
+        return self.spatial_grid.summary()
+
+    def regional_hotspots(self, level=4, top_n=10, by='count'):
+        """
+        Busiest grid cells at a (coarser) level, rolled up from the fine grid
+        """
+        if self.spatial_grid is None or self.spatial_grid.level < level:
+            self.spatial_binning(max(level, 8))
+        grid = self.spatial_grid
+        if level < grid.level:
+            grid = grid.rollup(level)
+        return grid.hotspots(top_n, by)
+
 def main():
     # Load earthquake data
-    data = pd.read_csv('earthquakes.csv')
+    data = load_catalog([EarthquakeBinningAnalysis])
     
     # Initialize binning analyzer
     analyzer = EarthquakeBinningAnalysis(data)
@@ -184,6 +798,10 @@ def main():
     relationship = analyzer.analyze_relationships('magnitude', 'depth')
     print("\nRelationship between Magnitude and Depth Bins:")
     print(relationship)
+    
+    # Regional hotspots from the spatial grid
+    print("\nRegional Hotspots:")
+    print(analyzer.regional_hotspots())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,12 +1,65 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
 import matplotlib.pyplot as plt
-import seaborn as sns
+from earthquake_analysis.DataLoader import load_catalog
+from earthquake_analysis.ValidityMask import ValidityMaskIndex
+from earthquake_analysis.Resampling import bootstrap_correlations, permutation_test
+from earthquake_analysis.NonlinearDependence import screen_dependence
+from earthquake_analysis.CorrelationEngine import (
+    RankCache, centered_columns, pearson_block, pearson_from_sums, pearson_p_values,
+    spearman_against
+)
+from earthquake_analysis.StreamingMoments import CoMomentAccumulator
+
+# p-value cut-offs of the significance levels
+SIGNIFICANCE_THRESHOLDS = (0.01, 0.05, 0.1)
 
 class EarthquakeCorrelationCoefficient:
     def __init__(self, data):
         self.data = data
+        # Column ranks shared by every target, built on first use
+        self.rank_cache = None
+        # Streaming state when data is None, see accumulate_chunks
+        self.comoments = None
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Create an analyzer whose Pearson columns come from streamed chunks
+        """
+        analyzer = cls(None)
+        analyzer.accumulate_chunks(chunks)
+        return analyzer
+
+    def accumulate_chunks(self, chunks):
+        """
+        Accumulate mergeable co-moments over chunks in constant memory
+        """
+        if self.comoments is None:
+            self.comoments = CoMomentAccumulator(self.analysis_columns())
+        for chunk in chunks:
+            self.comoments.update(chunk)
+        return self.comoments
+
+    def revise(self, added=None, removed=None):
+        """
+        Update the streamed co-moments for new and retracted events
+        
+        Costs O(rows changed); revised events are passed as the removed old
+        row plus the added new one.
+        """
+        if removed is not None:
+            self.comoments.remove(removed)
+        if added is not None:
+            self.comoments.update(added)
+        return self.comoments
+
+    def require_rows(self, statistic):
+        """
+        Fail clearly for statistics that cannot be streamed
+        """
+        if self.data is None:
+            raise ValueError(f"{statistic} needs the full columns and is unavailable in streaming mode")
         
     def prepare_analysis_columns(self):
         """
@@ -41,46 +94,176 @@ class EarthquakeCorrelationCoefficient:
             }
         }
 
+    def analysis_columns(self):
+        """
+        Every target followed by every predictor column
+        """
+        columns = self.prepare_analysis_columns()
+        return columns['target_variables'] + sum(columns['predictor_variables'].values(), [])
+
+    def get_rank_cache(self):
+        """
+        Rank cache over every target and predictor column
+        """
+        self.require_rows('Rank-based dependence')
+        if self.rank_cache is None:
+            analysis_columns = self.analysis_columns()
+            validity = ValidityMaskIndex.for_frame(self.data)
+            self.rank_cache = RankCache(
+                self.data[analysis_columns].to_numpy(dtype=np.float64),
+                analysis_columns,
+                validity.mask[:, [validity.positions[column] for column in analysis_columns]]
+            )
+        return self.rank_cache
+
     def calculate_correlation_coefficients(self, target_variable):
         """
         Calculate correlation coefficients and p-values for a target variable
+        
+        Pearson and Spearman coefficients against all predictors are each
+        one masked matrix operation; Spearman reuses the cached column
+        ranks, so no column is sorted more than once per analyzer.
+        
+        In streaming mode (data is None) the Pearson columns come from the
+        accumulated co-moments; ranks need every row, so the Spearman
+        columns are NaN there.
         """
         columns = self.prepare_analysis_columns()
         predictor_vars = sum(columns['predictor_variables'].values(), [])
+        if self.data is None:
+            return self.streamed_correlation_coefficients(target_variable, predictor_vars)
+        ranks = self.get_rank_cache()
         
-        correlation_results = []
+        # Pairwise-complete Pearson of the target against every predictor
+        target_position = ranks.positions[target_variable]
+        predictor_positions = [ranks.positions[column] for column in predictor_vars]
+        target_values, target_present = centered_columns(
+            ranks.values[:, [target_position]], ranks.mask[:, [target_position]]
+        )
+        predictor_values, predictor_present = centered_columns(
+            ranks.values[:, predictor_positions], ranks.mask[:, predictor_positions]
+        )
+        pearson, sample_size = pearson_block(
+            target_values, target_present, predictor_values, predictor_present
+        )
+        pearson, sample_size = pearson[0], sample_size[0]
+        pearson_p = pearson_p_values(pearson, sample_size)
         
-        for predictor in predictor_vars:
-            # Remove missing values
-            valid_data = self.data[[target_variable, predictor]].dropna()
-            
-            if len(valid_data) > 1:  # Check if we have enough data
-                # Calculate Pearson correlation coefficient and p-value
-                corr_coef, p_value = stats.pearsonr(
-                    valid_data[target_variable],
-                    valid_data[predictor]
-                )
-                
-                # Calculate Spearman correlation for non-linear relationships
-                spearman_coef, spearman_p = stats.spearmanr(
-                    valid_data[target_variable],
-                    valid_data[predictor]
-                )
-                
-                # Calculate R-squared value
-                r_squared = corr_coef ** 2
-                
-                correlation_results.append({
-                    'predictor': predictor,
-                    'pearson_correlation': corr_coef,
-                    'pearson_p_value': p_value,
-                    'spearman_correlation': spearman_coef,
-                    'spearman_p_value': spearman_p,
-                    'r_squared': r_squared,
-                    'sample_size': len(valid_data)
-                })
-        
-        return pd.DataFrame(correlation_results)
+        # Spearman from ranks over each pair's complete rows
+        spearman, _, spearman_p = spearman_against(ranks, target_variable, predictor_vars)
+        return self.correlation_frame(
+            predictor_vars, pearson, pearson_p, spearman, spearman_p, sample_size
+        )
+
+    def streamed_correlation_coefficients(self, target_variable, predictor_vars):
+        """
+        Pearson columns of calculate_correlation_coefficients from the
+        streamed co-moments
+        """
+        r, n, p = pearson_from_sums(*self.comoments.pairwise_sums())
+        positions = {column: i for i, column in enumerate(self.comoments.columns)}
+        target_position = positions[target_variable]
+        predictor_positions = [positions[column] for column in predictor_vars]
+        unavailable = np.full(len(predictor_vars), np.nan)
+        return self.correlation_frame(
+            predictor_vars,
+            r[target_position, predictor_positions],
+            p[target_position, predictor_positions],
+            unavailable,
+            unavailable,
+            n[target_position, predictor_positions]
+        )
+
+    @staticmethod
+    def correlation_frame(predictor_vars, pearson, pearson_p, spearman, spearman_p, sample_size):
+        """
+        Assemble the per-predictor results, dropping pairs without data
+        """
+        correlation_results = pd.DataFrame({
+            'predictor': predictor_vars,
+            'pearson_correlation': pearson,
+            'pearson_p_value': pearson_p,
+            'spearman_correlation': spearman,
+            'spearman_p_value': spearman_p,
+            'r_squared': pearson ** 2,
+            'sample_size': sample_size.astype(np.int64)
+        })
+        # Check if we have enough data
+        return correlation_results[correlation_results['sample_size'] > 1].reset_index(drop=True)
+
+    def bootstrap_confidence_intervals(self, target_variable, n_resamples=1000, confidence=0.95,
+                                       seed=None, n_workers=None, batch_size=100):
+        """
+        Percentile bootstrap intervals of the Pearson correlation between
+        the target and every predictor
+        """
+        self.require_rows('Bootstrapping')
+        predictor_vars = sum(self.prepare_analysis_columns()['predictor_variables'].values(), [])
+        columns = [target_variable] + predictor_vars
+        validity = ValidityMaskIndex.for_frame(self.data)
+        positions = [validity.positions[column] for column in columns]
+        pairs = [(0, i) for i in range(1, len(columns))]
+        
+        intervals = bootstrap_correlations(
+            self.data[columns].to_numpy(dtype=np.float64),
+            pairs,
+            validity.mask[:, positions],
+            n_resamples=n_resamples,
+            confidence=confidence,
+            batch_size=batch_size,
+            seed=seed,
+            n_workers=n_workers
+        )
+        intervals.insert(0, 'predictor', predictor_vars)
+        return intervals
+
+    def permutation_significance(self, target_variable, max_permutations=10000, seed=None,
+                                 n_workers=None, batch_size=500):
+        """
+        Permutation p-values of the target's Pearson correlation with every
+        predictor, robust to heavy-tailed columns
+        
+        Predictors stop being permuted as soon as their p-value is clearly
+        on one side of each significance threshold.
+        """
+        self.require_rows('Permutation testing')
+        predictor_vars = sum(self.prepare_analysis_columns()['predictor_variables'].values(), [])
+        validity = ValidityMaskIndex.for_frame(self.data)
+        results = permutation_test(
+            self.data[target_variable].to_numpy(dtype=np.float64),
+            self.data[predictor_vars].to_numpy(dtype=np.float64),
+            validity.column_mask(target_variable),
+            validity.mask[:, [validity.positions[column] for column in predictor_vars]],
+            max_permutations=max_permutations,
+            batch_size=batch_size,
+            thresholds=SIGNIFICANCE_THRESHOLDS,
+            seed=seed,
+            n_workers=n_workers
+        )
+        results.insert(0, 'predictor', predictor_vars)
+        return results
+
+    def calculate_extended_dependence(self, target_variable, n_workers=None):
+        """
+        Kendall tau-b (with its p-value) and distance correlation of the
+        target against every predictor, to screen for monotone and
+        nonlinear dependence that Pearson misses
+        
+        Both are O(n log n) per pair; with n_workers > 1 the pairs are
+        spread over a process pool.
+        """
+        predictor_vars = sum(self.prepare_analysis_columns()['predictor_variables'].values(), [])
+        ranks = self.get_rank_cache()
+        # Missing values as NaN, so each pair keeps its complete rows
+        values = np.where(ranks.mask, ranks.values, np.nan)
+        
+        results = screen_dependence(
+            values[:, ranks.positions[target_variable]],
+            [values[:, ranks.positions[column]] for column in predictor_vars],
+            n_workers=n_workers
+        )
+        results.insert(0, 'predictor', predictor_vars)
+        return results
 
     def sort_correlations_by_strength(self, correlation_results):
         """
@@ -97,24 +280,29 @@ class EarthquakeCorrelationCoefficient:
         
         return sorted_results
 
-    def analyze_significance_levels(self, correlation_results):
+    def analyze_significance_levels(self, correlation_results, p_value_column='pearson_p_value'):
         """
         Analyze statistical significance at different levels
+        
+        Pass p_value_column='permutation_p_value' to bucket on permutation
+        p-values (see permutation_significance) instead of parametric ones.
         """
+        p_values = correlation_results[p_value_column]
+        highly, significant, marginal = SIGNIFICANCE_THRESHOLDS
         significance_levels = {
             'highly_significant': correlation_results[
-                correlation_results['pearson_p_value'] < 0.01
+                p_values < highly
             ],
             'significant': correlation_results[
-                (correlation_results['pearson_p_value'] >= 0.01) & 
-                (correlation_results['pearson_p_value'] < 0.05)
+                (p_values >= highly) & 
+                (p_values < significant)
             ],
             'marginally_significant': correlation_results[
-                (correlation_results['pearson_p_value'] >= 0.05) & 
-                (correlation_results['pearson_p_value'] < 0.1)
+                (p_values >= significant) & 
+                (p_values < marginal)
             ],
             'not_significant': correlation_results[
-                correlation_results['pearson_p_value'] >= 0.1
+                p_values >= marginal
             ]
         }
         
@@ -157,9 +345,14 @@ class EarthquakeCorrelationCoefficient:
         plt.tight_layout()
         return plt.gcf()
 
-    def generate_detailed_report(self):
+    def generate_detailed_report(self, permutation=False, extended=False, seed=None,
+                                 n_workers=None):
         """
         Generate detailed correlation coefficient analysis report
+        
+        permutation=True adds permutation p-values and buckets the
+        significance levels on them; extended=True adds Kendall tau-b and
+        distance correlation columns.
         """
         columns = self.prepare_analysis_columns()
         report = {}
@@ -167,13 +360,31 @@ class EarthquakeCorrelationCoefficient:
         for target in columns['target_variables']:
             # Calculate correlations
             correlations = self.calculate_correlation_coefficients(target)
+            p_value_column = 'pearson_p_value'
+            if permutation:
+                permutation_results = self.permutation_significance(
+                    target, seed=seed, n_workers=n_workers
+                )
+                correlations = correlations.merge(
+                    permutation_results[['predictor', 'permutation_p_value', 'n_permutations']],
+                    on='predictor',
+                    how='left'
+                )
+                p_value_column = 'permutation_p_value'
+            if extended:
+                dependence = self.calculate_extended_dependence(target, n_workers=n_workers)
+                correlations = correlations.merge(
+                    dependence.drop(columns='sample_size'),
+                    on='predictor',
+                    how='left'
+                )
             
             # Sort by strength
             sorted_correlations = self.sort_correlations_by_strength(correlations)
             
             # Analyze significance
             significance_analysis = self.analyze_significance_levels(
-                sorted_correlations
+                sorted_correlations, p_value_column
             )
             
             report[target] = {
@@ -189,7 +400,7 @@ class EarthquakeCorrelationCoefficient:
 
 def main():
     # Load earthquake data
-    data = pd.read_csv('earthquakes.csv')
+    data = load_catalog([EarthquakeCorrelationCoefficient])
     
     # Initialize analyzer
     analyzer = EarthquakeCorrelationCoefficient(data)
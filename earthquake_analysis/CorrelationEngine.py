@@ -0,0 +1,356 @@
+import hashlib
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+
+def pearson_p_values(r, n):
+    """
+    Two-sided p-values of Pearson r under the t distribution with n - 2
+    degrees of freedom, as scipy.stats.pearsonr reports them
+    """
+    r = np.asarray(r, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df = n - 2
+        t = np.abs(r) * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p = 2.0 * stats.t.sf(t, df)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    # With two points r is always +-1 and pearsonr reports p = 1
+    p = np.where(n == 2, 1.0, p)
+    return np.where((n < 2) | np.isnan(r), np.nan, p)
+
+
+def centered_columns(values, mask=None):
+    """
+    Columns centered on their own mean with missing values zeroed, and the
+    presence mask as floats, ready for pairwise sums by matrix products
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if mask is None:
+        mask = ~np.isnan(values)
+    present = mask.astype(np.float64)
+    count = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        column_mean = np.where(mask, values, 0.0).sum(axis=0) / count
+    return np.where(mask, values - np.nan_to_num(column_mean), 0.0), present
+
+
+def pairwise_pearson(values, mask=None):
+    """
+    Pairwise-complete Pearson correlations of every column pair at once
+
+    values is a (rows x columns) array and mask flags present values (NaNs
+    are treated as missing when no mask is given). For each pair only the
+    rows where both columns are present are used, as in pandas' corr().
+    Returns float arrays r, n (rows per pair) and two-sided p-values.
+
+    The pairwise sums come from three matrix products over the masked,
+    column-centered data, so the cost is a few GEMMs instead of a Python
+    loop over pairs.
+    """
+    # Centering on each column's own mean keeps the sums well conditioned
+    centered, present = centered_columns(values, mask)
+
+    n = present.T @ present
+    # sums[i, j]: sum of column i over the rows where column j is present
+    sums = centered.T @ present
+    squares = (centered * centered).T @ present
+    products = centered.T @ centered
+    return pearson_from_sums(n, sums, squares, products)
+
+
+def pearson_from_sums(n, sums, squares, products):
+    """
+    Pairwise Pearson r, n and p from pairwise sums of (shifted) values
+
+    sums[i, j] and squares[i, j] are the sum and sum of squares of column i
+    over the n[i, j] rows where columns i and j are both present, and
+    products[i, j] the sum of their products over those rows.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = products - sums * sums.T / n
+        variance_i = squares - sums * sums / n
+        variance_j = variance_i.T
+        r = covariance / np.sqrt(variance_i * variance_j)
+    r = np.clip(r, -1.0, 1.0)
+    r = np.where((n < 2) | (variance_i <= 0) | (variance_j <= 0), np.nan, r)
+
+    return r, n, pearson_p_values(r, n)
+
+
+def pearson_block(centered_a, present_a, centered_b, present_b):
+    """
+    Pairwise-complete Pearson r and n between two column blocks
+    """
+    n = present_a.T @ present_b
+    sums_a = centered_a.T @ present_b
+    sums_b = present_a.T @ centered_b
+    squares_a = (centered_a * centered_a).T @ present_b
+    squares_b = present_a.T @ (centered_b * centered_b)
+    products = centered_a.T @ centered_b
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance_a = squares_a - sums_a * sums_a / n
+        variance_b = squares_b - sums_b * sums_b / n
+        r = (products - sums_a * sums_b / n) / np.sqrt(variance_a * variance_b)
+    r = np.clip(r, -1.0, 1.0)
+    return np.where((n < 2) | (variance_a <= 0) | (variance_b <= 0), np.nan, r), n
+
+
+def strong_correlations(values, columns, mask=None, threshold=0.5, top_k=None, block_size=256):
+    """
+    Column pairs with |r| >= threshold, or the top_k pairs by |r|, found
+    tile by tile without materializing the full correlation matrix
+
+    Only blocks of block_size x block_size correlations are alive at a
+    time; with top_k the candidates are cut back to k after every block,
+    so memory stays bounded by the block and the result size. Pairs with
+    equal |r| are ranked by column position, so ties are cut the same way
+    as over the full matrix.
+    """
+    centered, present = centered_columns(values, mask)
+    n_columns = centered.shape[1]
+    found_i, found_j, found_r, found_n = [], [], [], []
+    kept = 0
+
+    for start_a in range(0, n_columns, block_size):
+        block_a = slice(start_a, min(start_a + block_size, n_columns))
+        for start_b in range(start_a, n_columns, block_size):
+            block_b = slice(start_b, min(start_b + block_size, n_columns))
+            r, n = pearson_block(
+                centered[:, block_a], present[:, block_a],
+                centered[:, block_b], present[:, block_b]
+            )
+            rows, cols = np.indices(r.shape)
+            rows, cols = rows + start_a, cols + start_b
+            # Upper triangle only, each pair once
+            keep = (cols > rows) & ~np.isnan(r)
+            if top_k is None:
+                keep &= np.abs(r) >= threshold
+            found_i.append(rows[keep])
+            found_j.append(cols[keep])
+            found_r.append(r[keep])
+            found_n.append(n[keep])
+            kept += int(keep.sum())
+
+            if top_k is not None and kept > top_k:
+                found_i, found_j, found_r, found_n = (
+                    [np.concatenate(found)] for found in (found_i, found_j, found_r, found_n)
+                )
+                best = np.lexsort((found_j[0], found_i[0], -np.abs(found_r[0])))[:top_k]
+                found_i, found_j, found_r, found_n = (
+                    [found[0][best]] for found in (found_i, found_j, found_r, found_n)
+                )
+                kept = top_k
+
+    i, j, r, n = (
+        np.concatenate(found) if found else np.empty(0)
+        for found in (found_i, found_j, found_r, found_n)
+    )
+    order = np.lexsort((j, i, -np.abs(r))) if top_k is not None else np.lexsort((j, i))
+    columns = np.asarray(columns, dtype=object)
+    return pd.DataFrame({
+        'variable1': columns[i[order].astype(np.int64)],
+        'variable2': columns[j[order].astype(np.int64)],
+        'correlation': r[order],
+        'n': n[order].astype(np.int64)
+    })
+
+
+class RankCache:
+    """
+    Tie-aware average ranks, sorting every column only once
+
+    Each column's present values are argsorted on first use. Ranks over
+    any row subset (the pairwise-complete rows of a pair) are then read off
+    the cached order in O(n), and ranks per (column, subset) are memoized.
+    """
+
+    def __init__(self, values, columns, mask=None):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.columns = list(columns)
+        self.positions = {column: i for i, column in enumerate(self.columns)}
+        self.mask = ~np.isnan(self.values) if mask is None else mask
+        self._orders = {}
+        self._ranks = {}
+
+    def order(self, column):
+        """
+        Rows of the column's present values in ascending value order
+        """
+        if column not in self._orders:
+            position = self.positions[column]
+            rows = np.flatnonzero(self.mask[:, position])
+            self._orders[column] = rows[np.argsort(self.values[rows, position], kind='stable')]
+        return self._orders[column]
+
+    def ranks(self, column, rows=None):
+        """
+        Average ranks (1-based, ties share their mean rank) of the column
+        over a boolean row subset; NaN outside of it
+        """
+        position = self.positions[column]
+        if rows is None or np.array_equal(rows, self.mask[:, position]):
+            rows, key = None, (column, None)
+        else:
+            key = (column, hashlib.blake2b(np.packbits(rows).tobytes(), digest_size=16).digest())
+        if key in self._ranks:
+            return self._ranks[key]
+
+        order = self.order(column)
+        if rows is not None:
+            order = order[rows[order]]
+        sorted_values = self.values[order, position]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_values)) + 1])
+        ends = np.concatenate([starts[1:], [sorted_values.size]])
+
+        ranks = np.full(self.values.shape[0], np.nan)
+        ranks[order] = np.repeat((starts + ends + 1) / 2.0, ends - starts)
+        self._ranks[key] = ranks
+        return ranks
+
+
+def spearman_against(rank_cache, target, predictors):
+    """
+    Spearman rho, n and p of one target against many predictors
+
+    Predictors that share the same pairwise-complete rows are ranked over
+    those rows and scored together in one matrix operation; without
+    missing values that is a single operation for all of them.
+    """
+    mask = rank_cache.mask
+    target_mask = mask[:, rank_cache.positions[target]]
+    rho = np.full(len(predictors), np.nan)
+    n = np.zeros(len(predictors))
+
+    groups = {}
+    for i, predictor in enumerate(predictors):
+        rows = target_mask & mask[:, rank_cache.positions[predictor]]
+        groups.setdefault(np.packbits(rows).tobytes(), (rows, []))[1].append(i)
+
+    for rows, members in groups.values():
+        if rows.sum() < 2:
+            n[members] = rows.sum()
+            continue
+        target_ranks = rank_cache.ranks(target, rows)[rows]
+        predictor_ranks = np.column_stack([
+            rank_cache.ranks(predictors[i], rows)[rows] for i in members
+        ])
+        ones = np.ones((rows.sum(), 1))
+        r, count = pearson_block(
+            (target_ranks - target_ranks.mean())[:, None], ones,
+            predictor_ranks - predictor_ranks.mean(axis=0), np.ones(predictor_ranks.shape)
+        )
+        rho[members] = r[0]
+        n[members] = count[0]
+
+    return rho, n, pearson_p_values(rho, n)
+
+
+class CorrelationResult:
+    """
+    Pearson r, pair counts and p-values over one column set
+
+    Any block of the matrix (a group, or one group against another) is
+    served as a slice, so every view agrees with the full matrix.
+    """
+
+    def __init__(self, columns, r, n, p):
+        self.columns = list(columns)
+        self.positions = {column: i for i, column in enumerate(self.columns)}
+        self.r = r
+        self.n = n
+        self.p = p
+
+    @classmethod
+    def from_pearson(cls, columns, r, n, p):
+        """
+        Result from pairwise_pearson output; a column against itself is
+        reported as r = 1, p = 0
+        """
+        diagonal = np.diag_indices_from(r)
+        defined = ~np.isnan(r[diagonal])
+        r[diagonal] = np.where(defined, 1.0, np.nan)
+        p[diagonal] = np.where(defined, 0.0, np.nan)
+        return cls(columns, r, n, p)
+
+    def covers(self, columns):
+        """
+        Whether every given column is part of the result
+        """
+        return all(column in self.positions for column in columns)
+
+    def block(self, rows, columns=None, statistic='r'):
+        """
+        Sub-matrix of r, n or p as a labeled DataFrame
+        """
+        columns = rows if columns is None else columns
+        matrix = getattr(self, statistic)
+        selected = matrix[np.ix_(
+            [self.positions[column] for column in rows],
+            [self.positions[column] for column in columns]
+        )]
+        return pd.DataFrame(selected, index=list(rows), columns=list(columns))
+
+
+class CorrelationCache:
+    """
+    Correlation results keyed by a fingerprint of the data and column set
+
+    Each column is fingerprinted by a hash of its values, so a cached result
+    is reused for any subset of its columns as long as their data has not
+    changed, and is recomputed as soon as it has.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        # (column, digest) pairs -> CorrelationResult, oldest first
+        self._entries = {}
+
+    @staticmethod
+    def column_digest(values):
+        """
+        Content hash of one column
+        """
+        values = np.ascontiguousarray(values)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(values.dtype).encode())
+        digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def fingerprint(self, data, columns):
+        """
+        Cache key: every column paired with the hash of its values
+        """
+        return tuple(
+            (column, self.column_digest(data[column].to_numpy())) for column in columns
+        )
+
+    def pearson(self, data, columns, mask=None):
+        """
+        Pairwise-complete Pearson result for the columns, computed on a miss
+
+        mask is the validity bitmap of the columns, if already at hand.
+        """
+        columns = list(columns)
+        key = self.fingerprint(data, columns)
+        wanted = set(key)
+        for entry_key, result in self._entries.items():
+            if wanted <= set(entry_key):
+                return result
+
+        result = CorrelationResult.from_pearson(
+            columns, *pairwise_pearson(data[columns].to_numpy(dtype=np.float64), mask)
+        )
+
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = result
+        return result
+
+    def clear(self):
+        """
+        Drop every cached result
+        """
+        self._entries.clear()
@@ -0,0 +1,214 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Bump when the on-disk layout changes so old caches get rebuilt
+CACHE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+class EarthquakeDataCache:
+    def __init__(self, source_path, cache_dir=None, verify_hash=False):
+        self.source_path = Path(source_path)
+        if cache_dir is None:
+            cache_dir = self.source_path.parent / f'.{self.source_path.stem}_cache'
+        self.cache_dir = Path(cache_dir)
+        # Hash the source on every load instead of trusting size + mtime
+        self.verify_hash = verify_hash
+
+    @staticmethod
+    def content_hash(path, block_size=1 << 20):
+        """
+        Hash the file contents in fixed-size blocks
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, with_hash=True):
+        """
+        Identify the current state of the source file
+        """
+        stat = self.source_path.stat()
+        fingerprint = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        if with_hash:
+            fingerprint['hash'] = self.content_hash(self.source_path)
+        return fingerprint
+
+    def read_manifest(self):
+        """
+        Load the manifest describing the cached columns
+        """
+        manifest_path = self.cache_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path) as handle:
+            manifest = json.load(handle)
+        if manifest.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def write_manifest(self, manifest):
+        """
+        Atomically replace the manifest
+        """
+        manifest_path = self.cache_dir / MANIFEST_NAME
+        temp_path = manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as handle:
+            json.dump(manifest, handle, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def validate(self):
+        """
+        Return a manifest that matches the source file, rebuilding if stale
+
+        Size and mtime are checked first; when the mtime moved but the size
+        did not, the content hash decides whether the cache is still usable.
+        """
+        manifest = self.read_manifest()
+        current = self.fingerprint(with_hash=False)
+
+        if manifest is not None:
+            cached = manifest['source']
+            if cached['size'] == current['size']:
+                if cached['mtime_ns'] == current['mtime_ns'] and not self.verify_hash:
+                    return manifest
+                current['hash'] = self.content_hash(self.source_path)
+                if cached['hash'] == current['hash']:
+                    # Touched but unchanged: keep the columns, record new mtime
+                    manifest['source'] = current
+                    self.write_manifest(manifest)
+                    return manifest
+
+        # Missing or stale: start a fresh cache
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+        self.cache_dir.mkdir(parents=True)
+        if 'hash' not in current:
+            current['hash'] = self.content_hash(self.source_path)
+        manifest = {
+            'version': CACHE_FORMAT_VERSION,
+            'source': current,
+            'n_rows': None,
+            'columns': {}
+        }
+        self.write_manifest(manifest)
+        return manifest
+
+    def _column_file(self, column, suffix='npy'):
+        # Column names are used verbatim; keep them filesystem-safe
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in column)
+        return self.cache_dir / f'{safe_name}.{suffix}'
+
+    def _save_array(self, path, array, allow_pickle=False):
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'wb') as handle:
+            np.save(handle, array, allow_pickle=allow_pickle)
+        os.replace(temp_path, path)
+
+    def write_columns(self, frame, manifest, dtypes=None):
+        """
+        Store the columns of a freshly parsed frame
+
+        `dtypes` are the dtypes the columns were parsed with; they are kept
+        with each entry so a changed request rebuilds the column.
+        """
+        dtypes = dtypes or {}
+        for column in frame.columns:
+            series = frame[column]
+            entry = {
+                'dtype': str(series.dtype),
+                'requested_dtype': dtypes.get(column)
+            }
+
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                path = self._column_file(column, 'codes.npy')
+                self._save_array(path, series.cat.codes.to_numpy())
+                entry['kind'] = 'category'
+                entry['categories'] = series.cat.categories.tolist()
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                path = self._column_file(column)
+                self._save_array(path, series.to_numpy())
+                entry['kind'] = 'numeric'
+            else:
+                # Free text cannot be memory-mapped; store it pickled
+                path = self._column_file(column)
+                self._save_array(path, series.to_numpy(dtype=object), allow_pickle=True)
+                entry['kind'] = 'object'
+
+            entry['file'] = path.name
+            manifest['columns'][column] = entry
+
+        manifest['n_rows'] = len(frame)
+        self.write_manifest(manifest)
+
+    def read_column(self, column, entry):
+        """
+        Load one cached column, memory-mapping numeric data
+        """
+        path = self.cache_dir / entry['file']
+        if entry['kind'] == 'category':
+            codes = np.load(path, mmap_mode='c')
+            return pd.Categorical.from_codes(codes, categories=entry['categories'])
+        if entry['kind'] == 'numeric':
+            # Copy-on-write mapping: in-place edits stay private to the frame,
+            # and the ndarray view keeps results from being memmaps
+            return np.load(path, mmap_mode='c').view(np.ndarray)
+        values = np.load(path, allow_pickle=True)
+        return pd.array(values, dtype=entry['dtype'])
+
+    @staticmethod
+    def is_current(entry, requested_dtype):
+        """
+        Whether a cached column was parsed with the dtype requested now
+        """
+        return entry is not None and entry.get('requested_dtype') == requested_dtype
+
+    def load(self, columns, parse, dtypes=None):
+        """
+        Return the requested columns, parsing and caching any that are missing
+
+        `parse(columns)` must return a DataFrame with those columns read from
+        the source file, using `dtypes` (column -> dtype) where given. Cached
+        columns parsed with a different dtype are parsed again.
+        """
+        dtypes = dtypes or {}
+        manifest = self.validate()
+        missing = [
+            column for column in columns
+            if not self.is_current(manifest['columns'].get(column), dtypes.get(column))
+        ]
+        if missing:
+            self.write_columns(parse(missing), manifest, dtypes)
+
+        data = {
+            column: self.read_column(column, manifest['columns'][column])
+            for column in columns
+        }
+        return pd.DataFrame(data, columns=list(columns), copy=False)
+
+    def iter_chunks(self, columns, parse, chunksize=100_000, dtypes=None):
+        """
+        Stream row slices of the cached columns without copying them
+        """
+        data = self.load(columns, parse, dtypes)
+        return (
+            data.iloc[start:start + chunksize]
+            for start in range(0, len(data), chunksize)
+        )
+
+    def clear(self):
+        """
+        Remove the cache directory
+        """
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
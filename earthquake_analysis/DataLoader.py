@@ -0,0 +1,186 @@
+import pandas as pd
+from pathlib import Path
+from earthquake_analysis.DataCache import EarthquakeDataCache
+
+# Default location of the earthquake catalog
+DEFAULT_DATA_PATH = Path(__file__).parent.parent / 'data' / 'earthquakes.csv'
+
+# Compact dtypes for every column the analyzers work with.
+# Count-like columns stay float32 so missing values remain representable,
+# epoch-millisecond timestamps need the full int64 range.
+CATALOG_DTYPES = {
+    'magnitude': 'float32',
+    'time': 'int64',
+    'updated': 'int64',
+    'felt': 'float32',
+    'cdi': 'float32',
+    'mmi': 'float32',
+    'tsunami': 'int32',
+    'sig': 'float32',
+    'nst': 'float32',
+    'dmin': 'float32',
+    'rms': 'float32',
+    'gap': 'float32',
+    'depth': 'float32',
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'distanceKM': 'float32',
+    'timezone': 'float32',
+    'type': 'category',
+    'alert': 'category',
+    'status': 'category',
+    'net': 'category',
+    'magType': 'category',
+    'geometryType': 'category',
+    'continent': 'category',
+    'country': 'category',
+    'subnational': 'category'
+}
+
+# Methods through which analyzers declare the columns they use
+COLUMN_DECLARATIONS = (
+    'prepare_columns',
+    'prepare_correlation_columns',
+    'prepare_feature_columns',
+    'prepare_analysis_columns'
+)
+
+
+class EarthquakeDataLoader:
+    def __init__(self, data_path=DEFAULT_DATA_PATH, use_cache=True, cache_dir=None):
+        self.data_path = Path(data_path)
+        self._available_columns = None
+        # Columnar cache next to the CSV, rebuilt when the file changes
+        self.cache = EarthquakeDataCache(self.data_path, cache_dir) if use_cache else None
+
+    def available_columns(self):
+        """
+        Read the column names from the catalog header
+        """
+        if self._available_columns is None:
+            header = pd.read_csv(self.data_path, nrows=0)
+            self._available_columns = list(header.columns)
+        return self._available_columns
+
+    @staticmethod
+    def flatten_columns(declaration):
+        """
+        Flatten a (nested) dict/list column declaration into a list
+        """
+        if isinstance(declaration, dict):
+            declaration = declaration.values()
+        elif isinstance(declaration, str):
+            return [declaration]
+
+        columns = []
+        for item in declaration:
+            columns.extend(EarthquakeDataLoader.flatten_columns(item))
+        return columns
+
+    def required_columns(self, analyzers):
+        """
+        Collect the columns declared by the given analyzer classes or instances
+        """
+        columns = []
+        for analyzer in analyzers:
+            # Declarations do not depend on the data, so classes can be
+            # instantiated without any
+            if isinstance(analyzer, type):
+                analyzer = analyzer(None)
+
+            declared = [
+                getattr(analyzer, name)() for name in COLUMN_DECLARATIONS
+                if hasattr(analyzer, name)
+            ]
+            if not declared:
+                raise ValueError(
+                    f"{type(analyzer).__name__} does not declare its columns"
+                )
+            for declaration in declared:
+                columns.extend(self.flatten_columns(declaration))
+
+        # Keep the first occurrence of each column in catalog order
+        available = self.available_columns()
+        missing = sorted(set(columns) - set(available))
+        if missing:
+            raise ValueError(f"The data is missing required columns: {missing}")
+        wanted = set(columns)
+        return [column for column in available if column in wanted]
+
+    def column_dtypes(self, columns):
+        """
+        Compact dtypes for the given columns; unknown columns are inferred
+        """
+        return {
+            column: CATALOG_DTYPES[column]
+            for column in columns if column in CATALOG_DTYPES
+        }
+
+    def read_options(self, analyzers=None, columns=None, full_schema=False):
+        """
+        Build the pd.read_csv keyword arguments for a projected load
+        """
+        if full_schema or (analyzers is None and columns is None):
+            usecols = self.available_columns()
+        else:
+            usecols = list(columns or [])
+            if analyzers is not None:
+                usecols += self.required_columns(analyzers)
+            wanted = set(usecols)
+            usecols = [c for c in self.available_columns() if c in wanted]
+
+        return {
+            'usecols': usecols,
+            'dtype': self.column_dtypes(usecols)
+        }
+
+    def parse_columns(self, columns):
+        """
+        Parse the given columns straight from the CSV
+        """
+        return pd.read_csv(
+            self.data_path,
+            usecols=columns,
+            dtype=self.column_dtypes(columns)
+        )
+
+    def load(self, analyzers=None, columns=None, full_schema=False):
+        """
+        Load the catalog, parsing only the columns the analyzers declare
+
+        Without analyzers or columns (or with full_schema=True) every column
+        is loaded, still using the compact dtypes where they are known.
+        Columns are served from the on-disk cache when it is enabled.
+        """
+        options = self.read_options(analyzers, columns, full_schema)
+        if self.cache is not None:
+            try:
+                return self.cache.load(
+                    options['usecols'], self.parse_columns, options['dtype']
+                )
+            except OSError as e:
+                # Read-only data directory and similar: parse directly
+                print(f"Warning: catalog cache unavailable ({e}), reading CSV")
+        return self.parse_columns(options['usecols'])
+
+    def iter_chunks(self, analyzers=None, columns=None, full_schema=False,
+                    chunksize=100_000):
+        """
+        Stream the projected catalog as DataFrame chunks
+        """
+        options = self.read_options(analyzers, columns, full_schema)
+        if self.cache is not None:
+            try:
+                return self.cache.iter_chunks(
+                    options['usecols'], self.parse_columns, chunksize, options['dtype']
+                )
+            except OSError as e:
+                print(f"Warning: catalog cache unavailable ({e}), reading CSV")
+        return pd.read_csv(self.data_path, chunksize=chunksize, **options)
+
+
+def load_catalog(analyzers=None, data_path=DEFAULT_DATA_PATH, **kwargs):
+    """
+    Convenience wrapper around EarthquakeDataLoader.load
+    """
+    return EarthquakeDataLoader(data_path).load(analyzers, **kwargs)
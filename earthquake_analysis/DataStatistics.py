@@ -0,0 +1,441 @@
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import seaborn as sns
+from earthquake_analysis.DataLoader import load_catalog
+from earthquake_analysis.StreamingMoments import MomentAccumulator
+from earthquake_analysis.Sketches import KLLSketch, FrequentItemsSketch
+from earthquake_analysis.ValidityMask import ValidityMaskIndex
+from earthquake_analysis.BinnedPlotting import plot_binned_distribution, plot_sketch_distribution
+
+# Percentiles reported in the basic statistics table
+PERCENTILES = (0.25, 0.5, 0.75)
+
+class EarthquakeDataStatistics:
+    def __init__(self, data, quantile_epsilon=None, mode_strategy=None, mode_capacity=64):
+        self.data = data
+        # Rank error bound of the KLL sketches; None keeps exact percentiles
+        self.quantile_epsilon = quantile_epsilon
+        self.sketches = None
+        # 'exact' or 'sketch', for all columns or as a {column: strategy} dict
+        self.mode_strategy = mode_strategy
+        self.mode_capacity = mode_capacity
+        self.mode_sketches = None
+        # Column profile shared by the report methods; built by one fused
+        # pass over the data, or by accumulate_chunks when data is None
+        self.moments = None
+        self.percentiles = None
+        self.modes = None
+        self.chunk_nulls = None
+        self.chunk_dtypes = None
+        
+    @classmethod
+    def from_chunks(cls, chunks, quantile_epsilon=None, mode_strategy=None, mode_capacity=64):
+        """
+        Create an analyzer that summarizes an iterator of DataFrame chunks
+        """
+        analyzer = cls(
+            None,
+            quantile_epsilon=quantile_epsilon,
+            mode_strategy=mode_strategy,
+            mode_capacity=mode_capacity
+        )
+        analyzer.accumulate_chunks(chunks)
+        return analyzer
+
+    def accumulate_chunks(self, chunks):
+        """
+        Accumulate mergeable moments over chunks in constant memory
+        """
+        columns = self.prepare_columns()['numerical']
+        if self.moments is None:
+            self.moments = MomentAccumulator(columns)
+            self.chunk_nulls = pd.Series(dtype=np.int64)
+            self.chunk_dtypes = pd.Series(dtype=object)
+            if self.quantile_epsilon is not None:
+                self.sketches = {
+                    column: KLLSketch(self.quantile_epsilon) for column in columns
+                }
+            self.mode_sketches = {
+                column: FrequentItemsSketch(self.mode_capacity)
+                for column in self.sketched_mode_columns(columns)
+            }
+        
+        for chunk in chunks:
+            self.moments.update(chunk)
+            self.chunk_nulls = self.chunk_nulls.add(chunk.isnull().sum(), fill_value=0)
+            self.chunk_dtypes = self.chunk_dtypes.combine_first(chunk.dtypes)
+            if self.sketches is not None:
+                for column, sketch in self.sketches.items():
+                    sketch.update(chunk[column].to_numpy(dtype=np.float64))
+            for column, sketch in self.mode_sketches.items():
+                sketch.update(chunk[column].to_numpy(dtype=np.float64))
+        
+        if self.sketches is not None:
+            self.percentiles = self.sketch_percentiles(columns)
+        # Exact modes cannot be streamed; only sketched columns get one
+        self.modes = np.full(len(columns), np.nan)
+        self.apply_mode_sketches(columns)
+        
+        return self.moments
+
+    def sketched_mode_columns(self, columns):
+        """
+        Columns whose mode comes from a heavy-hitter sketch
+        """
+        strategy = self.mode_strategy
+        if isinstance(strategy, dict):
+            return [column for column in columns if strategy.get(column) == 'sketch']
+        if strategy == 'sketch':
+            return list(columns)
+        if strategy in (None, 'exact'):
+            return []
+        raise ValueError("mode_strategy must be 'exact', 'sketch' or a dict of those")
+
+    def apply_mode_sketches(self, columns):
+        """
+        Replace the mode of sketched columns with the sketch's top value
+        """
+        for column, sketch in self.mode_sketches.items():
+            self.modes[columns.index(column)] = sketch.mode()
+
+    def frequent_values(self, column, k=10):
+        """
+        Top-k most frequent values of a column from a heavy-hitter sketch
+        """
+        if self.mode_sketches is not None and column in self.mode_sketches:
+            sketch = self.mode_sketches[column]
+        elif self.data is None:
+            raise ValueError(f"No mode sketch was accumulated for '{column}'")
+        else:
+            sketch = FrequentItemsSketch(max(self.mode_capacity, k))
+            sketch.update(self.data[column].to_numpy(dtype=np.float64))
+        
+        values, counts = sketch.top_k(k)
+        return pd.DataFrame({
+            'value': values,
+            'estimated_count': counts,
+            # True count lies in [estimated_count, estimated_count + max_error]
+            'max_error': sketch.error_bound
+        })
+
+    def sketch_percentiles(self, columns):
+        """
+        Approximate percentiles from the per-column quantile sketches
+        """
+        estimates = np.array([
+            self.sketches[column].quantile(PERCENTILES) for column in columns
+        ])
+        return {q: estimates[:, i] for i, q in enumerate(PERCENTILES)}
+
+    def column_profile(self):
+        """
+        Compute moments, extremes, null counts, percentiles and modes of all
+        numerical columns in one fused pass over a contiguous block
+        """
+        if self.moments is None:
+            columns = self.prepare_columns()['numerical']
+            block = np.asfortranarray(self.data[columns].to_numpy(dtype=np.float64))
+            self.moments = MomentAccumulator.from_values(columns, block)
+            self.mode_sketches = {
+                column: FrequentItemsSketch(self.mode_capacity).update(
+                    block[:, columns.index(column)]
+                )
+                for column in self.sketched_mode_columns(columns)
+            }
+            
+            if self.quantile_epsilon is not None:
+                # Bounded-memory sketches instead of a full sort
+                self.sketches = {
+                    column: KLLSketch(self.quantile_epsilon).update(block[:, j])
+                    for j, column in enumerate(columns)
+                }
+                self.percentiles = self.sketch_percentiles(columns)
+                exact_columns = [c for c in columns if c not in self.mode_sketches]
+                self.modes = np.full(len(columns), np.nan)
+                if exact_columns:
+                    exact_modes = self.data[exact_columns].mode().iloc[0]
+                    for column in exact_columns:
+                        self.modes[columns.index(column)] = exact_modes[column]
+            else:
+                # A single column-wise sort serves every percentile and the mode
+                ordered = np.sort(block, axis=0)
+                counts = self.moments.count.astype(np.int64)
+                self.percentiles = {
+                    q: self.sorted_quantile(ordered, counts, q)
+                    for q in PERCENTILES
+                }
+                self.modes = self.sorted_modes(ordered, counts)
+            self.apply_mode_sketches(columns)
+        
+        return self.moments
+
+    @staticmethod
+    def sorted_quantile(ordered, counts, q):
+        """
+        Linearly interpolated quantile of column-sorted data (NaNs last)
+        """
+        position = q * np.maximum(counts - 1, 0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, np.maximum(counts - 1, 0))
+        columns = np.arange(ordered.shape[1])
+        low_values = ordered[lower, columns]
+        high_values = ordered[upper, columns]
+        quantile = low_values + (high_values - low_values) * (position - lower)
+        return np.where(counts > 0, quantile, np.nan)
+
+    @staticmethod
+    def sorted_modes(ordered, counts):
+        """
+        Most frequent (smallest on ties) value of each column-sorted column
+        """
+        modes = np.full(ordered.shape[1], np.nan)
+        for j, n in enumerate(counts):
+            if n == 0:
+                continue
+            values = ordered[:n, j]
+            # Run starts in the sorted column give each value's frequency
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+            run_lengths = np.diff(np.r_[starts, n])
+            modes[j] = values[starts[np.argmax(run_lengths)]]
+        return modes
+
+    def moment_statistics(self, columns):
+        """
+        Describe-style statistics from the column profile
+        """
+        moments = self.moments
+        index = [moments.columns.index(column) for column in columns]
+        
+        # Percentiles and modes are unavailable when streaming
+        def profile_row(values):
+            return np.nan if values is None else values[index]
+        percentiles = self.percentiles or {}
+        
+        basic_stats = pd.DataFrame(
+            {
+                'count': moments.count[index],
+                'mean': moments.mean[index],
+                'std': moments.std()[index],
+                'min': moments.min[index],
+                '25%': profile_row(percentiles.get(0.25)),
+                '50%': profile_row(percentiles.get(0.5)),
+                '75%': profile_row(percentiles.get(0.75)),
+                'max': moments.max[index],
+                'variance': moments.variance()[index],
+                'mode': profile_row(self.modes),
+                'range': moments.max[index] - moments.min[index]
+            },
+            index=columns
+        ).T
+        
+        return basic_stats
+
+    def prepare_columns(self):
+        """
+        Define columns for the different statistical analyses
+        """
+        return {
+            'numerical': [
+                'magnitude',    # Earthquake magnitude
+                'depth',        # Depth of the earthquake
+                'latitude',     # Latitude coordinate
+                'longitude',    # Longitude coordinate
+                'felt',         # Number of felt reports
+                'cdi',          # Community Decimal Intensity
+                'mmi',          # Modified Mercalli Intensity
+                'sig',          # Significance of the event
+                'gap',          # Azimuthal gap
+                'rms',          # Root mean square travel time residual
+                'dmin',         # Minimum distance to stations
+                'distanceKM'    # Distance in kilometers
+            ],
+            'shape': [
+                'magnitude', 'depth', 'felt', 'cdi', 'mmi', 'sig', 
+                'gap', 'rms', 'dmin', 'distanceKM'
+            ],
+            'distribution': [
+                'magnitude', 'depth', 'felt', 'cdi', 'mmi', 'sig'
+            ]
+        }
+
+    def numerical_statistics(self):
+        """
+        Calculate basic statistical measures for numerical columns
+        """
+        # Relevant numerical columns for earthquake analysis
+        numerical_columns = self.prepare_columns()['numerical']
+        
+        # describe() plus variance, mode and range from the shared profile
+        self.column_profile()
+        return self.moment_statistics(numerical_columns)
+
+    def skewness_analysis(self):
+        """
+        Analyze skewness of numerical columns
+        """
+        numerical_columns = self.prepare_columns()['shape']
+        
+        moments = self.column_profile()
+        index = [moments.columns.index(column) for column in numerical_columns]
+        skewness = moments.skewness()[index]
+        
+        skewness_stats = pd.DataFrame(
+            {
+                'Skewness': skewness,
+                'Interpretation': [self.interpret_skewness(value) for value in skewness]
+            },
+            index=numerical_columns
+        )
+            
+        return skewness_stats
+
+    def kurtosis_analysis(self):
+        """
+        Analyze kurtosis of numerical columns
+        """
+        numerical_columns = self.prepare_columns()['shape']
+        
+        moments = self.column_profile()
+        index = [moments.columns.index(column) for column in numerical_columns]
+        kurtosis = moments.kurtosis()[index]
+        
+        kurtosis_stats = pd.DataFrame(
+            {
+                'Kurtosis': kurtosis,
+                'Interpretation': [self.interpret_kurtosis(value) for value in kurtosis]
+            },
+            index=numerical_columns
+        )
+            
+        return kurtosis_stats
+
+    def missing_value_analysis(self):
+        """
+        Analyze missing values in all columns
+        """
+        missing_stats = pd.DataFrame()
+        
+        # Calculate missing values
+        if self.data is None:
+            missing_count = self.chunk_nulls.astype(np.int64)
+            n_rows = self.moments.n_rows
+            dtypes = self.chunk_dtypes
+        else:
+            # Null counts come from the catalog's shared validity bitmap
+            missing_count = ValidityMaskIndex.for_frame(self.data).null_counts()
+            n_rows = len(self.data)
+            dtypes = self.data.dtypes
+        missing_percentage = (missing_count / n_rows) * 100
+        
+        missing_stats['Missing Count'] = missing_count
+        missing_stats['Missing Percentage'] = missing_percentage
+        missing_stats['Data Type'] = dtypes
+        
+        return missing_stats.sort_values('Missing Percentage', ascending=False)
+
+    def visualize_distributions(self, binned=False):
+        """
+        Visualize distributions of key numerical columns
+        
+        binned=True draws from pre-binned histograms and FFT KDEs, which
+        keeps rendering time independent of the number of events. In
+        streaming mode the histograms come from the quantile sketches.
+        """
+        numerical_columns = self.prepare_columns()['distribution']
+        if self.data is None and self.sketches is None:
+            raise ValueError(
+                "No rows are kept in streaming mode; accumulate with "
+                "quantile_epsilon set to plot from the quantile sketches"
+            )
+        
+        fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+        fig.suptitle('Distribution of Key Earthquake Metrics')
+        
+        for idx, column in enumerate(numerical_columns):
+            row = idx // 3
+            col = idx % 3
+            
+            # Histogram with KDE
+            if self.data is None:
+                plot_sketch_distribution(axes[row, col], self.sketches[column])
+                axes[row, col].set_xlabel(column)
+                axes[row, col].set_ylabel('Count')
+            elif binned:
+                plot_binned_distribution(axes[row, col], self.data[column].to_numpy())
+                axes[row, col].set_xlabel(column)
+                axes[row, col].set_ylabel('Count')
+            else:
+                sns.histplot(data=self.data, x=column, kde=True, ax=axes[row, col])
+            axes[row, col].set_title(f'{column} Distribution')
+            
+        plt.tight_layout()
+        plt.show()
+
+    @staticmethod
+    def interpret_skewness(skewness):
+        """
+        Interpret skewness values
+        """
+        if skewness < -1:
+            return 'Highly Negative Skewed'
+        elif skewness < -0.5:
+            return 'Moderately Negative Skewed'
+        elif skewness < 0.5:
+            return 'Approximately Symmetric'
+        elif skewness < 1:
+            return 'Moderately Positive Skewed'
+        else:
+            return 'Highly Positive Skewed'
+
+    @staticmethod
+    def interpret_kurtosis(kurtosis):
+        """
+        Interpret kurtosis values
+        """
+        if kurtosis < -1:
+            return 'Platykurtic (Light-tailed)'
+        elif kurtosis < 1:
+            return 'Mesokurtic (Normal-like)'
+        else:
+            return 'Leptokurtic (Heavy-tailed)'
+
+    def generate_summary_report(self):
+        """
+        Generate a comprehensive statistical summary report
+        """
+        report = {
+            'basic_statistics': self.numerical_statistics(),
+            'skewness_analysis': self.skewness_analysis(),
+            'kurtosis_analysis': self.kurtosis_analysis(),
+            'missing_value_analysis': self.missing_value_analysis()
+        }
+        
+        return report
+
+# Example usage:
+def main():
+    # Load your earthquake data
+    data = load_catalog([EarthquakeDataStatistics])
+    
+    # Initialize the statistics analyzer
+    analyzer = EarthquakeDataStatistics(data)
+    
+    # Generate comprehensive report
+    report = analyzer.generate_summary_report()
+    
+    # Print results
+    print("Basic Statistical Measures:")
+    print(report['basic_statistics'])
+    print("\nSkewness Analysis:")
+    print(report['skewness_analysis'])
+    print("\nKurtosis Analysis:")
+    print(report['kurtosis_analysis'])
+    print("\nMissing Value Analysis:")
+    print(report['missing_value_analysis'])
+    
+    # Visualize distributions
+    analyzer.visualize_distributions()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
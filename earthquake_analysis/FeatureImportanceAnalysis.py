@@ -5,6 +5,7 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import matplotlib.pyplot as plt
 import seaborn as sns
+from earthquake_analysis.DataLoader import load_catalog
 
 class EarthquakeFeatureImportance:
     def __init__(self, data):
@@ -199,7 +200,7 @@ class EarthquakeFeatureImportance:
 
 def main():
     # Load earthquake data
-    data = pd.read_csv('earthquakes.csv')
+    data = load_catalog([EarthquakeFeatureImportance])
     
     # Initialize analyzer
     analyzer = EarthquakeFeatureImportance(data)
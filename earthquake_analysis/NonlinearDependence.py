@@ -0,0 +1,173 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+
+
+def dominance_sums(ranks, weights):
+    """
+    For every position j, the sum of weights[i] over earlier positions
+    i < j with ranks[i] < ranks[j]
+
+    Works bit by bit from the most significant bit of the (non-negative
+    integer) ranks: a pair is counted at the first bit where its ranks
+    differ, within the group of positions sharing all higher bits. Every
+    level is a stable partition plus segmented cumulative sums, so the
+    whole count is O(n log n) array operations.
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    weights = np.asarray(weights)
+    squeeze = weights.ndim == 1
+    # One row per weight, so every per-level operation runs over contiguous rows
+    current = np.array(weights[None, :] if squeeze else weights.T)
+    n = ranks.size
+    result = np.zeros_like(current)
+    if n < 2:
+        return result[0] if squeeze else result.T
+
+    slots = np.arange(n)
+    positions = slots.copy()
+    values = ranks.copy()
+    starts = np.zeros(n, dtype=bool)
+    starts[0] = True
+
+    for bit_index in range(int(ranks.max()).bit_length() - 1, -1, -1):
+        ones = ((values >> bit_index) & 1).astype(bool)
+        zero = ~ones
+        group_starts = np.flatnonzero(starts)
+        group = np.cumsum(starts) - 1
+        first = group_starts[group]
+
+        # Weight of the zero-bit (smaller) positions before each slot in its group
+        zero_weights = current * zero
+        before = np.cumsum(zero_weights, axis=1)
+        before -= zero_weights
+        before -= before[:, first]
+        result[:, ones] += before[:, ones]
+
+        # Stable partition of every group: zero bits first. Values, weights
+        # and partial results move along, so no level gathers by position.
+        zeros_before = np.cumsum(zero) - zero
+        zeros_before -= zeros_before[first]
+        zeros_in_group = np.add.reduceat(zero, group_starts)
+        target = np.where(
+            ones,
+            slots + zeros_in_group[group] - zeros_before,
+            first + zeros_before
+        )
+        values[target] = values.copy()
+        positions[target] = positions.copy()
+        current[:, target] = current.copy()
+        result[:, target] = result.copy()
+
+        group_size = np.diff(np.append(group_starts, n))
+        split = (zeros_in_group > 0) & (zeros_in_group < group_size)
+        starts[:] = False
+        starts[group_starts] = True
+        starts[(group_starts + zeros_in_group)[split]] = True
+
+    sums = np.empty_like(result)
+    sums[:, positions] = result
+    return sums[0] if squeeze else sums.T
+
+
+def distance_row_sums(values):
+    """
+    sum_j |x_i - x_j| for every i, from one sort and prefix sums
+    """
+    order = np.argsort(values, kind='stable')
+    ordered = values[order]
+    n = ordered.size
+    before = np.cumsum(ordered) - ordered
+    k = np.arange(n)
+    sums = np.empty(n)
+    sums[order] = ordered * k - before + (ordered.sum() - before - ordered) - ordered * (n - k - 1)
+    return sums
+
+
+def distance_products(x, y):
+    """
+    sum_{i,j} |x_i - x_j| |y_i - y_j| in O(n log n), after Huo & Szekely
+    (2016): along increasing x, only pairs whose y also increases need the
+    dominance sums, the rest follows from plain sums
+    """
+    n = x.size
+    order = np.argsort(x, kind='stable')
+    xs, ys = x[order], y[order]
+
+    y_ranks = np.unique(ys, return_inverse=True)[1].ravel()
+    dominated = dominance_sums(y_ranks, np.column_stack([np.ones(n), ys, xs, xs * ys]))
+    count, sum_y, sum_x, sum_xy = dominated.T
+    increasing = (xs * ys * count - xs * sum_y - ys * sum_x + sum_xy).sum()
+    all_pairs = n * (xs * ys).sum() - xs.sum() * ys.sum()
+    return 2 * (2 * increasing - all_pairs)
+
+
+def distance_covariance_sq(products, row_sums_x, row_sums_y):
+    """
+    Squared sample distance covariance (V-statistic) from the double sum
+    of distance products and the distance row sums of both samples
+    """
+    n = row_sums_x.size
+    return (
+        products / n ** 2
+        - 2 * (row_sums_x * row_sums_y).sum() / n ** 3
+        + row_sums_x.sum() * row_sums_y.sum() / n ** 4
+    )
+
+
+def distance_correlation(x, y):
+    """
+    Sample distance correlation of two 1-D samples in O(n log n)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n < 2:
+        return np.nan
+    # Distance covariance is translation invariant; centering helps precision
+    x = x - x.mean()
+    y = y - y.mean()
+    a, b = distance_row_sums(x), distance_row_sums(y)
+    # sum_{i,j} (x_i - x_j)^2 needs no sorting
+    variance_x = distance_covariance_sq(2 * n * (x * x).sum() - 2 * x.sum() ** 2, a, a)
+    variance_y = distance_covariance_sq(2 * n * (y * y).sum() - 2 * y.sum() ** 2, b, b)
+    if variance_x <= 0 or variance_y <= 0:
+        return np.nan
+    dcor_sq = distance_covariance_sq(distance_products(x, y), a, b) / np.sqrt(variance_x * variance_y)
+    return float(np.sqrt(np.clip(dcor_sq, 0.0, 1.0)))
+
+
+def dependence_measures(x, y):
+    """
+    Kendall tau-b (scipy.stats.kendalltau), its p-value and distance
+    correlation over the rows where both samples are present
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if x.size < 2:
+        return np.nan, np.nan, np.nan, int(x.size)
+    tau, p_value = stats.kendalltau(x, y)
+    return float(tau), float(p_value), distance_correlation(x, y), int(x.size)
+
+
+def screen_dependence(target, predictors, n_workers=None):
+    """
+    Kendall tau-b and distance correlation of a target against every
+    predictor column, one pair per task in a process pool if n_workers > 1
+    """
+    target = np.asarray(target, dtype=np.float64)
+    columns = [np.asarray(column, dtype=np.float64) for column in predictors]
+    if n_workers is None or n_workers <= 1:
+        results = [dependence_measures(target, column) for column in columns]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(
+                dependence_measures, [target] * len(columns), columns
+            ))
+    return pd.DataFrame(
+        results,
+        columns=['kendall_tau', 'kendall_p_value', 'distance_correlation', 'sample_size']
+    )
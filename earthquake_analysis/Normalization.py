@@ -5,11 +5,28 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import json
 from scipy import stats  # Added for QQ plots
+from earthquake_analysis.DataLoader import load_catalog
+from earthquake_analysis.ValidityMask import ValidityMaskIndex
+from earthquake_analysis.BinnedPlotting import plot_binned_distribution, qq_quantiles, plot_qq
+from earthquake_analysis.ScalerStore import ScalerParameters, ScalerStore
+from earthquake_analysis.StreamingMoments import MomentAccumulator
+from earthquake_analysis.NormalizedMatrix import NormalizedMatrix
+
+# Fitting method of each scaling family
+SCALING_METHODS = {
+    'standard_scaling': 'standard',
+    'minmax_scaling': 'minmax'
+}
 
 class EarthquakeNormalization:
-    def __init__(self, data):
+    def __init__(self, data, scaler_store=None):
         self.data = data
         self.normalized_data = {}
+        # Fitted affine parameters per scaling family, see transform
+        self.scaler_parameters = {}
+        self.scaler_store = scaler_store or ScalerStore()
+        # Row-aligned matrix of all normalized columns, see build_normalized_matrix
+        self.normalized_matrix = None
         
     def prepare_columns(self):
         """
@@ -38,28 +55,37 @@ class EarthquakeNormalization:
         """
         Apply StandardScaler to appropriate columns
         """
-        scaler = StandardScaler()
         columns = self.prepare_columns()['standard_scaling']
+        validity = ValidityMaskIndex.for_frame(self.data)
+        
+        # One fit for the whole family; missing values are ignored
+        values = self.data[columns].to_numpy(dtype=np.float64)
+        parameters = ScalerParameters.from_standard_scaler(
+            'standard_scaling', columns, StandardScaler().fit(values), len(self.data)
+        )
+        self.scaler_parameters['standard_scaling'] = parameters
+        scaled_matrix = parameters.transform(values)
         
         scaled_data = {}
         original_stats = {}
         scaled_stats = {}
         
-        for column in columns:
+        for i, column in enumerate(columns):
             # Handle missing values
-            data_clean = self.data[column].dropna()
+            mask = validity.column_mask(column)
+            data_clean = values[mask, i]
             
             # Original statistics
             original_stats[column] = {
                 'mean': float(data_clean.mean()),
-                'std': float(data_clean.std()),
+                'std': float(data_clean.std(ddof=1)),
                 'min': float(data_clean.min()),
                 'max': float(data_clean.max())
             }
             
-            # Apply scaling
-            scaled_values = scaler.fit_transform(data_clean.values.reshape(-1, 1))
-            scaled_data[column] = scaled_values.flatten()
+            # Scaled values of the same rows
+            scaled_values = scaled_matrix[mask, i]
+            scaled_data[column] = scaled_values
             
             # Scaled statistics
             scaled_stats[column] = {
@@ -76,16 +102,25 @@ class EarthquakeNormalization:
         """
         Apply MinMaxScaler to appropriate columns
         """
-        scaler = MinMaxScaler()
         columns = self.prepare_columns()['minmax_scaling']
+        validity = ValidityMaskIndex.for_frame(self.data)
+        
+        # One fit for the whole family; missing values are ignored
+        values = self.data[columns].to_numpy(dtype=np.float64)
+        parameters = ScalerParameters.from_minmax_scaler(
+            'minmax_scaling', columns, MinMaxScaler().fit(values), len(self.data)
+        )
+        self.scaler_parameters['minmax_scaling'] = parameters
+        scaled_matrix = parameters.transform(values)
         
         scaled_data = {}
         original_stats = {}
         scaled_stats = {}
         
-        for column in columns:
+        for i, column in enumerate(columns):
             # Handle missing values
-            data_clean = self.data[column].dropna()
+            mask = validity.column_mask(column)
+            data_clean = values[mask, i]
             
             # Original statistics
             original_stats[column] = {
@@ -94,9 +129,9 @@ class EarthquakeNormalization:
                 'range': float(data_clean.max() - data_clean.min())
             }
             
-            # Apply scaling
-            scaled_values = scaler.fit_transform(data_clean.values.reshape(-1, 1))
-            scaled_data[column] = scaled_values.flatten()
+            # Scaled values of the same rows
+            scaled_values = scaled_matrix[mask, i]
+            scaled_data[column] = scaled_values
             
             # Scaled statistics
             scaled_stats[column] = {
@@ -108,20 +143,139 @@ class EarthquakeNormalization:
         self.normalized_data['minmax_scaled'] = scaled_data
         return original_stats, scaled_stats
 
-    def visualize_distributions(self, column, original_data, normalized_data, scaling_type):
+    def build_normalized_matrix(self, dtype=np.float32, order='C'):
+        """
+        All normalized columns as one contiguous matrix aligned with the data
+        
+        Unlike normalized_data, rows are not dropped per column: missing
+        values stay NaN and are flagged in the matrix mask. Families that
+        have not been fitted yet are fitted first.
+        """
+        if 'standard_scaling' not in self.scaler_parameters:
+            self.apply_standard_scaling()
+        if 'minmax_scaling' not in self.scaler_parameters:
+            self.apply_minmax_scaling()
+        
+        parameters = [self.scaler_parameters[family] for family in self.prepare_columns()]
+        self.normalized_matrix = NormalizedMatrix.from_frame(self.data, parameters, dtype, order)
+        return self.normalized_matrix
+
+    def fit_chunks(self, chunks):
+        """
+        Fit every scaling family from an iterator of DataFrame chunks
+        
+        Mean, std, min and max come from mergeable moment accumulators, so
+        only one chunk is in memory at a time.
+        """
+        families = self.prepare_columns()
+        accumulators = {
+            family: MomentAccumulator(columns) for family, columns in families.items()
+        }
+        for chunk in chunks:
+            for accumulator in accumulators.values():
+                accumulator.update(chunk)
+        
+        for family, accumulator in accumulators.items():
+            self.scaler_parameters[family] = ScalerParameters.from_moments(
+                family, accumulator, SCALING_METHODS[family]
+            )
+        return self.scaler_parameters
+
+    def transform_chunks(self, chunks, output_path, n_rows, dtype=np.float32):
+        """
+        Stream normalized chunks into a memory-mapped .npy matrix
+        
+        The matrix has n_rows rows (in chunk order) and one column per
+        fitted column, family by family; missing values stay NaN.
+        """
+        columns = [
+            column for parameters in self.scaler_parameters.values()
+            for column in parameters.columns
+        ]
+        output = np.lib.format.open_memmap(
+            output_path, mode='w+', dtype=dtype, shape=(n_rows, len(columns))
+        )
+        
+        start = 0
+        for chunk in chunks:
+            stop = start + len(chunk)
+            if stop > n_rows:
+                raise ValueError(f"Chunks hold more than the expected {n_rows} rows")
+            output[start:stop] = self.transform(chunk).to_numpy()
+            start = stop
+        if start != n_rows:
+            raise ValueError(f"Chunks held {start} rows, expected {n_rows}")
+        
+        output.flush()
+        return output, columns
+
+    def normalize_chunks(self, chunk_source, output_path, dtype=np.float32):
+        """
+        Out-of-core normalization: a fit pass and a transform pass
+        
+        chunk_source is called once per pass and must return a fresh
+        iterator of chunks, e.g.
+        lambda: EarthquakeDataLoader().iter_chunks([EarthquakeNormalization]).
+        """
+        self.fit_chunks(chunk_source())
+        n_rows = next(iter(self.scaler_parameters.values())).n_rows
+        return self.transform_chunks(chunk_source(), output_path, n_rows, dtype)
+
+    def save_scalers(self):
+        """
+        Persist the fitted parameters of every family as new versions
+        """
+        return {
+            family: self.scaler_store.save(parameters)
+            for family, parameters in self.scaler_parameters.items()
+        }
+
+    def load_scalers(self, families=None, version=None):
+        """
+        Load stored parameters (latest versions by default) for serving
+        """
+        families = list(self.prepare_columns()) if families is None else list(families)
+        for family in families:
+            self.scaler_parameters[family] = self.scaler_store.load(family, version)
+        return self.scaler_parameters
+
+    def transform(self, new_data, families=None):
+        """
+        Normalize new events with the fitted parameters, without refitting
+        
+        Parameters come from the last fit or load_scalers; every family is
+        one multiply-add over its columns. Missing values stay NaN and rows
+        stay aligned with new_data.
+        """
+        families = list(self.scaler_parameters) if families is None else list(families)
+        scaled = {}
+        for family in families:
+            parameters = self.scaler_parameters[family]
+            values = new_data[parameters.columns].to_numpy(dtype=np.float64)
+            scaled.update(zip(parameters.columns, parameters.transform(values).T))
+        return pd.DataFrame(scaled, index=new_data.index)
+
+    def visualize_distributions(self, column, original_data, normalized_data, scaling_type,
+                                binned=False):
         """
         Visualize distribution before and after normalization
         """
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
         
         # Original distribution
-        sns.histplot(original_data, ax=ax1, kde=True)
+        if binned:
+            plot_binned_distribution(ax1, original_data)
+        else:
+            sns.histplot(original_data, ax=ax1, kde=True)
         ax1.set_title(f'Original Distribution of {column}')
         ax1.set_xlabel('Value')
         ax1.set_ylabel('Frequency')
         
         # Normalized distribution
-        sns.histplot(normalized_data, ax=ax2, kde=True)
+        if binned:
+            plot_binned_distribution(ax2, normalized_data)
+        else:
+            sns.histplot(normalized_data, ax=ax2, kde=True)
         ax2.set_title(f'Normalized Distribution ({scaling_type})')
         ax2.set_xlabel('Normalized Value')
         ax2.set_ylabel('Frequency')
@@ -129,30 +283,53 @@ class EarthquakeNormalization:
         plt.tight_layout()
         return fig
 
-    def visualize_qq_plots(self, column, original_data, normalized_data):
+    def visualize_qq_plots(self, column, original_data, normalized_data, binned=False,
+                           n_quantiles=200):
         """
         Create Q-Q plots for original and normalized data
+        
+        binned=True plots at most n_quantiles points from one partial sort
+        of the original values; the normalized quantiles are the fitted
+        affine map of the original ones, so they need no second sort.
         """
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
         
-        # Original Q-Q plot
-        stats.probplot(original_data, dist="norm", plot=ax1)
-        ax1.set_title(f'Q-Q Plot of Original {column}')
+        if binned:
+            theoretical, original_quantiles = qq_quantiles(original_data, n_quantiles)
+            scale, offset = self.column_scaling(column)
+            plot_qq(ax1, theoretical, original_quantiles)
+            plot_qq(ax2, theoretical, original_quantiles * scale + offset)
+        else:
+            # Original Q-Q plot
+            stats.probplot(original_data, dist="norm", plot=ax1)
+            
+            # Normalized Q-Q plot
+            stats.probplot(normalized_data, dist="norm", plot=ax2)
         
-        # Normalized Q-Q plot
-        stats.probplot(normalized_data, dist="norm", plot=ax2)
+        ax1.set_title(f'Q-Q Plot of Original {column}')
         ax2.set_title(f'Q-Q Plot of Normalized {column}')
         
         plt.tight_layout()
         return fig
 
-    def compare_distributions(self):
+    def column_scaling(self, column):
+        """
+        Fitted scale and offset of one column
+        """
+        for parameters in self.scaler_parameters.values():
+            if column in parameters.columns:
+                position = parameters.columns.index(column)
+                return parameters.scale[position], parameters.offset[position]
+        raise ValueError(f"No fitted scaling for '{column}'")
+
+    def compare_distributions(self, binned=False):
         """
         Compare distributions of all normalized columns
         """
+        validity = ValidityMaskIndex.for_frame(self.data)
         for scaling_type, columns in self.prepare_columns().items():
             for column in columns:
-                original_data = self.data[column].dropna()
+                original_data = validity.valid_values(self.data, column)
                 
                 if scaling_type == 'standard_scaling':
                     normalized_data = self.normalized_data['standard_scaled'][column]
@@ -161,12 +338,12 @@ class EarthquakeNormalization:
                 
                 # Distribution plots
                 fig_dist = self.visualize_distributions(
-                    column, original_data, normalized_data, scaling_type
+                    column, original_data, normalized_data, scaling_type, binned=binned
                 )
                 
                 # Q-Q plots
                 fig_qq = self.visualize_qq_plots(
-                    column, original_data, normalized_data
+                    column, original_data, normalized_data, binned=binned
                 )
                 
                 plt.show()
@@ -191,9 +368,9 @@ class EarthquakeNormalization:
         
         return report
 
-def main():
+def main(save_scalers=False):
     # Load earthquake data
-    data = pd.read_csv('earthquakes.csv')
+    data = load_catalog([EarthquakeNormalization])
     
     # Initialize normalizer
     normalizer = EarthquakeNormalization(data)
@@ -203,6 +380,12 @@ def main():
     print("Normalization Summary Report:")
     print(json.dumps(report, indent=2))
     
+    # Keep the fitted parameters for transform-only serving, on request only
+    # since every save writes a new version
+    if save_scalers:
+        versions = normalizer.save_scalers()
+        print(f"Saved scaler parameters: {versions}")
+    
     # Visualize distributions
     normalizer.compare_distributions()
 
@@ -0,0 +1,67 @@
+import pandas as pd
+import numpy as np
+
+
+class NormalizedMatrix:
+    """
+    Normalized features as one contiguous, row-aligned 2-D array
+
+    Row i is row i of the source frame; missing values stay NaN and are
+    also flagged in `mask` (True where a value is present). Columns are
+    looked up through `columns`, and column or row selections of the
+    values are views, not copies.
+    """
+
+    def __init__(self, values, mask, columns, index):
+        self.values = values
+        self.mask = mask
+        self.columns = pd.Index(columns)
+        self.index = index
+
+    @classmethod
+    def from_frame(cls, data, parameters, dtype=np.float32, order='C'):
+        """
+        Scale the frame's columns family by family into one preallocated array
+
+        parameters is an iterable of ScalerParameters; columns are laid out
+        in their order.
+        """
+        if order not in ('C', 'F'):
+            raise ValueError("order must be 'C' or 'F'")
+        columns = [column for family in parameters for column in family.columns]
+        values = np.empty((len(data), len(columns)), dtype=dtype, order=order)
+
+        position = 0
+        for family in parameters:
+            for scale, offset, column in zip(family.scale, family.offset, family.columns):
+                # One float64 column at a time, stored at the target precision
+                values[:, position] = data[column].to_numpy(dtype=np.float64) * scale + offset
+                position += 1
+
+        mask = ~np.isnan(values)
+        return cls(values, mask, columns, data.index)
+
+    def column(self, name):
+        """
+        Values of one column (a view)
+        """
+        return self.values[:, self.columns.get_loc(name)]
+
+    def complete_rows(self, columns=None):
+        """
+        Rows where every given column (all by default) is present
+        """
+        if columns is None:
+            return self.mask.all(axis=1)
+        positions = self.columns.get_indexer(columns)
+        return self.mask[:, positions].all(axis=1)
+
+    def to_frame(self):
+        """
+        DataFrame over the same buffer, aligned with the source frame
+        """
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
@@ -2,11 +2,54 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy import stats
+from earthquake_analysis.DataLoader import load_catalog
+from earthquake_analysis.ValidityMask import ValidityMaskIndex
+from earthquake_analysis.CorrelationEngine import (
+    CorrelationCache, CorrelationResult, pearson_from_sums, strong_correlations
+)
+from earthquake_analysis.StreamingMoments import CoMomentAccumulator
+from earthquake_analysis.Resampling import bootstrap_correlations
 
 class EarthquakeCorrelationAnalysis:
-    def __init__(self, data):
+    def __init__(self, data, correlation_cache=None):
         self.data = data
+        # Full correlation results shared by every step of the report
+        self.correlation_cache = correlation_cache or CorrelationCache()
+        # Streaming state when data is None, see accumulate_chunks
+        self.comoments = None
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Create an analyzer whose Pearson results come from streamed chunks
+        """
+        analyzer = cls(None)
+        analyzer.accumulate_chunks(chunks)
+        return analyzer
+
+    def accumulate_chunks(self, chunks):
+        """
+        Accumulate mergeable co-moments over chunks in constant memory
+        """
+        if self.comoments is None:
+            columns = sum(self.prepare_correlation_columns().values(), [])
+            self.comoments = CoMomentAccumulator(columns)
+        for chunk in chunks:
+            self.comoments.update(chunk)
+        return self.comoments
+
+    def revise(self, added=None, removed=None):
+        """
+        Update the streamed co-moments for new and retracted events
+        
+        Costs O(rows changed); revised events are passed as the removed old
+        row plus the added new one.
+        """
+        if removed is not None:
+            self.comoments.remove(removed)
+        if added is not None:
+            self.comoments.update(added)
+        return self.comoments
         
     def prepare_correlation_columns(self):
         """
@@ -33,38 +76,54 @@ class EarthquakeCorrelationAnalysis:
             ]
         }
 
+    def correlation_result(self, columns=None):
+        """
+        Cached pairwise-complete Pearson result for all relevant columns
+        """
+        if columns is None:
+            columns = sum(self.prepare_correlation_columns().values(), [])
+        if self.data is None:
+            # Streaming mode: rebuilt from the co-moments, no rows needed
+            result = CorrelationResult.from_pearson(
+                self.comoments.columns, *pearson_from_sums(*self.comoments.pairwise_sums())
+            )
+            if not result.covers(columns):
+                raise ValueError("Columns were not accumulated in streaming mode")
+            return result
+        validity = ValidityMaskIndex.for_frame(self.data)
+        positions = [validity.positions[column] for column in columns]
+        return self.correlation_cache.pearson(
+            self.data, columns, validity.mask[:, positions]
+        )
+
     def calculate_correlation_matrix(self):
         """
         Calculate correlation matrix for all relevant columns
         """
         columns = sum(self.prepare_correlation_columns().values(), [])
-        correlation_matrix = self.data[columns].corr(method='pearson')
+        correlation_matrix = self.correlation_result(columns).block(columns)
         return correlation_matrix
 
+    def pearson_matrix(self, columns=None):
+        """
+        Pairwise-complete Pearson r, rows per pair and p-values as arrays
+        """
+        result = self.correlation_result(columns)
+        columns = result.columns if columns is None else columns
+        index = np.ix_(
+            [result.positions[column] for column in columns],
+            [result.positions[column] for column in columns]
+        )
+        return result.r[index], result.n[index], result.p[index]
+
     def calculate_detailed_correlations(self):
         """
         Calculate detailed correlation statistics including p-values
         """
         columns = sum(self.prepare_correlation_columns().values(), [])
-        n = len(columns)
-        correlations = pd.DataFrame(index=columns, columns=columns)
-        p_values = pd.DataFrame(index=columns, columns=columns)
-        
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    valid_data = self.data[[columns[i], columns[j]]].dropna()
-                    if not valid_data.empty:
-                        corr, p_val = stats.pearsonr(valid_data[columns[i]], valid_data[columns[j]])
-                        correlations.iloc[i, j] = corr
-                        p_values.iloc[i, j] = p_val
-                    else:
-                        correlations.iloc[i, j] = np.nan
-                        p_values.iloc[i, j] = np.nan
-                else:
-                    correlations.iloc[i, j] = 1.0
-                    p_values.iloc[i, j] = 0.0
-                    
+        result = self.correlation_result(columns)
+        correlations = result.block(columns)
+        p_values = result.block(columns, statistic='p')
         return correlations, p_values
 
     def visualize_correlation_matrix(self, correlation_matrix):
@@ -85,36 +144,94 @@ class EarthquakeCorrelationAnalysis:
         plt.tight_layout()
         plt.show()
 
-    def analyze_strong_correlations(self, correlation_matrix, threshold=0.5):
+    def analyze_strong_correlations(self, correlation_matrix=None, threshold=0.5, top_k=None,
+                                    columns=None, block_size=256):
         """
         Identify and analyze strong correlations
+        
+        Without a precomputed matrix the pairs are searched tile by tile
+        over the data (see CorrelationEngine.strong_correlations), keeping
+        only pairs with |r| >= threshold, or the top_k pairs by |r|. Both
+        paths return the pair's row count n and skip undefined (NaN) pairs.
         """
-        strong_correlations = []
+        if columns is None:
+            columns = sum(self.prepare_correlation_columns().values(), [])
+        if correlation_matrix is None and self.data is None:
+            # Streaming mode: select from the matrix of the co-moments
+            correlation_matrix = self.correlation_result(columns).block(columns)
+        if correlation_matrix is None:
+            validity = ValidityMaskIndex.for_frame(self.data)
+            positions = [validity.positions[column] for column in columns]
+            return strong_correlations(
+                self.data[columns].to_numpy(dtype=np.float64),
+                columns,
+                validity.mask[:, positions],
+                threshold=threshold,
+                top_k=top_k,
+                block_size=block_size
+            )
         
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i + 1, len(correlation_matrix.columns)):
-                corr = correlation_matrix.iloc[i, j]
-                if abs(corr) >= threshold:
-                    strong_correlations.append({
-                        'variable1': correlation_matrix.columns[i],
-                        'variable2': correlation_matrix.columns[j],
-                        'correlation': corr
-                    })
+        # Upper triangle of the given matrix in one vectorized selection
+        values = correlation_matrix.to_numpy(dtype=np.float64)
+        rows, cols = np.triu_indices_from(values, k=1)
+        correlations = values[rows, cols]
+        defined = np.flatnonzero(~np.isnan(correlations))
+        if top_k is None:
+            keep = defined[np.abs(correlations[defined]) >= threshold]
+        else:
+            keep = defined[np.argsort(-np.abs(correlations[defined]), kind='stable')[:top_k]]
         
-        return pd.DataFrame(strong_correlations)
+        names = correlation_matrix.columns.to_numpy()
+        result = self.correlation_result(list(names))
+        positions = np.array([result.positions[name] for name in names])
+        return pd.DataFrame({
+            'variable1': names[rows[keep]],
+            'variable2': names[cols[keep]],
+            'correlation': correlations[keep],
+            'n': result.n[positions[rows[keep]], positions[cols[keep]]].astype(np.int64)
+        })
+
+    def bootstrap_confidence_intervals(self, n_resamples=1000, confidence=0.95, seed=None,
+                                       n_workers=None, batch_size=100):
+        """
+        Percentile bootstrap intervals for every column pair
+        
+        Replicates are computed in batches of resample weights (see
+        Resampling.bootstrap_correlations); a fixed seed gives the same
+        intervals for any n_workers.
+        """
+        columns = sum(self.prepare_correlation_columns().values(), [])
+        validity = ValidityMaskIndex.for_frame(self.data)
+        positions = [validity.positions[column] for column in columns]
+        rows, cols = np.triu_indices(len(columns), k=1)
+        
+        intervals = bootstrap_correlations(
+            self.data[columns].to_numpy(dtype=np.float64),
+            np.column_stack([rows, cols]),
+            validity.mask[:, positions],
+            n_resamples=n_resamples,
+            confidence=confidence,
+            batch_size=batch_size,
+            seed=seed,
+            n_workers=n_workers
+        )
+        intervals.insert(0, 'variable1', np.asarray(columns)[rows])
+        intervals.insert(1, 'variable2', np.asarray(columns)[cols])
+        return intervals
 
     def correlation_by_group(self):
         """
         Analyze correlations within and between feature groups
+        
+        Every block is a slice of the cached full matrix.
         """
         column_groups = self.prepare_correlation_columns()
+        result = self.correlation_result()
         group_correlations = {}
         
         # Within-group correlations
         for group_name, columns in column_groups.items():
-            group_correlations[f'{group_name}_internal'] = (
-                self.data[columns].corr()
-            )
+            group_correlations[f'{group_name}_internal'] = result.block(columns)
         
         # Between-group correlations
         for g1 in column_groups.keys():
@@ -123,15 +240,7 @@ class EarthquakeCorrelationAnalysis:
                     cols1 = column_groups[g1]
                     cols2 = column_groups[g2]
                     if len(cols1) > 1 and len(cols2) > 1:  # Only compute if both groups have more than one column
-                        cross_corr = pd.DataFrame(
-                            np.corrcoef(
-                                self.data[cols1].values.T,
-                                self.data[cols2].values.T
-                            )[:len(cols1), len(cols1):],
-                            index=cols1,
-                            columns=cols2
-                        )
-                        group_correlations[f'{g1}_vs_{g2}'] = cross_corr
+                        group_correlations[f'{g1}_vs_{g2}'] = result.block(cols1, cols2)
         
         return group_correlations
 
@@ -181,7 +290,7 @@ class EarthquakeCorrelationAnalysis:
 
 def main():
     # Load earthquake data
-    data = pd.read_csv('earthquakes.csv')
+    data = load_catalog([EarthquakeCorrelationAnalysis])
 
     # Check for required columns
     required_columns = sum(EarthquakeCorrelationAnalysis(data).prepare_correlation_columns().values(), [])
@@ -0,0 +1,303 @@
+import warnings
+import pandas as pd
+import numpy as np
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from scipy import stats
+from earthquake_analysis.CorrelationEngine import centered_columns, pearson_block
+
+# Data shared with pool workers, set once per process by _init_worker
+_WORKER_FEATURES = None
+
+# Rows and column pairs handled per step, which bound the transient
+# weight matrices (resamples x ROW_CHUNK) and pair features
+# (6 x ROW_CHUNK x PAIR_BLOCK) regardless of the catalog size
+ROW_CHUNK = 8192
+PAIR_BLOCK = 64
+# Largest (permutations x rows) block of shuffled targets held at a time
+MAX_SHUFFLED_CELLS = 2 ** 22
+
+
+def pair_features(centered, present, pairs):
+    """
+    Per-row terms of the pairwise-complete sums for the given column pairs
+
+    Returns a (6, rows, pairs) array: both-present indicator, the two
+    masked values, their masked squares and their product. A row-weight
+    vector times each slab gives the weighted pairwise sums, so the sums of
+    many resamples are one matrix product per slab.
+    """
+    a, b = pairs[:, 0], pairs[:, 1]
+    present_a, present_b = present[:, a], present[:, b]
+    values_a, values_b = centered[:, a], centered[:, b]
+    return np.stack([
+        present_a * present_b,
+        values_a * present_b,
+        values_b * present_a,
+        values_a * values_a * present_b,
+        values_b * values_b * present_a,
+        values_a * values_b
+    ])
+
+
+def weighted_pair_sums(weights, centered, present, pairs):
+    """
+    The six weighted pairwise sums, (6, weight vectors, pairs), over the
+    rows of one chunk; features are built PAIR_BLOCK pairs at a time
+    """
+    sums = np.empty((6, weights.shape[0], len(pairs)))
+    for start in range(0, len(pairs), PAIR_BLOCK):
+        block = slice(start, start + PAIR_BLOCK)
+        sums[:, :, block] = weights @ pair_features(centered, present, pairs[block])
+    return sums
+
+
+def row_chunks(n_rows):
+    """
+    (start, stop) bounds of the row chunks
+    """
+    return [(start, min(start + ROW_CHUNK, n_rows)) for start in range(0, n_rows, ROW_CHUNK)]
+
+
+def pair_correlations(sums):
+    """
+    Pearson r of every pair under each weight vector, from weighted_pair_sums
+    """
+    n, sums_a, sums_b, squares_a, squares_b, products = sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance_a = squares_a - sums_a * sums_a / n
+        variance_b = squares_b - sums_b * sums_b / n
+        r = (products - sums_a * sums_b / n) / np.sqrt(variance_a * variance_b)
+    r = np.clip(r, -1.0, 1.0)
+    return np.where((n < 2) | (variance_a <= 0) | (variance_b <= 0), np.nan, r)
+
+
+def bootstrap_batch(seed, n_resamples, features=None):
+    """
+    Replicate correlations of one batch of bootstrap resamples
+
+    Each resample is a multinomial row-count vector, i.e. how often every
+    row was drawn. The draws are split hierarchically: first how many fall
+    in each row chunk, then how they spread over the chunk's rows, so only
+    a (resamples x ROW_CHUNK) block of weights exists at a time.
+    """
+    centered, present, pairs = _WORKER_FEATURES if features is None else features
+    n_rows = centered.shape[0]
+    chunks = row_chunks(n_rows)
+    rng = np.random.default_rng(seed)
+    per_chunk = rng.multinomial(
+        n_rows, [(stop - start) / n_rows for start, stop in chunks], size=n_resamples
+    )
+
+    sums = np.zeros((6, n_resamples, len(pairs)))
+    for i, (start, stop) in enumerate(chunks):
+        weights = rng.multinomial(per_chunk[:, i], np.full(stop - start, 1.0 / (stop - start)))
+        sums += weighted_pair_sums(
+            weights.astype(np.float64), centered[start:stop], present[start:stop], pairs
+        )
+    return pair_correlations(sums)
+
+
+def _init_worker(features):
+    global _WORKER_FEATURES
+    _WORKER_FEATURES = features
+
+
+def batch_sizes(total, batch_size):
+    """
+    Sizes of the batches that make up `total` replicates
+    """
+    sizes = [batch_size] * (total // batch_size)
+    if total % batch_size:
+        sizes.append(total % batch_size)
+    return sizes
+
+
+def worker_pool(features, n_workers=None):
+    """
+    Process pool whose workers receive the shared features once, or None
+    to run in this process
+    """
+    if n_workers is None or n_workers <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(features,)
+    )
+
+
+def map_batches(function, features, seeds, sizes, n_workers=None, executor=None):
+    """
+    Run function(seed, size) over batches, in a process pool if n_workers > 1
+
+    Every batch has its own spawned seed, so results do not depend on how
+    batches are distributed over workers. An executor from worker_pool can
+    be passed to reuse its workers across calls.
+    """
+    if executor is not None:
+        return list(executor.map(function, seeds, sizes))
+    pool = worker_pool(features, n_workers)
+    if pool is None:
+        return [function(seed, size, features) for seed, size in zip(seeds, sizes)]
+    with pool:
+        return list(pool.map(function, seeds, sizes))
+
+
+def bootstrap_correlations(values, pairs, mask=None, n_resamples=1000, confidence=0.95,
+                           batch_size=100, seed=None, n_workers=None):
+    """
+    Percentile bootstrap confidence intervals of pairwise-complete Pearson r
+
+    values is a (rows x columns) array and pairs a list of column index
+    pairs. Resamples are drawn in batches of batch_size and summed over
+    row chunks, which bounds memory at (batch_size x ROW_CHUNK) weights
+    plus the replicate results, whatever the number of rows.
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    centered, present = centered_columns(values, mask)
+    features = (centered, present, pairs)
+
+    estimate = pair_correlations(sum(
+        (weighted_pair_sums(np.ones((1, stop - start)), centered[start:stop], present[start:stop], pairs)
+         for start, stop in row_chunks(centered.shape[0])),
+        np.zeros((6, 1, len(pairs)))
+    ))[0]
+    sizes = batch_sizes(n_resamples, batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    replicates = np.vstack(map_batches(bootstrap_batch, features, seeds, sizes, n_workers))
+
+    alpha = 1.0 - confidence
+    with warnings.catch_warnings():
+        # Pairs without enough rows have only NaN replicates
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low, high = np.nanpercentile(replicates, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+        std_error = np.nanstd(replicates, axis=0, ddof=1)
+    return pd.DataFrame({
+        'correlation': estimate,
+        'ci_low': low,
+        'ci_high': high,
+        'std_error': std_error
+    })
+
+
+def permutation_batch(seed, n_permutations, features=None, active=None):
+    """
+    How often shuffled targets correlate at least as strongly as observed
+
+    The target is permuted once per replicate and scored against every
+    active predictor at once: a (permutations x rows) matrix of shuffled
+    targets times the masked predictor columns. Permutations are shuffled
+    in steps of at most MAX_SHUFFLED_CELLS // rows, which bounds that
+    matrix however many rows there are.
+    """
+    target, present, values, observed = _WORKER_FEATURES if features is None else features
+    if active is not None:
+        present, values, observed = present[:, active], values[:, active], observed[active]
+
+    n = present.sum(axis=0)
+    sums_x = values.sum(axis=0)
+    variance_x = (values * values).sum(axis=0) - sums_x * sums_x / n
+
+    rng = np.random.default_rng(seed)
+    step = max(1, MAX_SHUFFLED_CELLS // max(target.size, 1))
+    exceed = np.zeros(values.shape[1], dtype=np.int64)
+    for start in range(0, n_permutations, step):
+        shuffled = rng.permuted(np.tile(target, (min(step, n_permutations - start), 1)), axis=1)
+        sums_y = shuffled @ present
+        squares_y = (shuffled * shuffled) @ present
+        products = shuffled @ values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = (products - sums_x * sums_y / n) / np.sqrt(variance_x * (squares_y - sums_y * sums_y / n))
+        # Relative slack so replicates equal to the observed value count
+        exceed += (np.abs(r) >= np.abs(observed) * (1 - 1e-12)).sum(axis=0)
+    return exceed
+
+
+def clopper_pearson(successes, trials, confidence=0.99):
+    """
+    Exact binomial confidence interval of a proportion
+    """
+    alpha = 1.0 - confidence
+    successes = np.asarray(successes, dtype=np.float64)
+    trials = np.asarray(trials, dtype=np.float64)
+    low = np.where(successes > 0, stats.beta.ppf(alpha / 2, successes, trials - successes + 1), 0.0)
+    high = np.where(
+        successes < trials, stats.beta.ppf(1 - alpha / 2, successes + 1, trials - successes), 1.0
+    )
+    return low, high
+
+
+def permutation_test(target, predictors, target_mask=None, predictor_mask=None,
+                     max_permutations=10000, batch_size=500, batches_per_round=4,
+                     thresholds=(0.01, 0.05, 0.1), confidence=0.99, seed=None, n_workers=None):
+    """
+    Permutation p-values of the Pearson correlation between a target and
+    every predictor column, with early stopping
+
+    Target values are shuffled among the rows where the target is present;
+    each predictor keeps its own pairwise-complete rows. Permutations run
+    in rounds of batches_per_round batches, spread over the workers. After
+    every round, predictors whose Clopper-Pearson interval for the p-value
+    no longer contains any of the thresholds are settled and dropped from
+    later rounds. Rounds do not depend on n_workers, so a fixed seed gives
+    the same result for any number of workers.
+    """
+    target = np.asarray(target, dtype=np.float64)
+    predictors = np.asarray(predictors, dtype=np.float64)
+    if target_mask is None:
+        target_mask = ~np.isnan(target)
+    if predictor_mask is None:
+        predictor_mask = ~np.isnan(predictors)
+
+    # Only rows with a target value take part in the shuffle
+    target = target[target_mask]
+    target = target - target.mean()
+    present = predictor_mask[target_mask].astype(np.float64)
+    values, _ = centered_columns(predictors[target_mask], predictor_mask[target_mask])
+    n = present.sum(axis=0)
+
+    r, _ = pearson_block(target[:, None], np.ones((target.size, 1)), values, present)
+    observed = r[0]
+    features = (target, present, values, observed)
+
+    n_predictors = values.shape[1]
+    exceed = np.zeros(n_predictors)
+    trials = np.zeros(n_predictors)
+    active = np.flatnonzero(~np.isnan(observed))
+    round_size = batch_size * batches_per_round
+    seeds = iter(np.random.SeedSequence(seed).spawn(-(-max_permutations // batch_size)))
+
+    pool = worker_pool(features, n_workers)
+    try:
+        while active.size and trials[active].max() < max_permutations:
+            sizes = batch_sizes(int(min(round_size, max_permutations - trials[active].max())), batch_size)
+            counts = map_batches(
+                partial(permutation_batch, active=active),
+                features,
+                [next(seeds) for _ in sizes],
+                sizes,
+                executor=pool
+            )
+            exceed[active] += np.sum(counts, axis=0)
+            trials[active] += sum(sizes)
+
+            low, high = clopper_pearson(exceed[active], trials[active], confidence)
+            undecided = np.zeros(active.size, dtype=bool)
+            for threshold in thresholds:
+                undecided |= (low <= threshold) & (high >= threshold)
+            active = active[undecided]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p_values = (exceed + 1) / (trials + 1)
+    low, high = clopper_pearson(exceed, np.maximum(trials, 1), confidence)
+    decided = trials > 0
+    return pd.DataFrame({
+        'correlation': observed,
+        'sample_size': n.astype(np.int64),
+        'permutation_p_value': np.where(decided, p_values, np.nan),
+        'n_permutations': trials.astype(np.int64),
+        'p_value_low': np.where(decided, low, np.nan),
+        'p_value_high': np.where(decided, high, np.nan)
+    })
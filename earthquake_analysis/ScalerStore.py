@@ -0,0 +1,149 @@
+import re
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Default location of persisted scaler parameters
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / 'data' / 'scalers'
+
+
+class ScalerParameters:
+    """
+    Fitted parameters of one scaling family as an affine map
+
+    Every family (standard, min-max, robust) reduces to scaled = x * scale + offset
+    per column, so applying it to new rows is one vectorized multiply-add.
+    """
+
+    def __init__(self, family, columns, scale, offset, n_rows=0, version=None, fitted_at=None):
+        self.family = family
+        self.columns = list(columns)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.n_rows = int(n_rows)
+        self.version = version
+        self.fitted_at = fitted_at or datetime.now(timezone.utc).isoformat()
+
+    @classmethod
+    def from_standard_scaler(cls, family, columns, scaler, n_rows=0):
+        """
+        Parameters of a fitted sklearn StandardScaler
+        """
+        scale = 1.0 / scaler.scale_
+        return cls(family, columns, scale, -scaler.mean_ * scale, n_rows)
+
+    @classmethod
+    def from_minmax_scaler(cls, family, columns, scaler, n_rows=0):
+        """
+        Parameters of a fitted sklearn MinMaxScaler
+        """
+        return cls(family, columns, scaler.scale_, scaler.min_, n_rows)
+
+    @classmethod
+    def from_robust_scaler(cls, family, columns, scaler, n_rows=0):
+        """
+        Parameters of a fitted sklearn RobustScaler
+        """
+        scale = 1.0 / scaler.scale_
+        return cls(family, columns, scale, -scaler.center_ * scale, n_rows)
+
+    @classmethod
+    def from_moments(cls, family, moments, method):
+        """
+        Parameters from a MomentAccumulator, as sklearn would fit them
+
+        method is 'standard' (mean and population std) or 'minmax'.
+        Near-zero spreads are replaced by 1 like sklearn does.
+        """
+        if method == 'standard':
+            center, spread = moments.mean, moments.std(ddof=0)
+        elif method == 'minmax':
+            center, spread = moments.min, moments.max - moments.min
+        else:
+            raise ValueError("method must be 'standard' or 'minmax'")
+        spread = np.where(spread < 10 * np.finfo(np.float64).eps, 1.0, spread)
+        scale = 1.0 / spread
+        return cls(family, moments.columns, scale, -center * scale, moments.n_rows)
+
+    def transform(self, values):
+        """
+        Scale a (rows x columns) array in the column order of the parameters
+        """
+        return np.asarray(values, dtype=np.float64) * self.scale + self.offset
+
+    def inverse_transform(self, values):
+        """
+        Map scaled values back to the original units
+        """
+        return (np.asarray(values, dtype=np.float64) - self.offset) / self.scale
+
+
+class ScalerStore:
+    """
+    Versioned .npz files of scaler parameters, one series per family
+
+    Saving never overwrites: each save writes <family>.v<N>.npz with the
+    next version number, and loading defaults to the latest version.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = Path(directory)
+
+    def path(self, family, version):
+        """
+        File holding one version of a family
+        """
+        return self.directory / f'{family}.v{version}.npz'
+
+    def versions(self, family):
+        """
+        Saved versions of a family, oldest first
+        """
+        pattern = re.compile(rf'^{re.escape(family)}\.v(\d+)\.npz$')
+        if not self.directory.exists():
+            return []
+        return sorted(
+            int(match.group(1))
+            for match in (pattern.match(path.name) for path in self.directory.iterdir())
+            if match
+        )
+
+    def save(self, parameters):
+        """
+        Write parameters as the next version of their family
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        existing = self.versions(parameters.family)
+        version = existing[-1] + 1 if existing else 1
+        np.savez(
+            self.path(parameters.family, version),
+            family=np.array(parameters.family),
+            columns=np.array(parameters.columns),
+            scale=parameters.scale,
+            offset=parameters.offset,
+            n_rows=np.array(parameters.n_rows),
+            fitted_at=np.array(parameters.fitted_at)
+        )
+        parameters.version = version
+        return version
+
+    def load(self, family, version=None):
+        """
+        Read one version of a family (the latest by default)
+        """
+        if version is None:
+            existing = self.versions(family)
+            if not existing:
+                raise FileNotFoundError(f"No saved scaler parameters for '{family}'")
+            version = existing[-1]
+
+        with np.load(self.path(family, version), allow_pickle=False) as stored:
+            return ScalerParameters(
+                str(stored['family']),
+                stored['columns'].tolist(),
+                stored['scale'],
+                stored['offset'],
+                int(stored['n_rows']),
+                version,
+                str(stored['fitted_at'])
+            )
@@ -0,0 +1,293 @@
+import numpy as np
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty) with bounded memory
+
+    Values are kept in a hierarchy of compactors; an item at level h stands
+    for 2**h input values. Updates take whole NumPy batches, and sketches
+    built on different chunks or workers can be merged.
+    """
+
+    # Capacity decay between levels, as in the original paper
+    CAPACITY_DECAY = 2.0 / 3.0
+    # Input values absorbed per step, in blocks of k
+    UPDATE_BLOCKS = 256
+
+    def __init__(self, epsilon=0.01, k=None, seed=None):
+        if k is None:
+            # Empirical rank error of KLL is about 1.65 / k**0.9
+            k = int(np.ceil((1.65 / epsilon) ** (1 / 0.9)))
+        self.k = max(int(k), 8)
+        self.epsilon = epsilon
+        self.n = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        """
+        Number of items a level may hold before it is compacted
+        """
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        """
+        Add a batch of values; NaNs are ignored
+
+        Large batches are absorbed in bounded slices, so the sketch keeps
+        O(k log n) items and never sorts more than k values at a time.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        step = self.UPDATE_BLOCKS * self.k
+        for start in range(0, values.size, step):
+            chunk = values[start:start + step]
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                continue
+            self.n += chunk.size
+            self.min = np.fmin(self.min, chunk.min())
+            self.max = np.fmax(self.max, chunk.max())
+            self._absorb(chunk)
+            self.compress()
+        return self
+
+    def _absorb(self, items):
+        # Compact the slice block by block: every full block of k items is
+        # sorted and half of it promoted, all blocks of a level in one
+        # operation. Only blocks of k are ever sorted, and no more than one
+        # slice of UPDATE_BLOCKS * k values is held beyond the levels.
+        block = self.k - self.k % 2
+        level = 0
+        while items.size >= block:
+            if level + 1 >= len(self.levels):
+                self.levels.append(np.empty(0))
+            n_blocks = items.size // block
+            blocks = np.sort(items[:n_blocks * block].reshape(n_blocks, block), axis=1)
+            self.levels[level] = np.concatenate([self.levels[level], items[n_blocks * block:]])
+            offsets = self._rng.integers(2, size=(n_blocks, 1))
+            items = np.take_along_axis(blocks, offsets + np.arange(0, block, 2), axis=1).ravel()
+            level += 1
+        self.levels[level] = np.concatenate([self.levels[level], items])
+
+    def compress(self):
+        """
+        Compact overfull levels, promoting every other sorted item upward
+        """
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so weights remain exact
+                keep = items[:items.size % 2]
+                pairs = items[items.size % 2:]
+                offset = int(self._rng.integers(2))
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], pairs[offset::2]]
+                )
+            level += 1
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.n += other.n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.compress()
+        return self
+
+    def weighted_items(self):
+        """
+        Sorted retained items with their cumulative weights
+        """
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(level_items.size, 2.0 ** level)
+            for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s) for q in [0, 1]
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+
+        items, cumulative = self.weighted_items()
+        targets = q * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, targets), items.size - 1)
+        result = items[index]
+        # The extremes are tracked exactly
+        result = np.where(q <= 0, self.min, result)
+        result = np.where(q >= 1, self.max, result)
+        return result
+
+    def rank(self, values):
+        """
+        Approximate normalized rank (CDF) of the given values
+        """
+        if self.n == 0:
+            return np.full(np.shape(values), np.nan)
+        items, cumulative = self.weighted_items()
+        index = np.searchsorted(items, values, side='right')
+        below = np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0)
+        return below / cumulative[-1]
+
+    def to_dict(self):
+        """
+        Plain-Python representation for shipping between workers
+        """
+        return {
+            'k': self.k,
+            'epsilon': self.epsilon,
+            'n': self.n,
+            'min': float(self.min),
+            'max': float(self.max),
+            'levels': [items.tolist() for items in self.levels]
+        }
+
+    @classmethod
+    def from_dict(cls, state, seed=None):
+        """
+        Rebuild a sketch from to_dict output
+        """
+        sketch = cls(state['epsilon'], k=state['k'], seed=seed)
+        sketch.n = state['n']
+        sketch.min = state['min']
+        sketch.max = state['max']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state['levels']]
+        return sketch
+
+
+class FrequentItemsSketch:
+    """
+    Mergeable Misra-Gries / Space-Saving summary of the most frequent values
+
+    At most `capacity` counters are kept. Estimated counts never exceed the
+    true counts and undercount them by at most `error_bound`, so the top
+    item is the exact mode whenever its lead is larger than that bound.
+    """
+
+    # Input values counted per step, in multiples of the capacity
+    UPDATE_BLOCKS = 256
+
+    def __init__(self, capacity=64):
+        self.capacity = int(capacity)
+        self.n = 0
+        self.error_bound = 0.0
+        self.values = np.empty(0)
+        self.counts = np.empty(0)
+
+    def _combine(self, values, counts):
+        # Sum counters for equal values, then shrink back to capacity
+        values = np.concatenate([self.values, values])
+        counts = np.concatenate([self.counts, counts])
+        values, inverse = np.unique(values, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=counts)
+
+        if values.size > self.capacity:
+            # Subtract the (capacity + 1)-th largest count from every counter
+            threshold = np.partition(counts, values.size - self.capacity - 1)[
+                values.size - self.capacity - 1
+            ]
+            counts = counts - threshold
+            keep = counts > 0
+            values, counts = values[keep], counts[keep]
+            self.error_bound += threshold
+
+        self.values, self.counts = values, counts
+
+    def update(self, values):
+        """
+        Add a batch of values; NaNs are ignored
+
+        The batch is counted in slices of UPDATE_BLOCKS * capacity values,
+        each folded into the counters before the next, so memory stays
+        bounded by the capacity and the slice size.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        step = self.UPDATE_BLOCKS * self.capacity
+        for start in range(0, values.size, step):
+            chunk = values[start:start + step]
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                continue
+            self.n += chunk.size
+            chunk_values, chunk_counts = np.unique(chunk, return_counts=True)
+            self._combine(chunk_values, chunk_counts.astype(np.float64))
+        return self
+
+    def merge(self, other):
+        """
+        Fold another summary into this one
+        """
+        self.n += other.n
+        self.error_bound += other.error_bound
+        self._combine(other.values, other.counts)
+        return self
+
+    def top_k(self, k=10):
+        """
+        Most frequent values and their estimated counts, largest first
+        """
+        # Ties go to the smallest value, like pandas' mode()
+        order = np.lexsort((self.values, -self.counts))[:k]
+        return self.values[order], self.counts[order]
+
+    def mode(self):
+        """
+        Estimated most frequent value
+        """
+        values, _ = self.top_k(1)
+        return values[0] if values.size else np.nan
+
+    def to_dict(self):
+        """
+        Plain-Python representation for shipping between workers
+        """
+        return {
+            'capacity': self.capacity,
+            'n': self.n,
+            'error_bound': self.error_bound,
+            'values': self.values.tolist(),
+            'counts': self.counts.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a summary from to_dict output
+        """
+        sketch = cls(state['capacity'])
+        sketch.n = state['n']
+        sketch.error_bound = state['error_bound']
+        sketch.values = np.asarray(state['values'], dtype=np.float64)
+        sketch.counts = np.asarray(state['counts'], dtype=np.float64)
+        return sketch
+
+
+def build_quantile_sketches(frame, columns, epsilon=0.01, seed=None):
+    """
+    One KLL sketch per column of a DataFrame (or chunk)
+    """
+    return {
+        column: KLLSketch(epsilon, seed=seed).update(frame[column].to_numpy(dtype=np.float64))
+        for column in columns
+    }
@@ -0,0 +1,208 @@
+import pandas as pd
+import numpy as np
+
+# Deepest supported level: two 30-bit cell indices fit in one uint64
+MAX_LEVEL = 30
+
+
+def spread_bits(values):
+    """
+    Insert a zero bit between each of the low 32 bits (Morton encoding)
+    """
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    values = (values | (values << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x3333333333333333)
+    values = (values | (values << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return values
+
+
+def compact_bits(values):
+    """
+    Inverse of spread_bits: keep every other bit
+    """
+    values = values.astype(np.uint64) & np.uint64(0x5555555555555555)
+    values = (values | (values >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    values = (values | (values >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    values = (values | (values >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    values = (values | (values >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    values = (values | (values >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return values
+
+
+def cell_codes(latitude, longitude, level):
+    """
+    Quadkey-style cell codes on an equirectangular grid
+
+    Each level splits a cell into four; the code interleaves the longitude
+    (even bits) and latitude (odd bits) cell indices, so the parent of a
+    cell is simply code >> 2.
+    """
+    if not 0 <= level <= MAX_LEVEL:
+        raise ValueError(f"level must be between 0 and {MAX_LEVEL}")
+    cells_per_axis = 1 << level
+    x = np.floor((np.asarray(longitude, dtype=np.float64) + 180.0) / 360.0 * cells_per_axis)
+    y = np.floor((np.asarray(latitude, dtype=np.float64) + 90.0) / 180.0 * cells_per_axis)
+    # The east and north edges belong to the last cell
+    x = np.clip(x, 0, cells_per_axis - 1).astype(np.uint64)
+    y = np.clip(y, 0, cells_per_axis - 1).astype(np.uint64)
+    return spread_bits(x) | (spread_bits(y) << np.uint64(1))
+
+
+def quadkey(code, level):
+    """
+    Base-4 quadkey string of a cell code
+    """
+    code = int(code)
+    return ''.join(str((code >> (2 * i)) & 3) for i in range(level - 1, -1, -1))
+
+
+class SpatialGrid:
+    """
+    Per-cell event aggregates at one grid level
+
+    Cells hold count, magnitude sums (around a fixed shift), maximum
+    significance and a count per depth class; coarser levels are rolled up
+    from the cells without touching the events again.
+    """
+
+    def __init__(self, level, codes, count, magnitude_count, magnitude_sum,
+                 magnitude_sum_sq, max_sig, depth_mix, depth_labels, magnitude_shift):
+        self.level = level
+        self.codes = codes
+        self.count = count
+        self.magnitude_count = magnitude_count
+        self.magnitude_sum = magnitude_sum
+        self.magnitude_sum_sq = magnitude_sum_sq
+        self.max_sig = max_sig
+        self.depth_mix = depth_mix
+        self.depth_labels = list(depth_labels)
+        self.magnitude_shift = magnitude_shift
+
+    @classmethod
+    def build(cls, latitude, longitude, magnitude, sig, depth_codes, depth_labels, level=8):
+        """
+        Assign every located event to a cell and aggregate in one pass
+
+        depth_codes are bin codes into depth_labels, -1 when unknown.
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        located = ~(np.isnan(latitude) | np.isnan(longitude))
+
+        codes, inverse = np.unique(
+            cell_codes(latitude[located], longitude[located], level), return_inverse=True
+        )
+        inverse = inverse.ravel()
+        n_cells = codes.size
+
+        magnitude = np.asarray(magnitude, dtype=np.float64)[located]
+        sig = np.asarray(sig, dtype=np.float64)[located]
+        depth_codes = np.asarray(depth_codes)[located]
+
+        has_magnitude = ~np.isnan(magnitude)
+        shift = float(magnitude[has_magnitude].mean()) if has_magnitude.any() else 0.0
+        centered = np.where(has_magnitude, magnitude - shift, 0.0)
+
+        max_sig = np.full(n_cells, -np.inf)
+        np.fmax.at(max_sig, inverse, sig)
+
+        n_classes = len(depth_labels)
+        has_depth = depth_codes >= 0
+        depth_mix = np.bincount(
+            inverse[has_depth] * n_classes + depth_codes[has_depth],
+            minlength=n_cells * n_classes
+        ).reshape(n_cells, n_classes)
+
+        return cls(
+            level,
+            codes,
+            np.bincount(inverse, minlength=n_cells),
+            np.bincount(inverse, weights=has_magnitude, minlength=n_cells),
+            np.bincount(inverse, weights=centered, minlength=n_cells),
+            np.bincount(inverse, weights=centered * centered, minlength=n_cells),
+            np.where(np.isinf(max_sig), np.nan, max_sig),
+            depth_mix,
+            depth_labels,
+            shift
+        )
+
+    def rollup(self, level):
+        """
+        Aggregate the cells up to a coarser level
+        """
+        if level > self.level:
+            raise ValueError("Can only roll up to a coarser (smaller) level")
+        parents = self.codes >> np.uint64(2 * (self.level - level))
+        codes, inverse = np.unique(parents, return_inverse=True)
+        inverse = inverse.ravel()
+        n_cells = codes.size
+
+        max_sig = np.full(n_cells, -np.inf)
+        np.fmax.at(max_sig, inverse, self.max_sig)
+        depth_mix = np.zeros((n_cells, len(self.depth_labels)), dtype=np.int64)
+        np.add.at(depth_mix, inverse, self.depth_mix)
+
+        def total(values):
+            return np.bincount(inverse, weights=values, minlength=n_cells)
+
+        return SpatialGrid(
+            level,
+            codes,
+            total(self.count).astype(np.int64),
+            total(self.magnitude_count),
+            total(self.magnitude_sum),
+            total(self.magnitude_sum_sq),
+            np.where(np.isinf(max_sig), np.nan, max_sig),
+            depth_mix,
+            self.depth_labels,
+            self.magnitude_shift
+        )
+
+    def bounds(self):
+        """
+        South-west corner and size of every cell in degrees
+        """
+        x = compact_bits(self.codes).astype(np.float64)
+        y = compact_bits(self.codes >> np.uint64(1)).astype(np.float64)
+        cells_per_axis = float(1 << self.level)
+        return (
+            y / cells_per_axis * 180.0 - 90.0,
+            x / cells_per_axis * 360.0 - 180.0,
+            180.0 / cells_per_axis,
+            360.0 / cells_per_axis
+        )
+
+    def summary(self):
+        """
+        One row of aggregates per occupied cell
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.magnitude_sum / self.magnitude_count
+            variance = (
+                (self.magnitude_sum_sq - self.magnitude_sum * mean)
+                / (self.magnitude_count - 1)
+            )
+        south, west, height, width = self.bounds()
+
+        summary = pd.DataFrame({
+            'quadkey': [quadkey(code, self.level) for code in self.codes],
+            'center_latitude': south + height / 2,
+            'center_longitude': west + width / 2,
+            'count': self.count,
+            'mean_magnitude': np.where(self.magnitude_count > 0, mean + self.magnitude_shift, np.nan),
+            'std_magnitude': np.where(
+                self.magnitude_count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan
+            ),
+            'max_sig': self.max_sig
+        })
+        for i, label in enumerate(self.depth_labels):
+            summary[label.lower()] = self.depth_mix[:, i]
+        return summary
+
+    def hotspots(self, top_n=10, by='count'):
+        """
+        The top cells ranked by one of the summary columns
+        """
+        return self.summary().nlargest(top_n, by).reset_index(drop=True)
@@ -0,0 +1,331 @@
+import pandas as pd
+import numpy as np
+
+
+class MomentAccumulator:
+    """
+    Mergeable per-column moments (count, mean, M2, M3, M4, min, max, nulls)
+
+    Chunks are reduced with vectorized NumPy operations and combined with
+    the pairwise update formulas of Chan et al. / Pebay, so accumulators
+    built on different chunks or workers can be merged in any order.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n_rows = 0
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.m3 = np.zeros(k)
+        self.m4 = np.zeros(k)
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+        self.null_count = np.zeros(k, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, columns, values):
+        """
+        Compute the moments of a 2-D block (rows x columns) in one pass
+        """
+        accumulator = cls(columns)
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+
+        count = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(valid, values, 0.0).sum(axis=0) / count
+            deviation = np.where(valid, values - mean, 0.0)
+            squared = deviation * deviation
+            m2 = squared.sum(axis=0)
+            m3 = (squared * deviation).sum(axis=0)
+            m4 = (squared * squared).sum(axis=0)
+
+        has_values = count > 0
+        accumulator.n_rows = values.shape[0]
+        accumulator.count = count
+        accumulator.mean = np.where(has_values, mean, 0.0)
+        accumulator.m2 = m2
+        accumulator.m3 = m3
+        accumulator.m4 = m4
+        accumulator.min = np.where(
+            has_values, np.where(valid, values, np.inf).min(axis=0, initial=np.inf), np.nan
+        )
+        accumulator.max = np.where(
+            has_values, np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf), np.nan
+        )
+        accumulator.null_count = values.shape[0] - count.astype(np.int64)
+        return accumulator
+
+    def update(self, chunk):
+        """
+        Add a DataFrame chunk (or a 2-D array in column order)
+        """
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[self.columns].to_numpy(dtype=np.float64)
+        self.merge(MomentAccumulator.from_values(self.columns, chunk))
+        return self
+
+    def merge(self, other):
+        """
+        Combine another accumulator over the same columns into this one
+        """
+        if other.columns != self.columns:
+            raise ValueError("Can only merge accumulators over the same columns")
+
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            delta_n = np.where(n > 0, delta / n, 0.0)
+            delta_n2 = delta_n * delta_n
+            term = delta * delta_n * n_a * n_b
+
+            mean = self.mean + delta_n * n_b
+            m2 = self.m2 + other.m2 + term
+            m3 = (
+                self.m3 + other.m3
+                + term * delta_n * (n_a - n_b)
+                + 3.0 * delta_n * (n_a * other.m2 - n_b * self.m2)
+            )
+            m4 = (
+                self.m4 + other.m4
+                + term * delta_n2 * (n_a * n_a - n_a * n_b + n_b * n_b)
+                + 6.0 * delta_n2 * (n_a * n_a * other.m2 + n_b * n_b * self.m2)
+                + 4.0 * delta_n * (n_a * other.m3 - n_b * self.m3)
+            )
+
+        self.n_rows += other.n_rows
+        self.count = n
+        self.mean = mean
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.null_count = self.null_count + other.null_count
+        return self
+
+    def variance(self, ddof=1):
+        """
+        Per-column variance
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof=1):
+        """
+        Per-column standard deviation
+        """
+        return np.sqrt(self.variance(ddof))
+
+    def skewness(self):
+        """
+        Biased sample skewness, matching scipy.stats.skew
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self):
+        """
+        Biased Fisher kurtosis, matching scipy.stats.kurtosis
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def to_dict(self):
+        """
+        Plain-Python representation for shipping between workers
+        """
+        state = {
+            name: getattr(self, name).tolist()
+            for name in ('count', 'mean', 'm2', 'm3', 'm4', 'min', 'max', 'null_count')
+        }
+        state['columns'] = self.columns
+        state['n_rows'] = self.n_rows
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild an accumulator from to_dict output
+        """
+        accumulator = cls(state['columns'])
+        accumulator.n_rows = state['n_rows']
+        for name in ('count', 'mean', 'm2', 'm3', 'm4', 'min', 'max'):
+            setattr(accumulator, name, np.asarray(state[name], dtype=np.float64))
+        accumulator.null_count = np.asarray(state['null_count'], dtype=np.int64)
+        return accumulator
+
+
+class CoMomentAccumulator:
+    """
+    Mergeable co-moments for pairwise-complete Pearson correlation
+
+    Rows are grouped by validity pattern (which columns are present); each
+    pattern keeps its row count, mean vector and co-moment matrix, so
+    pairwise-complete correlations can be rebuilt exactly for every column
+    pair. Accumulators merge across chunks and workers, and rows can be
+    removed again (e.g. the old version of a revised event).
+
+    Only moment-based statistics stream this way: ranks depend on every
+    row, so Spearman and Kendall still need the full columns.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.n_rows = 0
+        # pattern (bytes of the presence mask) -> (count, mean, co-moments)
+        self.patterns = {}
+
+    @classmethod
+    def from_values(cls, columns, values):
+        """
+        Co-moments of a 2-D block (rows x columns); NaN marks missing
+        """
+        accumulator = cls(columns)
+        values = np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        accumulator.n_rows = values.shape[0]
+        if values.shape[0] == 0:
+            return accumulator
+
+        masks, inverse = np.unique(present, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for code, mask in enumerate(masks):
+            rows = values[inverse == code]
+            rows = np.where(mask, rows, 0.0)
+            count = rows.shape[0]
+            mean = rows.mean(axis=0)
+            centered = rows - mean
+            accumulator.patterns[mask.tobytes()] = (
+                float(count), mean, centered.T @ centered
+            )
+        return accumulator
+
+    def _values(self, chunk):
+        if isinstance(chunk, pd.DataFrame):
+            return chunk[self.columns].to_numpy(dtype=np.float64)
+        return chunk
+
+    def update(self, chunk):
+        """
+        Add the rows of a DataFrame chunk (or a 2-D array in column order)
+        """
+        return self.merge(CoMomentAccumulator.from_values(self.columns, self._values(chunk)))
+
+    def remove(self, chunk):
+        """
+        Remove rows that were previously added
+        """
+        return self.retract(CoMomentAccumulator.from_values(self.columns, self._values(chunk)))
+
+    def merge(self, other):
+        """
+        Combine another accumulator over the same columns into this one
+        """
+        if other.columns != self.columns:
+            raise ValueError("Can only merge accumulators over the same columns")
+
+        for key, (count_b, mean_b, comoment_b) in other.patterns.items():
+            if key not in self.patterns:
+                self.patterns[key] = (count_b, mean_b.copy(), comoment_b.copy())
+                continue
+            count_a, mean_a, comoment_a = self.patterns[key]
+            count = count_a + count_b
+            delta = mean_b - mean_a
+            self.patterns[key] = (
+                count,
+                mean_a + delta * (count_b / count),
+                comoment_a + comoment_b + np.outer(delta, delta) * (count_a * count_b / count)
+            )
+        self.n_rows += other.n_rows
+        return self
+
+    def retract(self, other):
+        """
+        Inverse of merge: take the rows summarized by another accumulator out
+        """
+        if other.columns != self.columns:
+            raise ValueError("Can only retract accumulators over the same columns")
+
+        for key, (count_b, mean_b, comoment_b) in other.patterns.items():
+            count_a, mean_a, comoment_a = self.patterns.get(key, (0.0, None, None))
+            if count_b > count_a:
+                raise ValueError("Cannot remove rows that were never added")
+            count = count_a - count_b
+            if count == 0:
+                del self.patterns[key]
+                continue
+            mean = (count_a * mean_a - count_b * mean_b) / count
+            delta = mean_b - mean
+            self.patterns[key] = (
+                count,
+                mean,
+                comoment_a - comoment_b - np.outer(delta, delta) * (count * count_b / count_a)
+            )
+        self.n_rows -= other.n_rows
+        return self
+
+    def pairwise_sums(self):
+        """
+        Pairwise counts, sums, sums of squares and products around the
+        column means, in the layout of pearson_from_sums
+        """
+        k = len(self.columns)
+        if not self.patterns:
+            zeros = np.zeros((k, k))
+            return zeros, zeros, zeros, zeros
+
+        masks = np.array([
+            np.frombuffer(key, dtype=bool) for key in self.patterns
+        ]).astype(np.float64)
+        counts = np.array([state[0] for state in self.patterns.values()])
+        means = np.array([state[1] for state in self.patterns.values()])
+        comoments = np.array([state[2] for state in self.patterns.values()])
+
+        # Shift every pattern to the overall column means
+        weights = masks * counts[:, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reference = np.nan_to_num((weights * means).sum(axis=0) / weights.sum(axis=0))
+        deviation = (means - reference) * masks
+
+        n = weights.T @ masks
+        sums = (deviation * counts[:, None]).T @ masks
+        diagonal = np.diagonal(comoments, axis1=1, axis2=2)
+        squares = (diagonal + counts[:, None] * deviation * deviation).T @ masks
+        products = comoments.sum(axis=0) + (deviation * counts[:, None]).T @ deviation
+        return n, sums, squares, products
+
+    def to_dict(self):
+        """
+        Plain-Python representation for shipping between workers
+        """
+        return {
+            'columns': self.columns,
+            'n_rows': self.n_rows,
+            'patterns': [
+                {
+                    'mask': np.frombuffer(key, dtype=bool).tolist(),
+                    'count': count,
+                    'mean': mean.tolist(),
+                    'comoment': comoment.tolist()
+                }
+                for key, (count, mean, comoment) in self.patterns.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild an accumulator from to_dict output
+        """
+        accumulator = cls(state['columns'])
+        accumulator.n_rows = state['n_rows']
+        for pattern in state['patterns']:
+            key = np.asarray(pattern['mask'], dtype=bool).tobytes()
+            accumulator.patterns[key] = (
+                float(pattern['count']),
+                np.asarray(pattern['mean'], dtype=np.float64),
+                np.asarray(pattern['comoment'], dtype=np.float64)
+            )
+        return accumulator
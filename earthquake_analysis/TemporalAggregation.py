@@ -0,0 +1,251 @@
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from earthquake_analysis.DataLoader import load_catalog
+
+# Bucket widths in milliseconds
+BUCKET_WIDTHS = {
+    'h': 3_600_000,
+    'D': 86_400_000,
+    'W': 604_800_000
+}
+
+# The epoch is a Thursday; shifting by three days starts weeks on Monday
+BUCKET_OFFSETS = {
+    'h': 0,
+    'D': 0,
+    'W': 3 * 86_400_000
+}
+
+
+class TimeBucketAggregator:
+    """
+    Per-bucket event aggregates over epoch-millisecond times
+
+    Buckets are a dense run of fixed-width intervals holding count,
+    magnitude sums (around a fixed shift) and maximum significance. Sliding
+    windows are answered from running sums that are cached per window, and
+    append() only invalidates buckets from the earliest one it touched, so a
+    refresh recomputes the dirty tail instead of the whole history.
+    """
+
+    def __init__(self, freq='D'):
+        if freq not in BUCKET_WIDTHS:
+            raise ValueError(f"freq must be one of {list(BUCKET_WIDTHS)}")
+        self.freq = freq
+        self.width = BUCKET_WIDTHS[freq]
+        self.offset = BUCKET_OFFSETS[freq]
+        self.origin = None
+        self.magnitude_shift = None
+        self.count = np.zeros(0, dtype=np.int64)
+        self.magnitude_count = np.zeros(0, dtype=np.int64)
+        self.magnitude_sum = np.zeros(0)
+        self.magnitude_sum_sq = np.zeros(0)
+        self.max_sig = np.zeros(0)
+        # window -> cached sliding aggregates and how many leading buckets are clean
+        self._windows = {}
+
+    def bucket_index(self, epoch_ms):
+        """
+        Absolute bucket number of each time
+        """
+        return (np.asarray(epoch_ms, dtype=np.int64) + self.offset) // self.width
+
+    def _grow(self, first, last):
+        # Extend the dense arrays so they cover buckets first..last
+        if self.origin is None:
+            self.origin = first
+            size = last - first + 1
+            before, after = 0, size
+        else:
+            before = max(0, self.origin - first)
+            after = max(0, last - (self.origin + self.count.size - 1))
+
+        if before or after:
+            def pad(values, fill):
+                return np.concatenate([
+                    np.full(before, fill, dtype=values.dtype),
+                    values,
+                    np.full(after, fill, dtype=values.dtype)
+                ])
+            self.count = pad(self.count, 0)
+            self.magnitude_count = pad(self.magnitude_count, 0)
+            self.magnitude_sum = pad(self.magnitude_sum, 0.0)
+            self.magnitude_sum_sq = pad(self.magnitude_sum_sq, 0.0)
+            self.max_sig = pad(self.max_sig, np.nan)
+            self.origin -= before
+        return before
+
+    def append(self, time, magnitude, sig):
+        """
+        Fold a batch of events into the buckets
+
+        Late events are allowed; cached windows are invalidated from the
+        earliest bucket the batch touched.
+        """
+        time = np.asarray(time, dtype=np.float64)
+        magnitude = np.asarray(magnitude, dtype=np.float64)
+        sig = np.asarray(sig, dtype=np.float64)
+        valid = ~np.isnan(time)
+        if not valid.any():
+            return self
+        time, magnitude, sig = time[valid], magnitude[valid], sig[valid]
+
+        buckets = self.bucket_index(time.astype(np.int64))
+        first, last = int(buckets.min()), int(buckets.max())
+        prepended = self._grow(first, last)
+
+        has_magnitude = ~np.isnan(magnitude)
+        if self.magnitude_shift is None:
+            self.magnitude_shift = float(magnitude[has_magnitude].mean()) if has_magnitude.any() else 0.0
+        centered = np.where(has_magnitude, magnitude - self.magnitude_shift, 0.0)
+
+        positions = buckets - self.origin
+        size = self.count.size
+        self.count += np.bincount(positions, minlength=size)
+        self.magnitude_count += np.bincount(positions, weights=has_magnitude, minlength=size).astype(np.int64)
+        self.magnitude_sum += np.bincount(positions, weights=centered, minlength=size)
+        self.magnitude_sum_sq += np.bincount(positions, weights=centered * centered, minlength=size)
+        np.fmax.at(self.max_sig, positions, sig)
+
+        # Everything from the earliest touched bucket on is stale
+        dirty = 0 if prepended else first - self.origin
+        for cached in self._windows.values():
+            cached['clean'] = min(cached['clean'], dirty)
+        return self
+
+    def _refresh(self, window):
+        size = self.count.size
+        cached = self._windows.setdefault(window, {
+            'clean': 0,
+            'cumulative': np.zeros((4, 0)),
+            'sums': np.zeros((4, 0)),
+            'max_sig': np.zeros(0)
+        })
+        clean = cached['clean']
+        if clean >= size:
+            return cached
+
+        # Running sums: only the dirty tail is recomputed
+        base = np.vstack([
+            self.count, self.magnitude_count, self.magnitude_sum, self.magnitude_sum_sq
+        ])[:, clean:].astype(np.float64)
+        head = cached['cumulative'][:, :clean]
+        start = head[:, -1:] if clean else np.zeros((4, 1))
+        cumulative = np.hstack([head, start + np.cumsum(base, axis=1)])
+
+        # A window ending at bucket i covers buckets i - window + 1 .. i
+        lag_start = clean - window
+        if lag_start >= 0:
+            lagged = cumulative[:, lag_start:size - window]
+        else:
+            lagged = np.hstack([
+                np.zeros((4, min(-lag_start, size - clean))),
+                cumulative[:, :max(0, size - window)]
+            ])
+        sums = np.hstack([cached['sums'][:, :clean], cumulative[:, clean:] - lagged])
+
+        if clean >= window - 1:
+            segment = self.max_sig[clean - window + 1:]
+        else:
+            segment = np.concatenate([np.full(window - 1 - clean, np.nan), self.max_sig])
+        tail_max = np.fmax.reduce(sliding_window_view(segment, window), axis=1)
+
+        cached.update({
+            'clean': size,
+            'cumulative': cumulative,
+            'sums': sums,
+            'max_sig': np.concatenate([cached['max_sig'][:clean], tail_max])
+        })
+        return cached
+
+    def _frame(self, count, magnitude_count, magnitude_sum, magnitude_sum_sq, max_sig):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = magnitude_sum / magnitude_count
+            variance = (magnitude_sum_sq - magnitude_sum * mean) / (magnitude_count - 1)
+        starts = (np.arange(self.origin, self.origin + self.count.size) * self.width - self.offset)
+        index = pd.DatetimeIndex(starts.astype('datetime64[ms]'), name='bucket')
+        return pd.DataFrame(
+            {
+                'count': count.astype(np.int64),
+                'mean_magnitude': np.where(magnitude_count > 0, mean + self.magnitude_shift, np.nan),
+                'std_magnitude': np.where(
+                    magnitude_count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan
+                ),
+                'max_sig': max_sig
+            },
+            index=index
+        )
+
+    def buckets(self):
+        """
+        Aggregates of every bucket, empty buckets included
+        """
+        if self.origin is None:
+            return pd.DataFrame(columns=['count', 'mean_magnitude', 'std_magnitude', 'max_sig'])
+        return self._frame(
+            self.count, self.magnitude_count, self.magnitude_sum,
+            self.magnitude_sum_sq, self.max_sig
+        )
+
+    def rolling(self, window=7):
+        """
+        Sliding-window aggregates over the trailing `window` buckets
+        """
+        if self.origin is None:
+            return self.buckets()
+        cached = self._refresh(window)
+        return self._frame(*cached['sums'], cached['max_sig'])
+
+
+class EarthquakeTemporalAnalysis:
+    def __init__(self, data, freq='D'):
+        self.data = data
+        self.aggregator = TimeBucketAggregator(freq)
+        if data is not None:
+            self.append(data)
+
+    def prepare_columns(self):
+        """
+        Define columns used by the temporal aggregation
+        """
+        return {
+            'temporal_columns': [
+                'time',         # Event time (epoch ms)
+                'magnitude',    # Magnitude moments per bucket
+                'sig'           # Maximum significance per bucket
+            ]
+        }
+
+    def append(self, new_events):
+        """
+        Add newly arrived events to the buckets
+        """
+        self.aggregator.append(
+            new_events['time'].to_numpy(dtype=np.float64),
+            new_events['magnitude'].to_numpy(dtype=np.float64),
+            new_events['sig'].to_numpy(dtype=np.float64)
+        )
+        return self
+
+    def event_rates(self, window=7):
+        """
+        Per-bucket and sliding-window event rates side by side
+        """
+        buckets = self.aggregator.buckets()
+        rolling = self.aggregator.rolling(window)
+        return buckets.join(rolling, rsuffix=f'_{window}{self.aggregator.freq}')
+
+
+def main():
+    # Load earthquake data
+    data = load_catalog([EarthquakeTemporalAnalysis])
+
+    # Daily buckets with a weekly sliding window
+    analyzer = EarthquakeTemporalAnalysis(data, freq='D')
+    rates = analyzer.event_rates(window=7)
+    print("Daily Event Rates:")
+    print(rates.tail(14))
+
+if __name__ == "__main__":
+    main()
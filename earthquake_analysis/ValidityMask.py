@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+import weakref
+
+
+class ValidityMaskIndex:
+    """
+    Null bitmap of a loaded catalog, computed once and shared by analyzers
+
+    Row selections for a column, a pair of columns or any column set are
+    answered with boolean ANDs over the bitmap, so analyzers no longer need
+    dropna() copies of the frame to find their complete rows.
+    """
+
+    # id(frame) -> (weak reference to the frame, index)
+    _registry = {}
+
+    def __init__(self, data):
+        self.columns = list(data.columns)
+        self.positions = {column: i for i, column in enumerate(self.columns)}
+        self.n_rows = len(data)
+        # Column-major so each column's mask is a contiguous view
+        self.mask = np.asfortranarray(data.notna().to_numpy(dtype=bool))
+
+    @classmethod
+    def for_frame(cls, data, refresh=False):
+        """
+        Shared index for a DataFrame, built on first use
+
+        The index reflects the frame when it was built; pass refresh=True
+        after modifying missing values in place.
+        """
+        key = id(data)
+        entry = cls._registry.get(key)
+        if (
+            not refresh
+            and entry is not None
+            and entry[0]() is data
+            and entry[1].n_rows == len(data)
+            and entry[1].columns == list(data.columns)
+        ):
+            return entry[1]
+
+        index = cls(data)
+        reference = weakref.ref(data, lambda _, key=key: cls._registry.pop(key, None))
+        cls._registry[key] = (reference, index)
+        return index
+
+    def column_mask(self, column):
+        """
+        Rows where a column is present (a view, not a copy)
+        """
+        return self.mask[:, self.positions[column]]
+
+    def pair_mask(self, column1, column2):
+        """
+        Rows where both columns are present
+        """
+        return self.column_mask(column1) & self.column_mask(column2)
+
+    def complete_mask(self, columns):
+        """
+        Rows where every given column is present
+        """
+        positions = [self.positions[column] for column in columns]
+        return self.mask[:, positions].all(axis=1)
+
+    def valid_values(self, data, column, mask=None):
+        """
+        Values of a column restricted to a row mask (its own by default)
+        """
+        if mask is None:
+            mask = self.column_mask(column)
+        return data[column].to_numpy()[mask]
+
+    def null_counts(self, columns=None):
+        """
+        Missing values per column
+        """
+        columns = self.columns if columns is None else list(columns)
+        positions = [self.positions[column] for column in columns]
+        present = self.mask[:, positions].sum(axis=0)
+        return pd.Series(self.n_rows - present, index=columns)
+
+    def pairwise_counts(self, columns):
+        """
+        Matrix of pairwise-complete row counts
+        """
+        positions = [self.positions[column] for column in columns]
+        present = self.mask[:, positions].astype(np.float64)
+        counts = present.T @ present
+        return pd.DataFrame(counts.astype(np.int64), index=columns, columns=columns)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.BinCube import BinCube
+from earthquake_analysis.BinningAnalysis import EarthquakeBinningAnalysis
+
+
+LABELS = {'a': ['a0', 'a1', 'a2'], 'b': ['b0', 'b1', 'b2', 'b3'], 'c': ['c0', 'c1']}
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(0)
+    n = 2000
+    codes = {
+        name: rng.integers(-1, len(labels), n) for name, labels in LABELS.items()
+    }
+    # A label that never occurs
+    codes['b'][codes['b'] == 2] = 3
+    value = rng.normal(size=n)
+    value[::11] = np.nan
+    frame = pd.DataFrame({
+        name: pd.Categorical.from_codes(codes[name], categories=LABELS[name])
+        for name in LABELS
+    })
+    frame['value'] = value
+    cube = BinCube.build(
+        {name: (codes[name], LABELS[name]) for name in LABELS}, {'value': value}
+    )
+    return frame, cube
+
+
+def test_two_way_marginal_matches_crosstab(rows):
+    frame, cube = rows
+    expected = frame.groupby(['a', 'b'], observed=False).size().unstack()
+    # Rows missing in 'c' still count towards the a x b table
+    np.testing.assert_array_equal(cube.marginal(['a', 'b'], labeled=False), expected.to_numpy())
+    np.testing.assert_array_equal(cube.marginal(['b', 'a'], labeled=False), expected.to_numpy().T)
+
+    sums = frame.groupby(['a', 'b'], observed=False)['value'].sum().unstack()
+    np.testing.assert_allclose(cube.marginal(['a', 'b'], 'value', labeled=False), sums.to_numpy())
+
+
+def test_contingency_matches_crosstab(rows):
+    frame, cube = rows
+    for normalize in (False, 'index', 'columns', 'all'):
+        expected = pd.crosstab(frame['a'], frame['b'], normalize=normalize)
+        table = cube.contingency('a', 'b', normalize=normalize)
+        assert list(table.index) == list(expected.index)
+        assert list(table.columns) == list(expected.columns)
+        np.testing.assert_allclose(table.to_numpy(), expected.to_numpy())
+
+
+def test_three_way_marginal_and_one_way_sums(rows):
+    frame, cube = rows
+    expected = frame.groupby(['c', 'a', 'b'], observed=False).size()
+    counts = cube.marginal(['c', 'a', 'b'])
+    np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+    assert list(counts.index) == list(expected.index)
+
+    means = frame.groupby('b', observed=False)['value'].sum() / frame.groupby('b', observed=False).size()
+    np.testing.assert_allclose(cube.mean('value', 'b').to_numpy(), means.to_numpy())
+
+
+def test_slice_matches_filtered_rows(rows):
+    frame, cube = rows
+    sliced = cube.slice(c='c1', a=['a0', 'a2'])
+    kept = frame[(frame['c'] == 'c1') & frame['a'].isin(['a0', 'a2'])]
+    expected = kept.assign(a=kept['a'].cat.remove_unused_categories()).groupby(
+        ['a', 'b'], observed=False
+    ).size().unstack()
+    np.testing.assert_array_equal(sliced.marginal(['a', 'b'], labeled=False), expected.to_numpy())
+    assert sliced.marginal('c', labeled=False).tolist() == [len(kept)]
+
+
+def test_oversized_cube_is_rejected():
+    codes = {name: (np.zeros(3, dtype=np.int64), list(range(1000))) for name in 'xyz'}
+    with pytest.raises(ValueError, match='max_cells'):
+        BinCube.build(codes)
+
+
+def test_daily_cube_over_decades_is_rejected():
+    days = np.arange(0, 40 * 365, 7) * 86_400_000.0
+    data = pd.DataFrame({
+        'magnitude': np.full(days.size, 4.0),
+        'depth': 10.0,
+        'mmi': 3.0,
+        'sig': 300.0,
+        'time': days
+    })
+    analyzer = EarthquakeBinningAnalysis(data)
+    with pytest.raises(ValueError, match='time='):
+        analyzer.build_bin_cube('D')
+    assert analyzer.build_bin_cube('M').counts.sum() == days.size
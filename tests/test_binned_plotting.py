@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from scipy import stats
+from earthquake_analysis.BinnedPlotting import qq_quantiles, split_by_code
+from earthquake_analysis.Normalization import EarthquakeNormalization
+from earthquake_analysis.Sketches import KLLSketch
+from tests.test_scaler_store import normalization_frame
+
+
+def test_split_by_code_matches_masks():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(-1, 6, 1000).astype(np.int8)
+    codes[codes == 3] = 4
+    values = rng.normal(size=codes.size)
+    groups = split_by_code(values, codes, 7)
+
+    assert len(groups) == 7
+    for code, group in enumerate(groups):
+        np.testing.assert_array_equal(group, values[codes == code])
+    assert groups[3].size == 0 and groups[6].size == 0
+
+
+def probplot_points(values):
+    (theoretical, ordered), _ = stats.probplot(values, dist='norm')
+    return theoretical, ordered
+
+
+@pytest.fixture
+def column():
+    values = np.random.default_rng(2).gamma(2.0, 3.0, 5000)
+    values[::9] = np.nan
+    return values
+
+
+def test_qq_quantiles_keep_every_point_of_small_columns(column):
+    small = column[:150]
+    theoretical, sample = qq_quantiles(small, n_quantiles=200)
+    expected_theoretical, expected_sample = probplot_points(small[~np.isnan(small)])
+    np.testing.assert_allclose(theoretical, expected_theoretical, rtol=1e-12)
+    np.testing.assert_array_equal(sample, expected_sample)
+
+
+def test_qq_quantiles_pick_probplot_points(column):
+    theoretical, sample = qq_quantiles(column, n_quantiles=200)
+    expected_theoretical, expected_sample = probplot_points(column[~np.isnan(column)])
+    assert sample.size == 200
+
+    # Every point is one of probplot's, in order
+    ranks = np.searchsorted(expected_theoretical, theoretical)
+    np.testing.assert_allclose(expected_theoretical[ranks], theoretical, rtol=1e-12)
+    np.testing.assert_array_equal(expected_sample[ranks], sample)
+    assert ranks[0] == 0 and ranks[-1] == expected_sample.size - 1
+
+
+def test_sketched_qq_quantiles_within_epsilon(column):
+    epsilon = 0.01
+    values = column[~np.isnan(column)]
+    sketch = KLLSketch(epsilon, seed=0)
+    sketch.update(values)
+    theoretical, sample = qq_quantiles(None, n_quantiles=100, sketch=sketch)
+
+    ordered = np.sort(values)
+    expected_theoretical, _ = probplot_points(values)
+    ranks = np.searchsorted(expected_theoretical, theoretical)
+    np.testing.assert_allclose(expected_theoretical[ranks], theoretical, rtol=1e-12)
+    positions = stats.norm.cdf(theoretical)
+    achieved = np.searchsorted(ordered, sample, side='right') / values.size
+    assert np.abs(achieved - positions).max() <= 1.5 * epsilon
+
+
+def test_affine_qq_map_equals_qq_of_transformed_column():
+    frame = normalization_frame(3000, seed=5)
+    normalizer = EarthquakeNormalization(frame)
+    normalizer.generate_summary_report()
+
+    for scaling_type, scaled in (('standard_scaling', 'standard_scaled'), ('minmax_scaling', 'minmax_scaled')):
+        for name in normalizer.prepare_columns()[scaling_type]:
+            original = frame[name].dropna().to_numpy()
+            scale, offset = normalizer.column_scaling(name)
+            theoretical, quantiles = qq_quantiles(original, n_quantiles=200)
+            expected_theoretical, expected = qq_quantiles(
+                normalizer.normalized_data[scaled][name], n_quantiles=200
+            )
+            np.testing.assert_array_equal(theoretical, expected_theoretical)
+            np.testing.assert_allclose(quantiles * scale + offset, expected, rtol=1e-12, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        normalizer.column_scaling('unknown')
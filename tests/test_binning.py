@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.BinningAnalysis import (
+    BIN_SCHEMES, BinStatistics, EarthquakeBinningAnalysis, assign_bin_codes
+)
+
+
+def groupby_statistics(values, edges, labels):
+    binned = pd.cut(pd.Series(values), bins=edges, labels=labels, include_lowest=True)
+    grouped = pd.Series(values).groupby(binned, observed=True)
+    return pd.DataFrame({
+        'count': grouped.size(),
+        'mean': grouped.mean(),
+        'std': grouped.std(),
+        'min': grouped.min(),
+        'max': grouped.max()
+    })
+
+
+def state_for(values, edges):
+    return BinStatistics.from_codes(
+        [assign_bin_codes(values, edges)], [values], [len(edges) - 1]
+    )[0]
+
+
+@pytest.fixture
+def sample():
+    rng = np.random.default_rng(0)
+    values = np.round(rng.uniform(0.5, 6.5, 500), 1)
+    values[::17] = np.nan
+    # A bin of equal values and bins without any rows
+    values[:40] = 1000.0
+    return values
+
+
+def test_from_codes_matches_groupby(sample):
+    edges, labels = [0, 2, 4, 6, 7, 900, np.inf], ['a', 'b', 'c', 'd', 'e', 'f']
+    expected = groupby_statistics(sample, edges, labels)
+    frame = state_for(sample, edges).to_frame(labels, sample.size)
+
+    assert list(frame.index) == list(expected.index)
+    assert 'e' not in frame.index
+    pd.testing.assert_frame_equal(
+        frame.drop(columns='percentage'), expected, check_index_type=False, check_names=False
+    )
+    assert frame.loc['f', 'std'] == 0.0
+
+
+def test_several_columns_in_one_pass(sample):
+    edges = [0, 2, 4, 6, 7, 900, np.inf]
+    other = np.linspace(0, 12, sample.size)
+    states = BinStatistics.from_codes(
+        [assign_bin_codes(sample, edges), assign_bin_codes(other, list(range(13)))],
+        [sample, other],
+        [6, 12]
+    )
+    np.testing.assert_array_equal(states[0].m2, state_for(sample, edges).m2)
+    np.testing.assert_allclose(states[1].mean, state_for(other, list(range(13))).mean)
+
+
+def test_merge_and_retract_match_recompute(sample):
+    edges = [0, 2, 4, 6, 7, 900, np.inf]
+    first, second = sample[:300], sample[300:]
+    merged = state_for(first, edges).merge(state_for(second, edges))
+    full = state_for(sample, edges)
+    np.testing.assert_array_equal(merged.count, full.count)
+    np.testing.assert_allclose(merged.mean, full.mean, equal_nan=True)
+    np.testing.assert_allclose(merged.m2, full.m2, atol=1e-9)
+
+    stale = merged.retract(state_for(second, edges))
+    merged.recompute_extremes(stale, assign_bin_codes(first, edges), first)
+    remaining = state_for(first, edges)
+    np.testing.assert_array_equal(merged.count, remaining.count)
+    np.testing.assert_allclose(merged.mean, remaining.mean, equal_nan=True)
+    np.testing.assert_allclose(merged.m2, remaining.m2, atol=1e-9)
+    np.testing.assert_array_equal(merged.min, remaining.min)
+    np.testing.assert_array_equal(merged.max, remaining.max)
+
+
+def test_retract_everything_empties_bins(sample):
+    edges = [0, 2, 4, 6, 7, 900, np.inf]
+    state = state_for(sample, edges)
+    state.retract(state_for(sample, edges))
+    assert (state.count == 0).all()
+    assert np.isnan(state.mean).all() and (state.m2 == 0).all()
+    assert state.to_frame(['a', 'b', 'c', 'd', 'e', 'f'], 0).empty
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.default_rng(1)
+    n = 400
+    return pd.DataFrame({
+        'magnitude': rng.uniform(2.5, 7.5, n).astype(np.float32),
+        'depth': rng.uniform(0, 600, n).astype(np.float32),
+        'mmi': rng.integers(1, 10, n).astype(np.float32),
+        'sig': rng.integers(0, 2500, n),
+        'distanceKM': rng.uniform(0, 200, n),
+        'time': np.arange(n) * 3.6e6
+    })
+
+
+def test_fixed_bins_match_groupby(catalog):
+    analyzer = EarthquakeBinningAnalysis(catalog)
+    report = analyzer.binning_report()
+    for column, (edges, labels) in BIN_SCHEMES.items():
+        expected = groupby_statistics(catalog[column], edges, labels)
+        frame = report[column]
+        assert frame['min'].dtype == catalog[column].dtype
+        pd.testing.assert_frame_equal(
+            frame.drop(columns='percentage'), expected,
+            check_dtype=False, check_index_type=False, check_names=False, rtol=1e-6
+        )
+
+
+def test_rebinned_column_drops_its_state(catalog):
+    analyzer = EarthquakeBinningAnalysis(catalog)
+    analyzer.binning_report()
+    analyzer.binned_data['sig'] = analyzer.significance_binning()
+
+    statistics = analyzer.calculate_bin_statistics('sig')
+    expected = catalog.groupby(analyzer.binned_data['sig'], observed=True)['sig'].agg('count')
+    assert 'sig' not in analyzer.bin_states
+    assert list(statistics['count']) == list(expected)
+
+
+def test_relationships_follow_caller_bins(catalog, monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    analyzer = EarthquakeBinningAnalysis(catalog)
+    analyzer.binning_report()
+
+    fixed = analyzer.analyze_relationships('magnitude', 'depth')
+    expected = pd.crosstab(
+        analyzer.binned_data['magnitude'], analyzer.binned_data['depth'], normalize='index'
+    )
+    np.testing.assert_allclose(fixed.to_numpy(), expected.to_numpy())
+
+    analyzer.binned_data['sig'] = analyzer.significance_binning()
+    custom = analyzer.analyze_relationships('magnitude', 'sig')
+    expected = pd.crosstab(
+        analyzer.binned_data['magnitude'], analyzer.binned_data['sig'], normalize='index'
+    )
+    pd.testing.assert_frame_equal(custom, expected)
+
+
+@pytest.fixture(scope='module')
+def bundled_catalog():
+    from earthquake_analysis.DataLoader import load_catalog
+    return load_catalog([EarthquakeBinningAnalysis]).reset_index(drop=True)
+
+
+def assert_reports_equal(report, expected):
+    for column in expected:
+        pd.testing.assert_frame_equal(report[column], expected[column], rtol=1e-6, atol=1e-6)
+
+
+def test_append_keeps_repeated_rows_of_real_catalog(bundled_catalog):
+    # The bundled catalog repeats rows with the same id and updated time
+    assert bundled_catalog['id'].duplicated().any()
+    expected = EarthquakeBinningAnalysis(bundled_catalog).binning_report()
+
+    analyzer = EarthquakeBinningAnalysis(bundled_catalog.iloc[:400])
+    analyzer.binning_report()
+    for start in range(400, len(bundled_catalog), 300):
+        report = analyzer.append(bundled_catalog.iloc[start:start + 300])
+
+    assert len(analyzer.data) == len(bundled_catalog)
+    assert_reports_equal(report, expected)
+
+
+def test_append_replaces_newer_and_ignores_older_revisions(bundled_catalog):
+    base = bundled_catalog.iloc[:600]
+    revised = base.iloc[:20].copy()
+    revised['updated'] += 1000
+    revised['magnitude'] += np.float32(0.5)
+    stale = base.iloc[20:40].copy()
+    stale['updated'] -= 1000
+    stale['magnitude'] += np.float32(1.0)
+
+    analyzer = EarthquakeBinningAnalysis(base)
+    analyzer.binning_report()
+    report = analyzer.append(pd.concat([revised, stale]))
+
+    replaced = base['id'].isin(revised['id'])
+    expected_rows = pd.concat([base[~replaced], revised]).reset_index(drop=True)
+    expected = EarthquakeBinningAnalysis(expected_rows).binning_report()
+    assert len(analyzer.data) == len(expected_rows)
+    assert_reports_equal(report, expected)
+
+
+def test_retract_keeps_extremes_still_held_by_other_rows():
+    edges = [0, 10]
+    values = np.array([1.0, 5.0, 9.0, 9.0, 1.0])
+    state = state_for(values, edges)
+    assert state.max_count.tolist() == [2] and state.min_count.tolist() == [2]
+
+    # One of two rows at each extreme leaves: nothing to recompute
+    assert len(state.retract(state_for(np.array([9.0, 1.0]), edges))) == 0
+    assert (state.min[0], state.max[0]) == (1.0, 9.0)
+
+    # The last row at the maximum leaves: the bin must be recomputed
+    assert state.retract(state_for(np.array([9.0]), edges)).tolist() == [0]
+
+
+def test_append_revises_rows_added_by_earlier_appends(catalog):
+    catalog = catalog.assign(
+        id=[f'ev{i}' for i in range(len(catalog))], updated=np.int64(100)
+    )
+    analyzer = EarthquakeBinningAnalysis(catalog.iloc[:300])
+    analyzer.binning_report()
+
+    batch = catalog.iloc[300:].copy()
+    batch.iloc[0, batch.columns.get_loc('magnitude')] = np.float32(7.49)
+    analyzer.append(batch)
+    revision = batch.iloc[:1].copy()
+    revision['updated'] += 1
+    revision['magnitude'] = np.float32(2.6)
+    report = analyzer.append(revision)
+
+    rows = pd.concat([catalog.iloc[:300], revision, batch.iloc[1:]])
+    expected = EarthquakeBinningAnalysis(rows.reset_index(drop=True)).binning_report()
+    assert_reports_equal(report, expected)
+    assert sorted(analyzer.data['id']) == sorted(rows['id'])
+    assert analyzer.data.index.is_unique
+
+
+def test_append_with_non_integer_index(catalog):
+    catalog = catalog.assign(
+        id=[f'ev{i}' for i in range(len(catalog))], updated=np.int64(100)
+    )
+    labelled = catalog.set_index(catalog['id'].rename(None))
+    analyzer = EarthquakeBinningAnalysis(labelled.iloc[:200])
+    analyzer.binning_report()
+    analyzer.append(catalog.iloc[200:300])
+    analyzer.append(catalog.iloc[300:])
+
+    assert len(analyzer.data) == len(catalog)
+    assert analyzer.data.index.is_unique
+    assert list(analyzer.binned_data['magnitude'].index) == list(analyzer.data.index)
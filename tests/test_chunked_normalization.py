@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from earthquake_analysis.Normalization import EarthquakeNormalization
+from tests.test_scaler_store import normalization_frame
+
+# Uneven chunk boundaries, including a chunk of one row
+BOUNDARIES = [0, 1, 180, 181, 650, 1000]
+
+
+@pytest.fixture
+def frame():
+    return normalization_frame(1000, seed=3)
+
+
+def chunk_source(frame):
+    return lambda: (
+        frame.iloc[start:stop] for start, stop in zip(BOUNDARIES[:-1], BOUNDARIES[1:])
+    )
+
+
+def test_chunked_fit_matches_in_memory_fit(frame):
+    in_memory = EarthquakeNormalization(frame)
+    in_memory.generate_summary_report()
+    chunked = EarthquakeNormalization(None)
+    chunked.fit_chunks(chunk_source(frame)())
+
+    for family, parameters in in_memory.scaler_parameters.items():
+        streamed = chunked.scaler_parameters[family]
+        assert streamed.columns == parameters.columns
+        assert streamed.n_rows == len(frame)
+        np.testing.assert_allclose(streamed.scale, parameters.scale, rtol=1e-10)
+        np.testing.assert_allclose(streamed.offset, parameters.offset, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_normalize_chunks_matches_in_memory_transform(frame, tmp_path, dtype):
+    in_memory = EarthquakeNormalization(frame)
+    in_memory.generate_summary_report()
+    expected = in_memory.transform(frame)
+
+    output_path = tmp_path / 'normalized.npy'
+    output, columns = EarthquakeNormalization(None).normalize_chunks(
+        chunk_source(frame), output_path, dtype=dtype
+    )
+    assert columns == list(expected.columns)
+    assert output.dtype == dtype and output.shape == expected.shape
+
+    reloaded = np.load(output_path)
+    rtol = 1e-6 if dtype == np.float32 else 1e-10
+    np.testing.assert_allclose(reloaded, expected.to_numpy(), rtol=rtol, atol=rtol)
+    np.testing.assert_array_equal(np.isnan(reloaded), expected.isna().to_numpy())
+
+
+def test_transform_chunks_checks_row_count(frame, tmp_path):
+    normalizer = EarthquakeNormalization(None)
+    normalizer.fit_chunks(chunk_source(frame)())
+    with pytest.raises(ValueError, match='expected'):
+        normalizer.transform_chunks(chunk_source(frame)(), tmp_path / 'short.npy', len(frame) + 1)
+    with pytest.raises(ValueError, match='more than'):
+        normalizer.transform_chunks(chunk_source(frame)(), tmp_path / 'long.npy', len(frame) - 1)
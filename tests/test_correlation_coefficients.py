@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.CorrelationCoefficientAnalysis import EarthquakeCorrelationCoefficient
+
+PEARSON_COLUMNS = ['pearson_correlation', 'pearson_p_value', 'r_squared', 'sample_size']
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    columns = EarthquakeCorrelationCoefficient(None).analysis_columns()
+    frame = pd.DataFrame(rng.normal(size=(3000, len(columns))), columns=columns)
+    frame['depth'] += 0.5 * frame['magnitude']
+    frame['cdi'] -= 0.3 * frame['magnitude']
+    return frame.mask(rng.random(frame.shape) < 0.15)
+
+
+def chunked(frame, size=700):
+    return [frame.iloc[start:start + size] for start in range(0, len(frame), size)]
+
+
+def test_streamed_pearson_columns_match_in_memory(frame):
+    streamed = EarthquakeCorrelationCoefficient.from_chunks(chunked(frame))
+    in_memory = EarthquakeCorrelationCoefficient(frame)
+    for target in ['magnitude', 'mmi', 'sig']:
+        result = streamed.calculate_correlation_coefficients(target)
+        expected = in_memory.calculate_correlation_coefficients(target)
+        pd.testing.assert_frame_equal(result[PEARSON_COLUMNS], expected[PEARSON_COLUMNS], atol=1e-10)
+        # Ranks cannot be streamed
+        assert result['spearman_correlation'].isna().all()
+        assert result['spearman_p_value'].isna().all()
+
+
+def test_revise_matches_recomputation(frame):
+    analyzer = EarthquakeCorrelationCoefficient.from_chunks(chunked(frame.iloc[:2500]))
+    old = frame.iloc[100:150]
+    new = old.copy()
+    new['magnitude'] += 1.0
+    analyzer.revise(added=new, removed=old)
+    analyzer.revise(added=frame.iloc[2500:])
+
+    revised = frame.copy()
+    revised.iloc[100:150] = new
+    expected = EarthquakeCorrelationCoefficient(revised).calculate_correlation_coefficients('magnitude')
+    result = analyzer.calculate_correlation_coefficients('magnitude')
+    pd.testing.assert_frame_equal(result[PEARSON_COLUMNS], expected[PEARSON_COLUMNS], atol=1e-10)
+
+
+def test_row_statistics_unavailable_in_streaming_mode(frame):
+    analyzer = EarthquakeCorrelationCoefficient.from_chunks(chunked(frame))
+    with pytest.raises(ValueError, match='streaming mode'):
+        analyzer.permutation_significance('magnitude')
+    with pytest.raises(ValueError, match='streaming mode'):
+        analyzer.calculate_extended_dependence('magnitude')
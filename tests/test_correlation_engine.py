@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from earthquake_analysis.CorrelationEngine import (
+    centered_columns, pairwise_pearson, pearson_block, pearson_p_values
+)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    n = 300
+    data = rng.normal(size=(n, 5))
+    data[:, 1] += 2 * data[:, 0]
+    data[:, 2] = 1e6 + 1e-3 * data[:, 2] - 5e-4 * data[:, 0]
+    data[rng.random(data.shape) < 0.15] = np.nan
+    # A constant column has no correlation with anything
+    data[:, 4] = 3.0
+    return data
+
+
+def test_pairwise_pearson_matches_corrcoef(values):
+    r, n, p = pairwise_pearson(values)
+    k = values.shape[1]
+    expected = np.full((k, k), np.nan)
+    for i in range(k):
+        for j in range(k):
+            valid = ~(np.isnan(values[:, i]) | np.isnan(values[:, j]))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                expected[i, j] = np.corrcoef(values[valid, i], values[valid, j])[0, 1]
+    present = (~np.isnan(values)).astype(int)
+
+    np.testing.assert_allclose(r, expected, atol=1e-10, equal_nan=True)
+    np.testing.assert_array_equal(n, present.T @ present)
+    assert np.isnan(r[4]).all()
+    assert np.isnan(p[4]).all()
+
+
+def test_pairwise_pearson_matches_pandas_corr(values):
+    # Column 2 sits at a large offset, where pandas itself loses digits
+    columns = [0, 1, 3]
+    r, _, _ = pairwise_pearson(values[:, columns])
+    expected = pd.DataFrame(values[:, columns]).corr().to_numpy()
+    np.testing.assert_allclose(r, expected, atol=1e-12)
+
+
+def test_p_values_match_pearsonr(values):
+    r, n, p = pairwise_pearson(values)
+    for i, j in [(0, 1), (0, 2), (1, 3), (2, 3)]:
+        valid = ~(np.isnan(values[:, i]) | np.isnan(values[:, j]))
+        expected = stats.pearsonr(values[valid, i], values[valid, j])
+        assert r[i, j] == pytest.approx(expected.statistic, abs=1e-10)
+        assert p[i, j] == pytest.approx(expected.pvalue, rel=1e-6, abs=1e-300)
+
+
+def test_p_value_edge_cases():
+    p = pearson_p_values([1.0, 0.5, 0.5, np.nan], [10, 2, 1, 10])
+    assert p[0] == 0.0
+    assert p[1] == 1.0
+    assert np.isnan(p[2]) and np.isnan(p[3])
+
+
+def test_explicit_mask_overrides_nans(values):
+    mask = ~np.isnan(values)
+    mask[:50, 0] = False
+    r, n, _ = pairwise_pearson(values, mask)
+    masked = values.copy()
+    masked[:50, 0] = np.nan
+    expected, expected_n, _ = pairwise_pearson(masked)
+    np.testing.assert_allclose(r, expected, equal_nan=True)
+    np.testing.assert_array_equal(n, expected_n)
+
+
+def test_pearson_block_matches_full_matrix(values):
+    r, n, _ = pairwise_pearson(values)
+    centered_a, present_a = centered_columns(values[:, :2])
+    centered_b, present_b = centered_columns(values[:, 2:])
+    block_r, block_n = pearson_block(centered_a, present_a, centered_b, present_b)
+    np.testing.assert_allclose(block_r, r[:2, 2:], equal_nan=True)
+    np.testing.assert_array_equal(block_n, n[:2, 2:])
+
+
+def test_too_few_rows_is_nan():
+    values = np.array([[1.0, np.nan], [2.0, 3.0], [np.nan, 4.0]])
+    r, n, p = pairwise_pearson(values)
+    assert n[0, 1] == 1
+    assert np.isnan(r[0, 1]) and np.isnan(p[0, 1])
@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis import DataLoader
+from earthquake_analysis.DataCache import EarthquakeDataCache
+from earthquake_analysis.DataLoader import EarthquakeDataLoader
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / 'catalog.csv'
+    pd.DataFrame({
+        'magnitude': [4.5, 5.25, 6.0],
+        'sig': [312, 449, 554],
+        'net': ['us', 'ak', 'us']
+    }).to_csv(path, index=False)
+    return path
+
+
+class CountingParser:
+    def __init__(self, path, dtypes):
+        self.path = path
+        self.dtypes = dtypes
+        self.parsed = []
+
+    def __call__(self, columns):
+        self.parsed.append(list(columns))
+        return pd.read_csv(self.path, usecols=columns, dtype={
+            column: self.dtypes[column] for column in columns if column in self.dtypes
+        })
+
+
+def test_build_then_reuse(catalog):
+    dtypes = {'magnitude': 'float32', 'sig': 'float32', 'net': 'category'}
+    cache = EarthquakeDataCache(catalog)
+    parse = CountingParser(catalog, dtypes)
+
+    first = cache.load(['magnitude', 'net'], parse, dtypes)
+    second = cache.load(['magnitude', 'net', 'sig'], parse, dtypes)
+    assert parse.parsed == [['magnitude', 'net'], ['sig']]
+
+    assert first['magnitude'].dtype == np.float32
+    assert isinstance(first['net'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(second, parse(['magnitude', 'net', 'sig'])[second.columns])
+
+
+def test_changed_dtype_rebuilds_only_that_column(catalog):
+    cache = EarthquakeDataCache(catalog)
+    parse = CountingParser(catalog, {'magnitude': 'float32', 'sig': 'float32'})
+    cache.load(['magnitude', 'sig'], parse, parse.dtypes)
+
+    parse.dtypes = {'magnitude': 'float32', 'sig': 'int64'}
+    data = cache.load(['magnitude', 'sig'], parse, parse.dtypes)
+    assert parse.parsed[-1] == ['sig']
+    assert data['sig'].dtype == np.int64
+    assert cache.read_manifest()['columns']['sig']['requested_dtype'] == 'int64'
+
+
+def test_same_size_edit_invalidates(catalog):
+    cache = EarthquakeDataCache(catalog)
+    parse = CountingParser(catalog, {'magnitude': 'float32'})
+    cache.load(['magnitude'], parse, parse.dtypes)
+
+    text = catalog.read_text()
+    edited = text.replace('5.25', '5.75')
+    assert len(edited) == len(text)
+    catalog.write_text(edited)
+    stat = catalog.stat()
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    data = cache.load(['magnitude'], parse, parse.dtypes)
+    assert len(parse.parsed) == 2
+    assert data['magnitude'].tolist() == [4.5, 5.75, 6.0]
+
+    # Touching the file without changing it keeps the cache
+    stat = catalog.stat()
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.load(['magnitude'], parse, parse.dtypes)
+    assert len(parse.parsed) == 2
+
+
+def test_loader_follows_catalog_dtypes(catalog, monkeypatch):
+    loader = EarthquakeDataLoader(catalog)
+    assert loader.load(columns=['sig'])['sig'].dtype == np.float32
+
+    monkeypatch.setitem(DataLoader.CATALOG_DTYPES, 'sig', 'int64')
+    assert loader.load(columns=['sig'])['sig'].dtype == np.int64
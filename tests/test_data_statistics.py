@@ -0,0 +1,44 @@
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.BinnedPlotting import sketch_histogram
+from earthquake_analysis.DataStatistics import EarthquakeDataStatistics
+from earthquake_analysis.Sketches import KLLSketch
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.default_rng(0)
+    columns = EarthquakeDataStatistics(None).prepare_columns()['numerical']
+    frame = pd.DataFrame(rng.gamma(2.0, size=(4000, len(columns))), columns=columns)
+    frame = frame.mask(rng.random(frame.shape) < 0.1)
+    return [frame.iloc[start:start + 1000] for start in range(0, len(frame), 1000)]
+
+
+def test_sketch_histogram_matches_numpy():
+    values = np.random.default_rng(1).normal(size=20000)
+    sketch = KLLSketch(0.01, seed=0)
+    sketch.update(values)
+    counts, edges = sketch_histogram(sketch, bins=20)
+    expected, _ = np.histogram(values, bins=edges)
+    assert counts.sum() == pytest.approx(values.size)
+    # Every bin is a difference of two ranks, each within epsilon
+    assert np.abs(counts - expected).max() <= 2 * 0.015 * values.size
+
+
+def test_streaming_distributions_need_sketches(chunks):
+    analyzer = EarthquakeDataStatistics.from_chunks(chunks)
+    with pytest.raises(ValueError, match='quantile_epsilon'):
+        analyzer.visualize_distributions()
+
+
+def test_streaming_distributions_from_sketches(chunks, monkeypatch):
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    analyzer = EarthquakeDataStatistics.from_chunks(chunks, quantile_epsilon=0.01)
+    analyzer.visualize_distributions()
+    axes = plt.gcf().axes
+    assert [ax.get_xlabel() for ax in axes] == analyzer.prepare_columns()['distribution']
+    plt.close('all')
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from scipy import stats
+from earthquake_analysis.NonlinearDependence import (
+    dominance_sums, distance_correlation, dependence_measures, screen_dependence
+)
+
+
+def brute_force_distance_correlation(x, y):
+    a = np.abs(x[:, None] - x[None, :])
+    b = np.abs(y[:, None] - y[None, :])
+    a = a - a.mean(axis=0) - a.mean(axis=1)[:, None] + a.mean()
+    b = b - b.mean(axis=0) - b.mean(axis=1)[:, None] + b.mean()
+    return np.sqrt((a * b).mean() / np.sqrt((a * a).mean() * (b * b).mean()))
+
+
+def test_dominance_sums_matches_brute_force():
+    rng = np.random.default_rng(0)
+    ranks = rng.integers(0, 20, 300)
+    weights = rng.normal(size=(300, 2))
+    expected = np.array([
+        weights[:j][ranks[:j] < ranks[j]].sum(axis=0) for j in range(300)
+    ])
+    np.testing.assert_allclose(dominance_sums(ranks, weights), expected, atol=1e-12)
+    counts = dominance_sums(ranks, np.ones(300, dtype=np.int64))
+    np.testing.assert_array_equal(counts, [(ranks[:j] < ranks[j]).sum() for j in range(300)])
+
+
+@pytest.mark.parametrize('ties', [False, True])
+def test_distance_correlation_matches_brute_force(ties):
+    rng = np.random.default_rng(1)
+    for n in (3, 17, 250):
+        x = rng.integers(0, 6, n).astype(float) if ties else rng.normal(size=n)
+        y = np.cos(x) + rng.integers(0, 3, n)
+        expected = brute_force_distance_correlation(x, y)
+        assert distance_correlation(x, y) == pytest.approx(expected, abs=1e-9)
+
+
+def test_distance_correlation_of_constant_is_nan():
+    assert np.isnan(distance_correlation(np.ones(10), np.arange(10.0)))
+    assert np.isnan(distance_correlation([1.0], [2.0]))
+
+
+def test_dependence_measures_use_pairwise_complete_rows():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=200)
+    y = x ** 2 + rng.normal(scale=0.1, size=200)
+    x[::7] = np.nan
+    y[::11] = np.nan
+    valid = ~(np.isnan(x) | np.isnan(y))
+
+    tau, p_value, dcor, n = dependence_measures(x, y)
+    expected = stats.kendalltau(x[valid], y[valid])
+    assert n == valid.sum()
+    assert tau == pytest.approx(expected.statistic)
+    assert p_value == pytest.approx(expected.pvalue)
+    assert dcor == pytest.approx(brute_force_distance_correlation(x[valid], y[valid]))
+
+
+def test_screen_dependence_too_few_rows():
+    results = screen_dependence([1.0, np.nan, 3.0], [[np.nan, 2.0, 1.0], [1.0, 2.0, 3.0]])
+    assert results['sample_size'].tolist() == [1, 2]
+    assert results.iloc[0][['kendall_tau', 'distance_correlation']].isna().all()
+    assert results.iloc[1]['kendall_tau'] == pytest.approx(1.0)
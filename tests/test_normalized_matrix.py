@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.Normalization import EarthquakeNormalization
+from tests.test_scaler_store import normalization_frame
+
+
+@pytest.fixture
+def frame():
+    frame = normalization_frame(400, seed=4)
+    # A non-default index must carry over to the matrix
+    frame.index = pd.RangeIndex(1000, 1400)
+    return frame
+
+
+def column_by_column(frame, families):
+    expected = {}
+    for column in families['standard_scaling']:
+        values = frame[column]
+        std = values.std(ddof=0)
+        expected[column] = (values - values.mean()) / (std if std > 0 else 1.0)
+    for column in families['minmax_scaling']:
+        values = frame[column]
+        expected[column] = (values - values.min()) / (values.max() - values.min())
+    return pd.DataFrame(expected)
+
+
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_matrix_matches_column_by_column_normalization(frame, order):
+    normalizer = EarthquakeNormalization(frame)
+    matrix = normalizer.build_normalized_matrix(dtype=np.float64, order=order)
+    families = normalizer.prepare_columns()
+    expected = column_by_column(frame, families)
+
+    assert list(matrix.columns) == families['standard_scaling'] + families['minmax_scaling']
+    assert matrix.index.equals(frame.index)
+    assert matrix.values.flags[f'{order}_CONTIGUOUS']
+    pd.testing.assert_frame_equal(matrix.to_frame(), expected, rtol=1e-10, atol=1e-12)
+
+    present = frame[list(matrix.columns)].notna().to_numpy()
+    np.testing.assert_array_equal(matrix.mask, present)
+    np.testing.assert_array_equal(np.isnan(matrix.values), ~present)
+
+
+def test_float32_matrix_and_row_selections(frame):
+    normalizer = EarthquakeNormalization(frame)
+    matrix = normalizer.build_normalized_matrix()
+    expected = column_by_column(frame, normalizer.prepare_columns())
+
+    assert matrix.values.dtype == np.float32
+    np.testing.assert_allclose(matrix.column('depth'), expected['depth'], rtol=1e-6, atol=1e-6)
+    assert np.shares_memory(matrix.column('depth'), matrix.values)
+
+    complete = matrix.complete_rows(['magnitude', 'latitude'])
+    np.testing.assert_array_equal(complete, frame[['magnitude', 'latitude']].notna().all(axis=1))
+    np.testing.assert_array_equal(matrix.complete_rows(), frame.notna().all(axis=1).to_numpy())
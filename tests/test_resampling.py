@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from earthquake_analysis import Resampling
+from earthquake_analysis.Resampling import bootstrap_correlations, permutation_test
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    n = 2000
+    data = rng.normal(size=(n, 4))
+    data[:, 1] += data[:, 0]
+    data[:, 3] = data[:, 2] ** 2 + rng.normal(size=n)
+    data[rng.random(data.shape) < 0.1] = np.nan
+    return data
+
+
+def complete_corrcoef(a, b):
+    valid = ~(np.isnan(a) | np.isnan(b))
+    return np.corrcoef(a[valid], b[valid])[0, 1]
+
+
+def test_bootstrap_estimate_matches_corrcoef(values, monkeypatch):
+    monkeypatch.setattr(Resampling, 'ROW_CHUNK', 300)
+    monkeypatch.setattr(Resampling, 'PAIR_BLOCK', 2)
+    pairs = [(0, 1), (0, 2), (2, 3)]
+    intervals = bootstrap_correlations(values, pairs, n_resamples=200, seed=0)
+    expected = [complete_corrcoef(values[:, a], values[:, b]) for a, b in pairs]
+    np.testing.assert_allclose(intervals['correlation'], expected)
+    assert (intervals['ci_low'] <= intervals['correlation']).all()
+    assert (intervals['correlation'] <= intervals['ci_high']).all()
+
+
+def test_bootstrap_std_error_matches_row_resampling(values, monkeypatch):
+    monkeypatch.setattr(Resampling, 'ROW_CHUNK', 300)
+    intervals = bootstrap_correlations(values, [(0, 1)], n_resamples=2000, seed=1)
+
+    rng = np.random.default_rng(2)
+    replicates = []
+    for _ in range(2000):
+        rows = rng.integers(0, values.shape[0], values.shape[0])
+        replicates.append(complete_corrcoef(values[rows, 0], values[rows, 1]))
+    assert intervals['std_error'][0] == pytest.approx(np.std(replicates, ddof=1), rel=0.1)
+
+
+def test_bootstrap_is_reproducible_across_workers(values):
+    single = bootstrap_correlations(values, [(0, 1), (2, 3)], n_resamples=150, batch_size=50, seed=3)
+    pooled = bootstrap_correlations(
+        values, [(0, 1), (2, 3)], n_resamples=150, batch_size=50, seed=3, n_workers=2
+    )
+    pd.testing.assert_frame_equal(single, pooled)
+
+
+def test_bootstrap_pair_without_rows_is_nan(values):
+    values = values.copy()
+    values[:, 3] = np.nan
+    intervals = bootstrap_correlations(values, [(0, 3)], n_resamples=20, seed=0)
+    assert intervals.iloc[0].isna().all()
+
+
+@pytest.fixture
+def permutation_data():
+    rng = np.random.default_rng(4)
+    n = 400
+    target = rng.normal(size=n)
+    predictors = np.column_stack([
+        0.1 * target + rng.normal(size=n),
+        rng.normal(size=n),
+        target + rng.normal(size=n)
+    ])
+    predictors[rng.random(predictors.shape) < 0.1] = np.nan
+    target[::25] = np.nan
+    return target, predictors
+
+
+def test_permutation_p_values_match_scipy(permutation_data):
+    target, predictors = permutation_data
+    results = permutation_test(
+        target, predictors, max_permutations=4000, batches_per_round=8, thresholds=(), seed=0
+    )
+    assert (results['n_permutations'] == 4000).all()
+
+    for i in range(predictors.shape[1]):
+        valid = ~(np.isnan(target) | np.isnan(predictors[:, i]))
+        expected = stats.permutation_test(
+            (target[valid], predictors[valid, i]),
+            lambda x, y: np.abs(np.corrcoef(x, y)[0, 1]),
+            permutation_type='pairings',
+            alternative='greater',
+            n_resamples=4000,
+            rng=np.random.default_rng(i)
+        )
+        assert results['correlation'][i] == pytest.approx(
+            np.corrcoef(target[valid], predictors[valid, i])[0, 1]
+        )
+        assert results['permutation_p_value'][i] == pytest.approx(expected.pvalue, abs=0.03)
+    assert results['permutation_p_value'][2] < 1e-3
+
+
+def test_permutation_chunking_and_workers_do_not_change_results(permutation_data, monkeypatch):
+    target, predictors = permutation_data
+    expected = permutation_test(target, predictors, max_permutations=2000, seed=5)
+    monkeypatch.setattr(Resampling, 'MAX_SHUFFLED_CELLS', 7 * target.size)
+    chunked = permutation_test(target, predictors, max_permutations=2000, seed=5)
+    pooled = permutation_test(target, predictors, max_permutations=2000, seed=5, n_workers=2)
+    pd.testing.assert_frame_equal(chunked, expected)
+    pd.testing.assert_frame_equal(pooled, expected)
+
+
+def test_permutation_early_stopping_settles_clear_predictors(permutation_data):
+    target, predictors = permutation_data
+    results = permutation_test(target, predictors, max_permutations=10000, seed=6)
+    # The strongly correlated predictor is settled after the first round
+    assert results['n_permutations'][2] == 2000
+    assert results['p_value_high'][2] < 0.01
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+from earthquake_analysis.Normalization import EarthquakeNormalization
+from earthquake_analysis.ScalerStore import ScalerParameters, ScalerStore
+
+CONVERTERS = [
+    (StandardScaler, ScalerParameters.from_standard_scaler),
+    (MinMaxScaler, ScalerParameters.from_minmax_scaler),
+    (RobustScaler, ScalerParameters.from_robust_scaler)
+]
+
+
+def normalization_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    families = EarthquakeNormalization(None).prepare_columns()
+    columns = [column for family in families.values() for column in family]
+    frame = pd.DataFrame(
+        rng.lognormal(1.0, 0.8, size=(n_rows, len(columns))) * rng.uniform(1, 500, len(columns)),
+        columns=columns
+    )
+    frame = frame.mask(rng.random(frame.shape) < 0.15)
+    # A constant column gets sklearn's unit scale
+    frame['rms'] = frame['rms'].where(frame['rms'].isna(), 0.5)
+    return frame
+
+
+@pytest.fixture
+def frame():
+    return normalization_frame(500)
+
+
+@pytest.mark.parametrize('scaler_class, converter', CONVERTERS)
+def test_transform_matches_sklearn(frame, scaler_class, converter):
+    values = frame.to_numpy(dtype=np.float64)
+    scaler = scaler_class().fit(values)
+    parameters = converter('family', list(frame.columns), scaler, len(frame))
+
+    expected = scaler.transform(values)
+    np.testing.assert_allclose(parameters.transform(values), expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_array_equal(np.isnan(parameters.transform(values)), np.isnan(values))
+    np.testing.assert_allclose(parameters.inverse_transform(expected), values, rtol=1e-12)
+
+
+def test_normalizer_transform_matches_sklearn(frame):
+    normalizer = EarthquakeNormalization(frame)
+    normalizer.generate_summary_report()
+    new_rows = normalization_frame(50, seed=1)
+    transformed = normalizer.transform(new_rows)
+
+    for family, scaler_class in (('standard_scaling', StandardScaler), ('minmax_scaling', MinMaxScaler)):
+        columns = normalizer.prepare_columns()[family]
+        scaler = scaler_class().fit(frame[columns].to_numpy(dtype=np.float64))
+        expected = scaler.transform(new_rows[columns].to_numpy(dtype=np.float64))
+        np.testing.assert_allclose(transformed[columns].to_numpy(), expected, rtol=1e-12, atol=1e-12)
+    assert transformed.index.equals(new_rows.index)
+
+
+def test_store_round_trip_and_versions(frame, tmp_path):
+    store = ScalerStore(tmp_path / 'scalers')
+    normalizer = EarthquakeNormalization(frame, scaler_store=store)
+    normalizer.generate_summary_report()
+
+    assert normalizer.save_scalers() == {'standard_scaling': 1, 'minmax_scaling': 1}
+    assert normalizer.save_scalers() == {'standard_scaling': 2, 'minmax_scaling': 2}
+    assert store.versions('standard_scaling') == [1, 2]
+
+    served = EarthquakeNormalization(None, scaler_store=store)
+    loaded = served.load_scalers()
+    assert {family: parameters.version for family, parameters in loaded.items()} == {
+        'standard_scaling': 2, 'minmax_scaling': 2
+    }
+    for family, parameters in loaded.items():
+        fitted = normalizer.scaler_parameters[family]
+        assert parameters.columns == fitted.columns
+        assert parameters.n_rows == fitted.n_rows == len(frame)
+        assert parameters.fitted_at == fitted.fitted_at
+
+    new_rows = normalization_frame(50, seed=2)
+    pd.testing.assert_frame_equal(served.transform(new_rows), normalizer.transform(new_rows))
+    assert store.load('minmax_scaling', version=1).version == 1
+
+
+def test_missing_family_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ScalerStore(tmp_path).load('standard_scaling')
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+import pandas as pd
+from earthquake_analysis.Sketches import KLLSketch, FrequentItemsSketch
+
+
+def rank_error(values, estimates, q):
+    ordered = np.sort(values)
+    return np.abs(np.searchsorted(ordered, estimates) / ordered.size - q).max()
+
+
+def test_kll_quantiles_within_epsilon():
+    values = np.random.default_rng(0).lognormal(size=200000)
+    q = np.linspace(0, 1, 101)
+    sketch = KLLSketch(epsilon=0.01, seed=0).update(values)
+    assert rank_error(values, sketch.quantile(q), q) <= 0.015
+    assert sketch.quantile(0.0) == values.min()
+    assert sketch.quantile(1.0) == values.max()
+
+
+def test_kll_state_is_bounded():
+    sketch = KLLSketch(epsilon=0.01, seed=0)
+    sketch.update(np.random.default_rng(1).normal(size=500000))
+    retained = sum(items.size for items in sketch.levels)
+    assert sketch.n == 500000
+    assert retained <= 3 * sketch.k * len(sketch.levels)
+    weights = sum(items.size * 2.0 ** level for level, items in enumerate(sketch.levels))
+    assert weights == sketch.n
+
+
+def test_kll_ignores_nans_and_small_inputs_are_exact():
+    values = np.array([3.0, np.nan, 1.0, 2.0, np.nan, 5.0, 4.0])
+    sketch = KLLSketch(epsilon=0.01).update(values)
+    assert sketch.n == 5
+    np.testing.assert_array_equal(sketch.quantile([0.0, 0.5, 1.0]), [1.0, 3.0, 5.0])
+
+
+def test_kll_empty_sketch():
+    sketch = KLLSketch().update(np.array([np.nan, np.nan]))
+    assert sketch.n == 0
+    assert np.isnan(sketch.quantile(0.5))
+
+
+def test_kll_merge_and_round_trip():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=100000)
+    parts = [KLLSketch(epsilon=0.01, seed=i).update(chunk)
+             for i, chunk in enumerate(np.array_split(values, 7))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(KLLSketch.from_dict(part.to_dict()))
+    q = np.linspace(0, 1, 51)
+    assert merged.n == values.size
+    assert rank_error(values, merged.quantile(q), q) <= 0.015
+    assert merged.rank(np.median(values)) == pytest.approx(0.5, abs=0.015)
+
+
+def test_frequent_items_bounds_against_exact_counts():
+    values = np.random.default_rng(3).zipf(1.5, 200000).astype(float)
+    sketch = FrequentItemsSketch(capacity=32).update(values)
+    exact = pd.Series(values).value_counts()
+
+    assert sketch.values.size <= 32
+    assert sketch.error_bound <= values.size / 33
+    estimated = pd.Series(sketch.counts, index=sketch.values)
+    true_counts = exact.reindex(estimated.index)
+    assert (estimated <= true_counts).all()
+    assert (true_counts - estimated <= sketch.error_bound).all()
+    assert sketch.mode() == exact.index[0]
+
+
+def test_frequent_items_exact_below_capacity():
+    values = np.array([2.0, 1.0, np.nan, 2.0, 3.0, 1.0, 2.0])
+    sketch = FrequentItemsSketch(capacity=8).update(values)
+    top_values, top_counts = sketch.top_k(2)
+    assert sketch.n == 6
+    assert sketch.error_bound == 0
+    np.testing.assert_array_equal(top_values, [2.0, 1.0])
+    np.testing.assert_array_equal(top_counts, [3.0, 2.0])
+
+
+def test_frequent_items_empty_and_merge():
+    assert np.isnan(FrequentItemsSketch().update([np.nan]).mode())
+    left = FrequentItemsSketch(4).update([1.0, 1.0, 2.0])
+    right = FrequentItemsSketch.from_dict(FrequentItemsSketch(4).update([2.0, 2.0, 3.0]).to_dict())
+    merged = left.merge(right)
+    assert merged.n == 6
+    assert merged.mode() == 2.0
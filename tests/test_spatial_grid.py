@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.SpatialGrid import MAX_LEVEL, SpatialGrid, cell_codes, quadkey
+
+DEPTH_LABELS = ['Shallow', 'Intermediate', 'Deep']
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(0)
+    n = 3000
+    latitude = rng.uniform(-90, 90, n)
+    longitude = rng.uniform(-180, 180, n)
+    # Clustered events so cells hold several of them
+    latitude[:1000] = rng.normal(35, 2, 1000)
+    longitude[:1000] = rng.normal(139, 2, 1000)
+    latitude[::97] = np.nan
+    magnitude = rng.uniform(2, 7, n)
+    magnitude[::13] = np.nan
+    sig = rng.integers(0, 1000, n).astype(np.float64)
+    sig[::29] = np.nan
+    depth_codes = rng.integers(-1, 3, n)
+    return latitude, longitude, magnitude, sig, depth_codes
+
+
+def test_known_cells():
+    latitude = np.array([-45.0, -45.0, 45.0, 45.0])
+    longitude = np.array([-90.0, 90.0, -90.0, 90.0])
+    codes = cell_codes(latitude, longitude, 1)
+    assert codes.tolist() == [0, 1, 2, 3]
+    assert [quadkey(code, 1) for code in codes] == ['0', '1', '2', '3']
+
+    # The origin is the south-west corner of cell (2, 2) at level 2
+    code = cell_codes(0.0, 0.0, 2)
+    assert int(code) == 12 and quadkey(code, 2) == '30'
+    assert quadkey(cell_codes(0.0, 0.0, 4), 4) == '3000'
+
+
+def test_dateline_and_poles():
+    level = 10
+    last = (1 << level) - 1
+    corners = cell_codes(
+        np.array([-90.0, 90.0, 0.0, 0.0, 90.0]),
+        np.array([-180.0, 180.0, 180.0, -180.0, 179.999999]),
+        level
+    )
+    grid = SpatialGrid(level, corners, *[None] * 6, DEPTH_LABELS, 0.0)
+    south, west, height, width = grid.bounds()
+    # The east and north edges belong to the last cell on each axis
+    np.testing.assert_array_equal(west / width + 180 / width, [0, last, last, 0, last])
+    np.testing.assert_array_equal(south / height + 90 / height, [0, last, last // 2 + 1, last // 2 + 1, last])
+
+    deepest = cell_codes(90.0, 180.0, MAX_LEVEL)
+    assert int(deepest) == (1 << (2 * MAX_LEVEL)) - 1
+    with pytest.raises(ValueError):
+        cell_codes(0.0, 0.0, MAX_LEVEL + 1)
+
+
+def test_bounds_contain_points(events):
+    latitude, longitude = events[0][:200], events[1][:200]
+    located = ~np.isnan(latitude)
+    codes = cell_codes(latitude[located], longitude[located], 12)
+    grid = SpatialGrid(12, codes, *[None] * 6, DEPTH_LABELS, 0.0)
+    south, west, height, width = grid.bounds()
+    assert ((south <= latitude[located]) & (latitude[located] < south + height)).all()
+    assert ((west <= longitude[located]) & (longitude[located] < west + width)).all()
+
+
+def test_rollup_matches_build(events):
+    fine = SpatialGrid.build(*events, DEPTH_LABELS, level=9)
+    for level in (9, 6, 3, 0):
+        rolled = fine.rollup(level).summary()
+        built = SpatialGrid.build(*events, DEPTH_LABELS, level=level).summary()
+        pd.testing.assert_frame_equal(rolled, built, check_exact=False, rtol=1e-9)
+    with pytest.raises(ValueError):
+        fine.rollup(10)
+
+
+def test_summary_and_hotspots_match_groupby(events):
+    latitude, longitude, magnitude, sig, depth_codes = events
+    grid = SpatialGrid.build(*events, DEPTH_LABELS, level=5)
+
+    located = ~np.isnan(latitude)
+    frame = pd.DataFrame({
+        'code': cell_codes(latitude[located], longitude[located], 5),
+        'magnitude': magnitude[located],
+        'sig': sig[located],
+        'depth': pd.Categorical.from_codes(depth_codes[located], categories=DEPTH_LABELS)
+    })
+    grouped = frame.groupby('code')
+    expected = pd.DataFrame({
+        'count': grouped.size(),
+        'mean_magnitude': grouped['magnitude'].mean(),
+        'std_magnitude': grouped['magnitude'].std(),
+        'max_sig': grouped['sig'].max()
+    }).join(
+        pd.crosstab(frame['code'], frame['depth']).rename(columns=str.lower)
+    ).fillna({label.lower(): 0 for label in DEPTH_LABELS}).reset_index()
+
+    summary = grid.summary()
+    assert summary['quadkey'].tolist() == [quadkey(code, 5) for code in expected['code']]
+    columns = ['count', 'mean_magnitude', 'std_magnitude', 'max_sig', 'shallow', 'intermediate', 'deep']
+    np.testing.assert_allclose(
+        summary[columns].to_numpy(dtype=np.float64),
+        expected[columns].to_numpy(dtype=np.float64),
+        rtol=1e-9
+    )
+
+    hotspots = grid.hotspots(top_n=5, by='max_sig')
+    top = expected.nlargest(5, 'max_sig').reset_index(drop=True)
+    assert hotspots['quadkey'].tolist() == [quadkey(code, 5) for code in top['code']]
+    np.testing.assert_array_equal(hotspots['count'], top['count'])
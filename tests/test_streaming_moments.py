@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from earthquake_analysis.CorrelationEngine import pairwise_pearson, pearson_from_sums
+from earthquake_analysis.StreamingMoments import CoMomentAccumulator
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(1000, 4))
+    data[:, 1] += data[:, 0]
+    data[:, 3] = 50.0 + 0.1 * data[:, 3]
+    data[rng.random(data.shape) < 0.2] = np.nan
+    return data
+
+
+def streamed_pearson(accumulator):
+    r, n, _ = pearson_from_sums(*accumulator.pairwise_sums())
+    return r, n
+
+
+def test_chunked_comoments_match_pairwise_pearson(values):
+    columns = ['a', 'b', 'c', 'd']
+    accumulator = CoMomentAccumulator(columns)
+    for chunk in np.array_split(values, 7):
+        accumulator.update(chunk)
+    r, n = streamed_pearson(accumulator)
+    expected_r, expected_n, _ = pairwise_pearson(values)
+    np.testing.assert_allclose(r, expected_r, atol=1e-10)
+    np.testing.assert_array_equal(n, expected_n)
+    assert accumulator.n_rows == values.shape[0]
+
+
+def test_merge_remove_and_round_trip(values):
+    columns = ['a', 'b', 'c', 'd']
+    left = CoMomentAccumulator.from_values(columns, values[:600])
+    right = CoMomentAccumulator.from_dict(
+        CoMomentAccumulator.from_values(columns, values[600:]).to_dict()
+    )
+    left.merge(right)
+    left.remove(values[200:600])
+
+    kept = np.vstack([values[:200], values[600:]])
+    r, n = streamed_pearson(left)
+    expected_r, expected_n, _ = pairwise_pearson(kept)
+    np.testing.assert_allclose(r, expected_r, atol=1e-10)
+    np.testing.assert_array_equal(n, expected_n)
+
+
+def test_empty_and_invalid_operations(values):
+    empty = CoMomentAccumulator(['a', 'b'])
+    n, sums, squares, products = empty.pairwise_sums()
+    assert (n == 0).all()
+    with pytest.raises(ValueError):
+        empty.remove(values[:5, :2])
+    with pytest.raises(ValueError):
+        empty.merge(CoMomentAccumulator(['a', 'c']))
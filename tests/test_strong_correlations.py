@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.PearsonCorrelation import EarthquakeCorrelationAnalysis
+
+
+@pytest.fixture
+def analyzer():
+    rng = np.random.default_rng(0)
+    columns = sum(EarthquakeCorrelationAnalysis(None).prepare_correlation_columns().values(), [])
+    # Small integers mirrored around zero: every column mean is exactly
+    # zero, so both paths compute bit-identical r and ties are exact
+    half = pd.DataFrame(rng.integers(-5, 6, size=(300, len(columns))), columns=columns)
+    half = half.astype(np.float64).mask(rng.random(half.shape) < 0.1)
+    half['depth'] = half['magnitude'] + rng.integers(-1, 2, size=len(half))
+    half['sig'] = half['magnitude']
+    half['mmi'] = -half['magnitude']
+    half['cdi'] = 2 * half['felt']
+    half['rms'] = np.nan
+    half['gap'] = 0.0
+    return EarthquakeCorrelationAnalysis(pd.concat([half, -half], ignore_index=True))
+
+
+@pytest.mark.parametrize('threshold', [0.0, 0.5, 1.0])
+def test_tiled_matches_matrix_threshold(analyzer, threshold):
+    matrix = analyzer.calculate_correlation_matrix()
+    expected = analyzer.analyze_strong_correlations(matrix, threshold=threshold)
+    tiled = analyzer.analyze_strong_correlations(threshold=threshold, block_size=5)
+    pd.testing.assert_frame_equal(tiled, expected)
+    assert not expected['correlation'].isna().any()
+    assert {'rms', 'gap'}.isdisjoint(expected[['variable1', 'variable2']].to_numpy().ravel())
+
+
+@pytest.mark.parametrize('top_k', [1, 2, 3, 4, 10, 1000])
+def test_tiled_matches_matrix_top_k(analyzer, top_k):
+    matrix = analyzer.calculate_correlation_matrix()
+    expected = analyzer.analyze_strong_correlations(matrix, top_k=top_k)
+    tiled = analyzer.analyze_strong_correlations(top_k=top_k, block_size=5)
+    pd.testing.assert_frame_equal(tiled, expected)
+    # Four pairs tie at |r| = 1, cut in column order
+    assert (expected['correlation'].abs().iloc[:min(top_k, 4)] == 1.0).all()
+    assert len(expected) == min(top_k, 45)
+
+
+def test_n_counts_pairwise_complete_rows(analyzer):
+    result = analyzer.analyze_strong_correlations(threshold=0.0)
+    data = analyzer.data
+    for row in result.itertuples():
+        assert row.n == data[[row.variable1, row.variable2]].notna().all(axis=1).sum()
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from earthquake_analysis.TemporalAggregation import TimeBucketAggregator
+
+DAY = 86_400_000
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(0)
+    n = 3000
+    time = (1_600_000_000_000 + rng.uniform(0, 120 * DAY, n)).astype(np.int64).astype(np.float64)
+    magnitude = rng.uniform(2, 7, n)
+    magnitude[::7] = np.nan
+    sig = rng.integers(0, 1000, n).astype(np.float64)
+    sig[::5] = np.nan
+    time[::101] = np.nan
+    return time, magnitude, sig
+
+
+def assert_same(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-9, atol=1e-12, check_freq=False)
+
+
+def pandas_rolling(time, magnitude, sig, window):
+    frame = pd.DataFrame({'time': time, 'magnitude': magnitude, 'sig': sig}).dropna(subset=['time'])
+    frame['bucket'] = pd.to_datetime(frame['time'].astype(np.int64), unit='ms').dt.floor('D')
+    grouped = frame.groupby('bucket')
+    days = pd.date_range(frame['bucket'].min(), frame['bucket'].max(), freq='D', name='bucket')
+    per_day = pd.DataFrame({
+        'count': grouped.size(),
+        'magnitude_count': grouped['magnitude'].count(),
+        'magnitude_sum': grouped['magnitude'].sum(),
+        'max_sig': grouped['sig'].max()
+    }).reindex(days).fillna({'count': 0, 'magnitude_count': 0, 'magnitude_sum': 0.0})
+
+    rolling = per_day.rolling(window, min_periods=1)
+    sums = rolling[['count', 'magnitude_count', 'magnitude_sum']].sum()
+    return pd.DataFrame({
+        'count': sums['count'].astype(np.int64),
+        'mean_magnitude': sums['magnitude_sum'] / sums['magnitude_count'],
+        'max_sig': rolling['max_sig'].max()
+    })
+
+
+def test_incremental_and_late_appends_match_scratch_build(events):
+    time, magnitude, sig = events
+    scratch = TimeBucketAggregator('D').append(time, magnitude, sig)
+
+    # Middle of the range first, then later events, then late ones before
+    # the first bucket and inside already-cached windows
+    order = np.argsort(np.nan_to_num(time, nan=0.0), kind='stable')
+    parts = [order[1000:2000], order[2000:], order[:300], order[300:1000]]
+    incremental = TimeBucketAggregator('D')
+    for part in parts:
+        incremental.append(time[part], magnitude[part], sig[part])
+        incremental.rolling(7)
+        incremental.rolling(30)
+
+    assert_same(incremental.buckets(), scratch.buckets())
+    for window in (1, 7, 30):
+        assert_same(incremental.rolling(window), scratch.rolling(window))
+
+
+def test_rolling_matches_pandas(events):
+    time, magnitude, sig = events
+    aggregator = TimeBucketAggregator('D')
+    half = time.size // 2
+    aggregator.append(time[:half], magnitude[:half], sig[:half])
+    aggregator.rolling(7)
+    aggregator.append(time[half:], magnitude[half:], sig[half:])
+
+    for window in (1, 7, 30):
+        rolling = aggregator.rolling(window)
+        expected = pandas_rolling(time, magnitude, sig, window)
+        assert_same(rolling[['count', 'mean_magnitude', 'max_sig']], expected)
+
+    std = aggregator.buckets()['std_magnitude']
+    frame = pd.DataFrame({'time': time, 'magnitude': magnitude}).dropna(subset=['time'])
+    expected_std = frame.groupby(
+        pd.to_datetime(frame['time'].astype(np.int64), unit='ms').dt.floor('D')
+    )['magnitude'].std()
+    np.testing.assert_allclose(std.loc[expected_std.index], expected_std, rtol=1e-9)
+
+
+def test_weekly_buckets_start_on_monday(events):
+    aggregator = TimeBucketAggregator('W').append(*events)
+    buckets = aggregator.buckets()
+    assert (buckets.index.dayofweek == 0).all()
+    assert buckets['count'].sum() == (~np.isnan(events[0])).sum()
+    with pytest.raises(ValueError):
+        TimeBucketAggregator('M')